@@ -11,29 +11,20 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-import voluptuous as vol
 from homeassistant.components.bluetooth import (
     async_ble_device_from_address,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
-from homeassistant.helpers import config_validation as cv
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from . import config_flow as config_flow  # noqa: F401 - required for HA
-from .const import (
-    DEFAULT_SCAN_INTERVAL,
-    DOMAIN,
-    SERVICE_SET_BATTERY_SAVER,
-    SERVICE_SET_LEFT_TARGET,
-    SERVICE_SET_LOCK,
-    SERVICE_SET_POWER,
-    SERVICE_SET_RIGHT_TARGET,
-    SERVICE_SET_RUN_MODE,
-)
+from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
 from .coordinator import BodegaBleCoordinator
+from .services import async_register_services
+from .websocket import async_end_subscriptions, async_register_websocket_commands
 
 if TYPE_CHECKING:
     from typing import TypeAlias
@@ -72,6 +63,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: BodegaBleConfigEntry) ->
 
     # Create coordinator
     coordinator = BodegaBleCoordinator(hass, entry, ble_device, scan_interval)
+    await coordinator.async_load_command_queue()
 
     # Start listening for advertisements
     entry.async_on_unload(coordinator.async_start())
@@ -91,19 +83,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: BodegaBleConfigEntry) ->
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    _register_services(hass)
+    async_register_services(hass)
+    async_register_websocket_commands(hass)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: BodegaBleConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload_ok and DOMAIN in hass.data:
+    if not unload_ok:
+        return False
+    async_end_subscriptions(hass, entry.entry_id)
+    if DOMAIN in hass.data:
         coordinator = hass.data[DOMAIN].get(entry.entry_id)
         if coordinator:
-            coordinator.async_stop()
+            await coordinator.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id, None)
-    return unload_ok
+    return True
 
 
 async def _async_update_listener(
@@ -111,117 +107,3 @@ async def _async_update_listener(
 ) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
-
-
-def _register_services(
-    hass: HomeAssistant,
-) -> None:
-    """Register integration services."""
-
-    async def _get_coordinator(entry_id: str) -> BodegaBleCoordinator:
-        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
-        if not coordinator:
-            raise HomeAssistantError(f"Unknown entry_id: {entry_id}")
-        return coordinator
-
-    async def _handle_set_left_target(call) -> None:
-        coordinator = await _get_coordinator(call.data["entry_id"])
-        await coordinator.async_set_left_target(call.data["temperature"])
-        await coordinator.async_request_refresh()
-
-    async def _handle_set_right_target(call) -> None:
-        coordinator = await _get_coordinator(call.data["entry_id"])
-        await coordinator.async_set_right_target(call.data["temperature"])
-        await coordinator.async_request_refresh()
-
-    async def _handle_set_power(call) -> None:
-        coordinator = await _get_coordinator(call.data["entry_id"])
-        await coordinator.async_set_power(call.data["powered"])
-        await coordinator.async_request_refresh()
-
-    async def _handle_set_lock(call) -> None:
-        coordinator = await _get_coordinator(call.data["entry_id"])
-        await coordinator.async_set_lock(call.data["locked"])
-        await coordinator.async_request_refresh()
-
-    async def _handle_set_run_mode(call) -> None:
-        coordinator = await _get_coordinator(call.data["entry_id"])
-        await coordinator.async_set_run_mode(call.data["mode"])
-        await coordinator.async_request_refresh()
-
-    async def _handle_set_battery_saver(call) -> None:
-        coordinator = await _get_coordinator(call.data["entry_id"])
-        await coordinator.async_set_battery_saver(call.data["level"])
-        await coordinator.async_request_refresh()
-
-    services = [
-        (
-            SERVICE_SET_LEFT_TARGET,
-            _handle_set_left_target,
-            vol.Schema(
-                {
-                    vol.Required("entry_id"): cv.string,
-                    vol.Required("temperature"): vol.Coerce(float),
-                }
-            ),
-        ),
-        (
-            SERVICE_SET_RIGHT_TARGET,
-            _handle_set_right_target,
-            vol.Schema(
-                {
-                    vol.Required("entry_id"): cv.string,
-                    vol.Required("temperature"): vol.Coerce(float),
-                }
-            ),
-        ),
-        (
-            SERVICE_SET_POWER,
-            _handle_set_power,
-            vol.Schema(
-                {
-                    vol.Required("entry_id"): cv.string,
-                    vol.Required("powered"): cv.boolean,
-                }
-            ),
-        ),
-        (
-            SERVICE_SET_LOCK,
-            _handle_set_lock,
-            vol.Schema(
-                {
-                    vol.Required("entry_id"): cv.string,
-                    vol.Required("locked"): cv.boolean,
-                }
-            ),
-        ),
-        (
-            SERVICE_SET_RUN_MODE,
-            _handle_set_run_mode,
-            vol.Schema(
-                {
-                    vol.Required("entry_id"): cv.string,
-                    vol.Required("mode"): vol.In(
-                        ("Max", "Eco", "max", "eco", "0", "1")
-                    ),
-                }
-            ),
-        ),
-        (
-            SERVICE_SET_BATTERY_SAVER,
-            _handle_set_battery_saver,
-            vol.Schema(
-                {
-                    vol.Required("entry_id"): cv.string,
-                    vol.Required("level"): vol.In(
-                        ("Low", "Mid", "High", "low", "mid", "high", "0", "1", "2")
-                    ),
-                }
-            ),
-        ),
-    ]
-
-    for service_name, handler, schema in services:
-        if hass.services.has_service(DOMAIN, service_name):
-            continue
-        hass.services.async_register(DOMAIN, service_name, handler, schema=schema)
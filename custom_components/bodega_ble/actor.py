@@ -0,0 +1,217 @@
+"""Per-device actor that owns the BLE connection of one fridge.
+
+Polls, commands and queue flushes are submitted as jobs to a single
+long-lived task per fridge instead of racing for a lock. The task runs the
+connection state machine (idle → connecting → session → draining), so jobs
+that arrive while a session is open reuse its connection instead of
+reconnecting.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, TypeVar
+
+from bleak_retry_connector import BleakClientWithServiceCache
+from homeassistant.core import HomeAssistant, callback
+
+from .const import SESSION_LINGER
+from .exceptions import BodegaBleShutdownError
+from .latency import LatencyTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+Job = Callable[[BleakClientWithServiceCache], Awaitable[_T]]
+
+
+class ActorState(StrEnum):
+    """Connection states of a device actor."""
+
+    IDLE = "idle"
+    CONNECTING = "connecting"
+    SESSION = "session"
+    DRAINING = "draining"
+    STOPPED = "stopped"
+
+
+@dataclass
+class _Request:
+    """A job waiting for the actor, with the future its caller awaits."""
+
+    job: Job[Any]
+    future: asyncio.Future[Any]
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class DeviceActor:
+    """Serve BLE jobs for one fridge, one at a time, from one task.
+
+    A failed job ends its session so the next job starts from a fresh
+    connection. Jobs whose caller has given up are skipped. Stopping cancels
+    the task wherever it is waiting, so a hung connect or notify does not
+    hold up unload.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        connect: Callable[[], Awaitable[BleakClientWithServiceCache]],
+        release: Callable[
+            [BleakClientWithServiceCache, BaseException | None], Awaitable[None]
+        ],
+        linger: float = SESSION_LINGER,
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._connect = connect
+        self._release = release
+        self.linger = linger
+        self.wait_latency = LatencyTracker()
+        self._inbox: asyncio.Queue[_Request] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+        self._current: _Request | None = None
+        self._state = ActorState.IDLE
+        self._stopping = False
+        self._sessions = 0
+        self._jobs = 0
+        self._reused = 0
+
+    @property
+    def state(self) -> ActorState:
+        """Return the connection state."""
+        return self._state
+
+    async def async_run(self, job: Job[_T]) -> _T:
+        """Run a job on a connected client and return its result."""
+        if self._stopping or (self._task is not None and self._task.done()):
+            raise BodegaBleShutdownError
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_main(), self._name
+            )
+        future: asyncio.Future[_T] = self._hass.loop.create_future()
+        self._inbox.put_nowait(_Request(job, future))
+        return await future
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop taking jobs and cancel the running one.
+
+        Waiting and running jobs fail with BodegaBleShutdownError once the
+        task has released the connection.
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        if self._task is None:
+            self._state = ActorState.STOPPED
+        else:
+            self._task.cancel()
+
+    async def async_wait_stopped(self, timeout: float) -> None:
+        """Wait up to timeout seconds for a stopped actor's task to exit."""
+        if self._task is None:
+            return
+        _, pending = await asyncio.wait({self._task}, timeout=timeout)
+        if pending:
+            _LOGGER.warning("%s did not stop within %.0f seconds", self._name, timeout)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the actor state for diagnostics."""
+        return {
+            "state": self._state,
+            "queued": self._inbox.qsize(),
+            "sessions": self._sessions,
+            "jobs": self._jobs,
+            "jobs_on_open_session": self._reused,
+        }
+
+    async def _async_main(self) -> None:
+        try:
+            while True:
+                self._current = await self._inbox.get()
+                if not self._current.future.done():
+                    self._record_wait(self._current)
+                    await self._async_session(self._current)
+                self._current = None
+        finally:
+            # Also reached when Home Assistant cancels background tasks on stop.
+            self._stopping = True
+            if self._current is not None:
+                _fail(self._current, BodegaBleShutdownError())
+            while not self._inbox.empty():
+                _fail(self._inbox.get_nowait(), BodegaBleShutdownError())
+            self._state = ActorState.STOPPED
+
+    async def _async_session(self, request: _Request) -> None:
+        """Connect, serve jobs until the inbox stays empty, then disconnect."""
+        self._state = ActorState.CONNECTING
+        try:
+            client = await self._connect()
+        except Exception as err:  # handed to the caller
+            _fail(request, err)
+            self._state = ActorState.IDLE
+            return
+        self._state = ActorState.SESSION
+        self._sessions += 1
+        error: BaseException | None = None
+        try:
+            while True:
+                error = await self._async_serve(client, request)
+                if error is not None or not client.is_connected:
+                    break
+                next_request = await self._async_next_request()
+                if next_request is None:
+                    break
+                request = self._current = next_request
+                self._reused += 1
+        finally:
+            self._state = ActorState.DRAINING
+            try:
+                await self._release(client, error)
+            except Exception:
+                _LOGGER.exception("Error releasing the connection of %s", self._name)
+            self._state = ActorState.IDLE
+
+    async def _async_serve(
+        self, client: BleakClientWithServiceCache, request: _Request
+    ) -> BaseException | None:
+        """Run one job, settle its future and return the error it raised."""
+        self._jobs += 1
+        try:
+            result = await request.job(client)
+        except Exception as err:  # handed to the caller
+            _fail(request, err)
+            return err
+        if not request.future.done():
+            request.future.set_result(result)
+        return None
+
+    async def _async_next_request(self) -> _Request | None:
+        """Wait up to the linger time for a job for the open session."""
+        while True:
+            try:
+                async with asyncio.timeout(self.linger):
+                    request = await self._inbox.get()
+            except TimeoutError:
+                return None
+            if not request.future.done():
+                self._record_wait(request)
+                return request
+
+    def _record_wait(self, request: _Request) -> None:
+        """Record how long a job waited for the actor to pick it up."""
+        self.wait_latency.record(time.monotonic() - request.queued_at)
+
+
+def _fail(request: _Request, err: BaseException) -> None:
+    if not request.future.done():
+        request.future.set_exception(err)
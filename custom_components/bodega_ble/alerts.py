@@ -0,0 +1,189 @@
+"""Per-fridge alert rules, evaluated as telemetry arrives.
+
+Rules are set in the options flow and each can be turned off:
+
+- fridge or freezer excursion: the zone stays more than a margin above its
+  target for a number of minutes
+- stale: no telemetry for a number of minutes
+- low voltage: the supply voltage is below a threshold
+
+The coordinator passes each new reading, from a GATT read, a telemetry
+advertisement or an applied frame, to ``AlertEngine.evaluate`` and checks
+staleness from a timer. Both return only the alerts that changed, so events
+are fired and problem entities written on transitions alone.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    CONF_EXCURSION_DURATION,
+    CONF_EXCURSION_MARGIN,
+    CONF_LOW_VOLTAGE,
+    CONF_STALE_AFTER,
+    DEFAULT_EXCURSION_DURATION,
+    KEY_BATTERY_VOLTAGE,
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_TARGET,
+    KEY_RIGHT_CURRENT,
+    KEY_RIGHT_TARGET,
+)
+
+ALERT_FRIDGE_EXCURSION = "fridge_excursion"
+ALERT_FREEZER_EXCURSION = "freezer_excursion"
+ALERT_STALE = "stale"
+ALERT_LOW_VOLTAGE = "low_voltage"
+
+# Zone temperature and target keys of each excursion alert.
+_ZONES = {
+    ALERT_FRIDGE_EXCURSION: (KEY_LEFT_CURRENT, KEY_LEFT_TARGET),
+    ALERT_FREEZER_EXCURSION: (KEY_RIGHT_CURRENT, KEY_RIGHT_TARGET),
+}
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class AlertRules:
+    """Thresholds of a fridge's alerts; 0 turns a rule off."""
+
+    excursion_margin: float = 0.0  # degrees above target
+    excursion_duration: float = DEFAULT_EXCURSION_DURATION * 60  # seconds
+    stale_after: float = 0.0  # seconds
+    low_voltage: float = 0.0  # volts
+
+    @classmethod
+    def from_entry(cls, entry: ConfigEntry) -> AlertRules:
+        """Return the rules set in a config entry's options."""
+        options = entry.options
+        return cls(
+            excursion_margin=options.get(CONF_EXCURSION_MARGIN, 0.0),
+            excursion_duration=(
+                options.get(CONF_EXCURSION_DURATION, DEFAULT_EXCURSION_DURATION) * 60
+            ),
+            stale_after=options.get(CONF_STALE_AFTER, 0) * 60,
+            low_voltage=options.get(CONF_LOW_VOLTAGE, 0.0),
+        )
+
+    @property
+    def enabled(self) -> tuple[str, ...]:
+        """Return the alerts these rules can raise."""
+        alerts: list[str] = []
+        if self.excursion_margin:
+            alerts.extend(_ZONES)
+        if self.stale_after:
+            alerts.append(ALERT_STALE)
+        if self.low_voltage:
+            alerts.append(ALERT_LOW_VOLTAGE)
+        return tuple(alerts)
+
+
+class AlertTransition(NamedTuple):
+    """An alert that became active or cleared."""
+
+    alert: str
+    active: bool
+    value: float | None
+
+
+class AlertEngine:
+    """Track which of a fridge's alerts are active."""
+
+    def __init__(self, rules: AlertRules) -> None:
+        self._rules = rules
+        self._active: set[str] = set()
+        # When each excursion began, while it lasts less than the duration.
+        self._since: dict[str, float] = {}
+        self._last_update: float | None = None
+
+    @property
+    def rules(self) -> AlertRules:
+        """Return the rules evaluated."""
+        return self._rules
+
+    @property
+    def last_update(self) -> float | None:
+        """Return when telemetry was last evaluated."""
+        return self._last_update
+
+    def is_active(self, alert: str) -> bool:
+        """Return True if an alert is active."""
+        return alert in self._active
+
+    def evaluate(self, timestamp: float, data: dict[str, Any]) -> list[AlertTransition]:
+        """Evaluate an update of coordinator data.
+
+        Rules whose readings are missing from the data keep their state.
+        """
+        rules = self._rules
+        self._last_update = timestamp
+        transitions: list[AlertTransition] = []
+        if rules.stale_after:
+            self._set(ALERT_STALE, False, None, transitions)
+        if rules.excursion_margin:
+            for alert, (current_key, target_key) in _ZONES.items():
+                current = _number(data.get(current_key))
+                target = _number(data.get(target_key))
+                if current is None or target is None:
+                    continue
+                if current <= target + rules.excursion_margin:
+                    self._since.pop(alert, None)
+                    self._set(alert, False, current, transitions)
+                    continue
+                since = self._since.setdefault(alert, timestamp)
+                if timestamp - since >= rules.excursion_duration:
+                    self._set(alert, True, current, transitions)
+        if rules.low_voltage:
+            voltage = _number(data.get(KEY_BATTERY_VOLTAGE))
+            if voltage is not None:
+                self._set(
+                    ALERT_LOW_VOLTAGE, voltage < rules.low_voltage, voltage, transitions
+                )
+        return transitions
+
+    def check_stale(self, timestamp: float) -> list[AlertTransition]:
+        """Raise the stale alert if telemetry stopped arriving."""
+        transitions: list[AlertTransition] = []
+        if (
+            self._rules.stale_after
+            and self._last_update is not None
+            and timestamp - self._last_update >= self._rules.stale_after
+        ):
+            self._set(ALERT_STALE, True, None, transitions)
+        return transitions
+
+    def _set(
+        self,
+        alert: str,
+        active: bool,
+        value: float | None,
+        transitions: list[AlertTransition],
+    ) -> None:
+        if active == (alert in self._active):
+            return
+        if active:
+            self._active.add(alert)
+        else:
+            self._active.discard(alert)
+        transitions.append(AlertTransition(alert, active, value))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the rules and active alerts for diagnostics."""
+        return {
+            "rules": {
+                "excursion_margin": self._rules.excursion_margin,
+                "excursion_duration": self._rules.excursion_duration,
+                "stale_after": self._rules.stale_after,
+                "low_voltage": self._rules.low_voltage,
+            },
+            "active": sorted(self._active),
+            "pending_excursions": sorted(self._since),
+        }
@@ -0,0 +1,417 @@
+"""Offline batch decoder for Bodega BLE capture files.
+
+Decodes the frames received in whole capture files into columns and writes
+them as CSV or Parquet time series::
+
+    python -m custom_components.bodega_ble.batch_decode -f parquet *.bdgcap
+
+Frames are decoded in chunks of DECODE_CHUNK so memory stays bounded
+however large the file, and each chunk is appended to the output as soon as
+it is decoded. Status frames of one length share a layout, so within a chunk
+the frames of each length are gathered into a matrix and validated and
+decoded column by column with NumPy. The result matches decode_frame() frame
+for frame. Files are decoded in a process pool. NumPy, and pyarrow for
+Parquet, are only needed here and are not requirements of the integration.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice, repeat
+
+import numpy as np
+
+from .capture import CaptureReader, FrameDirection
+from .const import (
+    CMD_QUERY,
+    CMD_SET,
+    KEY_BATTERY_PERCENT,
+    KEY_BATTERY_SAVER,
+    KEY_BATTERY_VOLTAGE,
+    KEY_COMPRESSOR_STATUS,
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_RET_DIFF,
+    KEY_LEFT_TARGET,
+    KEY_LEFT_TC_COLD,
+    KEY_LEFT_TC_HALT,
+    KEY_LEFT_TC_HOT,
+    KEY_LEFT_TC_MID,
+    KEY_LOCKED,
+    KEY_POWERED,
+    KEY_RIGHT_CURRENT,
+    KEY_RIGHT_RET_DIFF,
+    KEY_RIGHT_TARGET,
+    KEY_RIGHT_TC_COLD,
+    KEY_RIGHT_TC_HALT,
+    KEY_RIGHT_TC_HOT,
+    KEY_RIGHT_TC_MID,
+    KEY_RUN_MODE,
+    KEY_RUNNING_STATUS,
+    KEY_START_DELAY,
+    KEY_TEMP_MAX,
+    KEY_TEMP_MIN,
+    KEY_TEMP_UNIT,
+)
+from .parser import FrameOutcome
+
+FORMAT_CSV = "csv"
+FORMAT_PARQUET = "parquet"
+
+COLUMN_TIMESTAMP = "timestamp"
+COLUMN_DEVICE = "device"
+COLUMN_OUTCOME = "outcome"
+
+# Frames decoded, and rows written, at a time.
+DECODE_CHUNK = 65536
+
+# Offsets into the data bytes, as in parser._parse_data.
+_BOOL_FIELDS = ((KEY_LOCKED, 0x00), (KEY_POWERED, 0x01))
+_UINT8_FIELDS = ((KEY_START_DELAY, 0x08),)
+_INT8_FIELDS = (
+    (KEY_LEFT_TARGET, 0x04),
+    (KEY_LEFT_CURRENT, 0x0E),
+    (KEY_TEMP_MAX, 0x05),
+    (KEY_TEMP_MIN, 0x06),
+    (KEY_LEFT_RET_DIFF, 0x07),
+    (KEY_LEFT_TC_HOT, 0x0A),
+    (KEY_LEFT_TC_MID, 0x0B),
+    (KEY_LEFT_TC_COLD, 0x0C),
+    (KEY_LEFT_TC_HALT, 0x0D),
+)
+_DUAL_INT8_FIELDS = (
+    (KEY_RIGHT_TARGET, 0x12),
+    (KEY_RIGHT_RET_DIFF, 0x15),
+    (KEY_RIGHT_TC_HOT, 0x16),
+    (KEY_RIGHT_TC_MID, 0x17),
+    (KEY_RIGHT_TC_COLD, 0x18),
+    (KEY_RIGHT_TC_HALT, 0x19),
+    (KEY_RIGHT_CURRENT, 0x1A),
+)
+_DUAL_UINT8_FIELDS = ((KEY_RUNNING_STATUS, 0x1B),)
+
+_DATA_OFFSET = 4
+_MIN_DATA = 0x12
+_DUAL_DATA = 0x1C
+
+_OUTCOMES = list(FrameOutcome)
+_OUTCOME_CODE = {outcome: code for code, outcome in enumerate(_OUTCOMES)}
+_OUTCOME_TEXT = np.array([outcome.value for outcome in _OUTCOMES])
+_RUN_MODES = np.array(["Max", "Eco"] + ["Unknown"] * 254)
+_BATTERY_SAVERS = np.array(["Low", "Mid", "High"] + ["Unknown"] * 253)
+
+
+@dataclass
+class DecodedFrames:
+    """Columns of decoded frames; a row is missing from a column if masked."""
+
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+    valid: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.columns[COLUMN_TIMESTAMP])
+
+
+def iter_capture(path: str, chunk: int = DECODE_CHUNK) -> Iterator[DecodedFrames]:
+    """Decode the frames received in a capture file, chunk frames at a time.
+
+    At least one chunk is yielded, so an empty file still has its columns.
+    """
+    with CaptureReader(path) as reader:
+        spans = (
+            (timestamp, device, offset, length)
+            for timestamp, direction, device, offset, length in reader.spans()
+            if direction == FrameDirection.RX
+        )
+        buffer = np.frombuffer(reader.buffer, dtype=np.uint8)
+        try:
+            batch = list(islice(spans, chunk))
+            yield _decode_spans(buffer, batch)
+            while batch := list(islice(spans, chunk)):
+                yield _decode_spans(buffer, batch)
+        finally:
+            # The array holds an export of the map, which blocks closing it.
+            del buffer
+
+
+def decode_capture(path: str) -> DecodedFrames:
+    """Decode the frames received in a capture file into columns in memory."""
+    chunks = list(iter_capture(path))
+    decoded = DecodedFrames()
+    for name in chunks[0].columns:
+        decoded.columns[name] = np.concatenate(
+            [chunk.columns[name] for chunk in chunks]
+        )
+    for name in chunks[0].valid:
+        decoded.valid[name] = np.concatenate([chunk.valid[name] for chunk in chunks])
+    return decoded
+
+
+def decode_frames(frames: Sequence[bytes]) -> DecodedFrames:
+    """Decode frames held in memory into columns, with zero timestamps."""
+    buffer = np.frombuffer(b"".join(frames), dtype=np.uint8)
+    spans = []
+    offset = 0
+    for frame in frames:
+        spans.append((0.0, b"", offset, len(frame)))
+        offset += len(frame)
+    return _decode_spans(buffer, spans)
+
+
+def _decode_spans(
+    buffer: np.ndarray, spans: list[tuple[float, bytes, int, int]]
+) -> DecodedFrames:
+    """Decode the frames at (timestamp, device, offset, length) in buffer."""
+    count = len(spans)
+    decoded = DecodedFrames()
+    decoded.columns[COLUMN_TIMESTAMP] = np.fromiter(
+        (span[0] for span in spans), dtype=np.float64, count=count
+    )
+    decoded.columns[COLUMN_DEVICE] = np.array(
+        [span[1].hex() for span in spans], dtype="U12"
+    )
+    offsets = np.fromiter((span[2] for span in spans), dtype=np.int64, count=count)
+    lengths = np.fromiter((span[3] for span in spans), dtype=np.int64, count=count)
+    outcomes = np.empty(count, dtype=np.uint8)
+    decoded.columns[COLUMN_OUTCOME] = np.empty(count, dtype=_OUTCOME_TEXT.dtype)
+    _allocate_fields(decoded, count)
+
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        matrix = buffer[offsets[rows, None] + np.arange(length)]
+        outcomes[rows] = _validate(matrix, int(length))
+        accepted = (outcomes[rows] == _OUTCOME_CODE[FrameOutcome.OK]) | (
+            outcomes[rows] == _OUTCOME_CODE[FrameOutcome.DOUBLED_CHECKSUM]
+        )
+        if accepted.any():
+            data = matrix[accepted, _DATA_OFFSET : length - 2]
+            _decode_data(decoded, rows[accepted], data)
+
+    decoded.columns[COLUMN_OUTCOME][:] = _OUTCOME_TEXT[outcomes]
+    return decoded
+
+
+def _validate(matrix: np.ndarray, length: int) -> np.ndarray:
+    """Return the outcome codes of frames of one length, as decode_frame."""
+    count = len(matrix)
+    if length < 6:
+        return np.full(count, _OUTCOME_CODE[FrameOutcome.SHORT_FRAME], np.uint8)
+    bad_header = (matrix[:, 0] != 0xFE) | (matrix[:, 1] != 0xFE)
+    frame_len = matrix[:, 2].astype(np.int64)
+    bad_length = (frame_len < 3) | (frame_len + 3 != length)
+    expected = (matrix[:, length - 2].astype(np.uint32) << 8) | matrix[:, length - 1]
+    checksum = matrix[:, : length - 2].sum(axis=1, dtype=np.uint32) & 0xFFFF
+    plain = expected == checksum
+    # Some firmware variants appear to double the checksum value.
+    doubled = ~plain & (expected == ((checksum * 2) & 0xFFFF))
+    unknown_command = ~np.isin(matrix[:, 3], (CMD_QUERY, CMD_SET))
+    short_data = np.full(count, length - 6 < _MIN_DATA)
+    return np.select(
+        [bad_header, bad_length, ~(plain | doubled), unknown_command, short_data],
+        [
+            _OUTCOME_CODE[FrameOutcome.BAD_HEADER],
+            _OUTCOME_CODE[FrameOutcome.SHORT_FRAME],
+            _OUTCOME_CODE[FrameOutcome.BAD_CHECKSUM],
+            _OUTCOME_CODE[FrameOutcome.UNKNOWN_COMMAND],
+            _OUTCOME_CODE[FrameOutcome.SHORT_FRAME],
+        ],
+        np.where(
+            doubled,
+            _OUTCOME_CODE[FrameOutcome.DOUBLED_CHECKSUM],
+            _OUTCOME_CODE[FrameOutcome.OK],
+        ),
+    ).astype(np.uint8)
+
+
+def _allocate_fields(decoded: DecodedFrames, count: int) -> None:
+    """Add an empty, fully masked column for every decoded field."""
+
+    def add(key: str, dtype: str | type) -> None:
+        decoded.columns[key] = np.zeros(count, dtype=dtype)
+        decoded.valid[key] = np.zeros(count, dtype=bool)
+
+    for key, _ in _BOOL_FIELDS:
+        add(key, bool)
+    add(KEY_RUN_MODE, "U7")
+    add(KEY_BATTERY_SAVER, "U7")
+    add(KEY_TEMP_UNIT, "U1")
+    for key, _ in _UINT8_FIELDS:
+        add(key, np.uint8)
+    for key, _ in _INT8_FIELDS:
+        add(key, np.int8)
+    add(KEY_BATTERY_PERCENT, np.uint8)
+    add(KEY_BATTERY_VOLTAGE, np.float64)
+    add(KEY_COMPRESSOR_STATUS, "U14")
+    for key, _ in _DUAL_INT8_FIELDS:
+        add(key, np.int8)
+    for key, _ in _DUAL_UINT8_FIELDS:
+        add(key, np.uint8)
+
+
+def _decode_data(decoded: DecodedFrames, rows: np.ndarray, data: np.ndarray) -> None:
+    """Decode the data bytes of accepted frames of one length into rows."""
+    columns = decoded.columns
+
+    def put(key: str, values: np.ndarray, valid: np.ndarray | bool = True) -> None:
+        columns[key][rows] = values
+        decoded.valid[key][rows] = valid
+
+    signed = data.view(np.int8)
+    for key, index in _BOOL_FIELDS:
+        put(key, data[:, index] != 0)
+    put(KEY_RUN_MODE, _RUN_MODES[data[:, 0x02]])
+    put(KEY_BATTERY_SAVER, _BATTERY_SAVERS[data[:, 0x03]])
+    put(KEY_TEMP_UNIT, np.where(data[:, 0x09] == 1, "F", "C"))
+    for key, index in _UINT8_FIELDS:
+        put(key, data[:, index])
+    for key, index in _INT8_FIELDS:
+        put(key, signed[:, index])
+    put(KEY_BATTERY_PERCENT, data[:, 0x0F], data[:, 0x0F] != 0x7F)
+    voltage = data[:, 0x10].astype(np.float64) + data[:, 0x11] / 10.0
+    put(KEY_BATTERY_VOLTAGE, voltage)
+    put(
+        KEY_COMPRESSOR_STATUS,
+        np.select(
+            [voltage >= 24.0, (voltage > 23.0) & (voltage < 23.9)],
+            ["Compressor Off", "Compressor On"],
+            "Unknown",
+        ),
+    )
+    if data.shape[1] >= _DUAL_DATA:
+        for key, index in _DUAL_INT8_FIELDS:
+            put(key, signed[:, index])
+        for key, index in _DUAL_UINT8_FIELDS:
+            put(key, data[:, index])
+
+
+def write_csv(chunks: Iterable[DecodedFrames], path: str) -> int:
+    """Append chunks of decoded frames to a CSV file and return the rows.
+
+    Missing values are empty cells.
+    """
+    rows = 0
+    header = True
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        for decoded in chunks:
+            if header:
+                writer.writerow(decoded.columns)
+                header = False
+            cells = []
+            for name, values in decoded.columns.items():
+                text = values.astype(str)
+                if name in decoded.valid:
+                    text = np.where(decoded.valid[name], text, "")
+                cells.append(text.tolist())
+            writer.writerows(zip(*cells, strict=True))
+            rows += len(decoded)
+    return rows
+
+
+def write_parquet(chunks: Iterable[DecodedFrames], path: str) -> int:
+    """Write chunks of decoded frames as Parquet row groups and return the rows.
+
+    Missing values are nulls.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow") from err
+    rows = 0
+    writer: pq.ParquetWriter | None = None
+    try:
+        for decoded in chunks:
+            table = pa.table(
+                {
+                    name: pa.array(
+                        values,
+                        mask=~decoded.valid[name] if name in decoded.valid else None,
+                    )
+                    for name, values in decoded.columns.items()
+                }
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            rows += len(decoded)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+_WRITERS = {FORMAT_CSV: write_csv, FORMAT_PARQUET: write_parquet}
+
+
+def decode_file(
+    path: str, output_dir: str, output_format: str, chunk: int = DECODE_CHUNK
+) -> tuple[str, int]:
+    """Decode one capture file into output_dir and return the output and rows."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    output = os.path.join(output_dir, f"{name}.{output_format}")
+    return output, _WRITERS[output_format](iter_capture(path, chunk), output)
+
+
+def decode_files(
+    paths: Sequence[str],
+    output_dir: str,
+    output_format: str = FORMAT_CSV,
+    workers: int | None = None,
+    chunk: int = DECODE_CHUNK,
+) -> list[tuple[str, int]]:
+    """Decode capture files in a process pool; one worker decodes in-process."""
+    os.makedirs(output_dir, exist_ok=True)
+    if workers == 1 or len(paths) == 1:
+        return [decode_file(path, output_dir, output_format, chunk) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(
+                decode_file,
+                paths,
+                repeat(output_dir),
+                repeat(output_format),
+                repeat(chunk),
+            )
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the batch decoder from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.bodega_ble.batch_decode",
+        description="Decode Bodega BLE capture files into CSV or Parquet.",
+    )
+    parser.add_argument("paths", nargs="+", help="capture files to decode")
+    parser.add_argument(
+        "-o", "--output", default=".", help="directory for the decoded files"
+    )
+    parser.add_argument("-f", "--format", choices=sorted(_WRITERS), default=FORMAT_CSV)
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk",
+        type=int,
+        default=DECODE_CHUNK,
+        help=f"frames decoded and written at a time (default: {DECODE_CHUNK})",
+    )
+    args = parser.parse_args(argv)
+    for output, rows in decode_files(
+        args.paths, args.output, args.format, args.workers, args.chunk
+    ):
+        print(f"{output}: {rows} frames")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -20,6 +20,12 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .alerts import (
+    ALERT_FREEZER_EXCURSION,
+    ALERT_FRIDGE_EXCURSION,
+    ALERT_LOW_VOLTAGE,
+    ALERT_STALE,
+)
 from .const import KEY_LOCKED, KEY_POWERED
 from .coordinator import BodegaBleCoordinator
 from .entity import device_info_for_entry
@@ -52,6 +58,23 @@ BINARY_SENSOR_DESCRIPTIONS: tuple[BodegaBinarySensorEntityDescription, ...] = (
 )
 
 
+# Problem sensors of the alert rules, keyed by alert.
+ALERT_DESCRIPTIONS: dict[str, BinarySensorEntityDescription] = {
+    alert: BinarySensorEntityDescription(
+        key=f"alert_{alert}",
+        name=name,
+        translation_key=f"alert_{alert}",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    )
+    for alert, name in (
+        (ALERT_FRIDGE_EXCURSION, "Fridge temperature alert"),
+        (ALERT_FREEZER_EXCURSION, "Freezer temperature alert"),
+        (ALERT_STALE, "Stale telemetry"),
+        (ALERT_LOW_VOLTAGE, "Low voltage"),
+    )
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -64,6 +87,10 @@ async def async_setup_entry(
         BodegaBleBinarySensor(coordinator, entry, description)
         for description in BINARY_SENSOR_DESCRIPTIONS
     )
+    async_add_entities(
+        BodegaBleAlertSensor(coordinator, entry, alert)
+        for alert in coordinator.alerts.rules.enabled
+    )
 
 
 class BodegaBleBinarySensor(
@@ -95,3 +122,38 @@ class BodegaBleBinarySensor(
     def is_on(self) -> bool | None:
         data = self.coordinator.data or {}
         return data.get(self.entity_description.data_key)
+
+
+class BodegaBleAlertSensor(BinarySensorEntity):
+    """Problem sensor of one alert rule.
+
+    It is written when the alert changes, not on every coordinator update.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self, coordinator: BodegaBleCoordinator, entry: ConfigEntry, alert: str
+    ) -> None:
+        """Initialize the alert sensor."""
+        self.entity_description = ALERT_DESCRIPTIONS[alert]
+        self._attr_unique_id = f"{entry.entry_id}_{self.entity_description.key}"
+        self._coordinator = coordinator
+        self._entry = entry
+        self._alert = alert
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information for this entity."""
+        return device_info_for_entry(self._entry)
+
+    @property
+    def is_on(self) -> bool:
+        return self._coordinator.alerts.is_active(self._alert)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the coordinator's alert transitions."""
+        self.async_on_remove(
+            self._coordinator.async_add_alert_listener(self.async_write_ha_state)
+        )
@@ -76,4 +76,3 @@ class BodegaBleButton(CoordinatorEntity[BodegaBleCoordinator], ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         await self.coordinator.async_send_bind()
-        await self.coordinator.async_request_refresh()
@@ -0,0 +1,278 @@
+"""Raw frame capture for Bodega BLE fridges.
+
+Every frame written to or received from a fridge is kept, with its parse
+outcome, in a small per-device ring buffer that diagnostics export as hex.
+Optionally the frames are also appended to a capture file, in records of:
+
+    offset  size  field
+    0       8     timestamp, float64 Unix seconds
+    8       1     direction, 0 = TX (to the fridge), 1 = RX (from the fridge)
+    9       6     device id, see device_id()
+    15      2     frame length N
+    17      N     frame bytes
+
+All integers are little-endian. The file starts with an 8-byte header of
+``CAPTURE_MAGIC`` followed by the format version and a reserved zero byte.
+Records are only ever appended, so a file cut short by a crash loses at
+most its last record. CaptureReader memory-maps a file and walks its
+records without loading it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntEnum
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import CAPTURE_FLUSH_DELAY, CAPTURE_SIZE, DOMAIN
+from .parser import FrameOutcome
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"BDGCAP"
+CAPTURE_VERSION = 1
+CAPTURE_HEADER = CAPTURE_MAGIC + bytes([CAPTURE_VERSION, 0])
+RECORD_HEADER = struct.Struct("<dB6sH")
+
+
+class FrameDirection(IntEnum):
+    """Direction of a captured frame, as stored in capture files."""
+
+    TX = 0
+    RX = 1
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedFrame:
+    """One frame on the wire; outcome is None for frames we sent."""
+
+    timestamp: float
+    direction: FrameDirection
+    frame: bytes
+    outcome: FrameOutcome | None
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    """One record read back from a capture file."""
+
+    timestamp: float
+    direction: FrameDirection
+    device_id: bytes
+    frame: bytes
+
+
+class InvalidCaptureError(ValueError):
+    """Raised when a file is not a capture file this version can read."""
+
+
+def device_id(address: str) -> bytes:
+    """Return the 6-byte device id of a Bluetooth address.
+
+    Platforms that hide MAC addresses behind UUIDs get a stable hash.
+    """
+    try:
+        raw = bytes.fromhex(address.replace(":", ""))
+    except ValueError:
+        raw = b""
+    if len(raw) == 6:
+        return raw
+    return hashlib.blake2b(address.encode(), digest_size=6).digest()
+
+
+def capture_path(hass: HomeAssistant, address: str) -> str:
+    """Return the capture file path of a fridge."""
+    return hass.config.path(DOMAIN, "captures", f"{device_id(address).hex()}.bdgcap")
+
+
+class FrameCapture:
+    """Ring buffer of a fridge's recent frames, optionally mirrored to a file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        path: str | None = None,
+        size: int = CAPTURE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._hass = hass
+        self._device_id = device_id(address)
+        self._path = path
+        self._clock = clock
+        self._frames: deque[CapturedFrame] = deque(maxlen=size)
+        self._outcomes: Counter[str] = Counter()
+        self._pending = bytearray()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def record_tx(self, frame: bytes) -> None:
+        """Record a frame written to the fridge."""
+        self._record(FrameDirection.TX, frame, None)
+
+    @callback
+    def record_rx(self, frame: bytes, outcome: FrameOutcome) -> None:
+        """Record a frame received from the fridge with its parse outcome."""
+        self._outcomes[outcome.value] += 1
+        self._record(FrameDirection.RX, frame, outcome)
+
+    def _record(
+        self, direction: FrameDirection, frame: bytes, outcome: FrameOutcome | None
+    ) -> None:
+        captured = CapturedFrame(self._clock(), direction, frame, outcome)
+        self._frames.append(captured)
+        if self._path is None:
+            return
+        self._pending += RECORD_HEADER.pack(
+            captured.timestamp, direction, self._device_id, len(frame)
+        )
+        self._pending += frame
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, CAPTURE_FLUSH_DELAY, self._async_flush_later
+            )
+
+    async def _async_flush_later(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Append pending records to the capture file."""
+        if not self._pending or self._path is None:
+            return
+        data = bytes(self._pending)
+        self._pending.clear()
+        try:
+            await self._hass.async_add_executor_job(_append, self._path, data)
+        except OSError as err:
+            _LOGGER.warning("Failed to write capture file %s: %s", self._path, err)
+
+    async def async_stop(self) -> None:
+        """Cancel the pending flush and write what is left."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+
+    def frames(self) -> list[CapturedFrame]:
+        """Return the buffered frames, oldest first."""
+        return list(self._frames)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the buffered frames as hex for diagnostics."""
+        return {
+            # The file name carries the address, which diagnostics redact.
+            "file_enabled": self._path is not None,
+            "rx_outcomes": dict(self._outcomes),
+            "frames": [
+                {
+                    "time": dt_util.utc_from_timestamp(frame.timestamp).isoformat(),
+                    "direction": frame.direction.name.lower(),
+                    "outcome": frame.outcome,
+                    "hex": frame.frame.hex(),
+                }
+                for frame in self._frames
+            ],
+        }
+
+
+def _append(path: str, data: bytes) -> None:
+    """Append records to a capture file, writing the header to a new file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as file:
+        if file.tell() == 0:
+            file.write(CAPTURE_HEADER)
+        file.write(data)
+
+
+class CaptureReader:
+    """Memory-mapped reader of a capture file.
+
+    Records are decoded one at a time as they are iterated, so the size of
+    the file does not matter; the operating system pages it in as needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < len(CAPTURE_HEADER):
+                raise InvalidCaptureError(f"{path} is too short for a capture file")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._map[: len(CAPTURE_HEADER)]
+        if header[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            self.close()
+            raise InvalidCaptureError(f"{path} is not a capture file")
+        if header[len(CAPTURE_MAGIC)] != CAPTURE_VERSION:
+            self.close()
+            raise InvalidCaptureError(
+                f"{path} has unsupported capture version {header[len(CAPTURE_MAGIC)]}"
+            )
+        self._path = path
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        return self.records()
+
+    @property
+    def buffer(self) -> mmap.mmap:
+        """Return the mapped file, for readers that slice frames themselves."""
+        return self._map
+
+    def records(
+        self,
+        device: bytes | None = None,
+        direction: FrameDirection | None = None,
+    ) -> Iterator[CaptureRecord]:
+        """Yield the records in file order, optionally of one device or direction."""
+        for timestamp, raw_direction, record_device, offset, length in self.spans():
+            if (device is None or record_device == device) and (
+                direction is None or raw_direction == direction
+            ):
+                yield CaptureRecord(
+                    timestamp,
+                    FrameDirection(raw_direction),
+                    record_device,
+                    self._map[offset : offset + length],
+                )
+
+    def spans(self) -> Iterator[tuple[float, int, bytes, int, int]]:
+        """Yield timestamp, direction, device id, offset and length of each frame.
+
+        The offset is where the frame starts in buffer; frames are not copied.
+        """
+        data = self._map
+        end = len(data)
+        offset = len(CAPTURE_HEADER)
+        while offset + RECORD_HEADER.size <= end:
+            timestamp, direction, device, length = RECORD_HEADER.unpack_from(
+                data, offset
+            )
+            offset += RECORD_HEADER.size
+            if offset + length > end:
+                break
+            yield timestamp, direction, device, offset, length
+            offset += length
+        if offset < end:
+            _LOGGER.debug("Ignoring truncated record at the end of %s", self._path)
@@ -0,0 +1,127 @@
+"""Persisted offline command queue for Bodega BLE fridges.
+
+Commands that cannot reach the fridge are kept as per-field intents, not
+encoded frames: the frame depends on the device state at the time it is
+sent, and a later write to the same field simply replaces the earlier one.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, MAX_QUEUE_TTL, QUEUE_SAVE_DELAY, QUEUE_STORAGE_VERSION
+from .settings import SETTINGS_FIELDS
+
+
+@dataclass(frozen=True)
+class QueuedCommand:
+    """A pending value for one field."""
+
+    value: Any
+    queued_at: float
+    expires_at: float
+
+
+class CommandQueue:
+    """Per-device queue of field writes with TTLs and last-write-wins merging.
+
+    Holding at most one pending value per settings field bounds the queue.
+    Expiry uses wall-clock time because the queue outlives restarts.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, QUEUE_STORAGE_VERSION, f"{DOMAIN}.command_queue.{entry_id}"
+        )
+        self._clock = clock
+        self._pending: dict[str, QueuedCommand] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.pending())
+
+    async def async_load(self) -> None:
+        """Restore unexpired commands from storage."""
+        stored = await self._store.async_load() or {}
+        for field, item in stored.get("commands", {}).items():
+            if field in SETTINGS_FIELDS:
+                self._pending[field] = QueuedCommand(
+                    item["value"], item["queued_at"], item["expires_at"]
+                )
+        self._expire()
+
+    @callback
+    def put(self, updates: dict[str, Any], ttl: float) -> None:
+        """Queue field values, replacing any pending value for the same field."""
+        unknown = updates.keys() - SETTINGS_FIELDS
+        if unknown:
+            raise ValueError(f"Fields cannot be queued: {', '.join(sorted(unknown))}")
+        now = self._clock()
+        expires_at = now + min(ttl, MAX_QUEUE_TTL)
+        for field, value in updates.items():
+            self._pending[field] = QueuedCommand(value, now, expires_at)
+        self._async_schedule_save()
+
+    @callback
+    def pending(self) -> dict[str, QueuedCommand]:
+        """Return a snapshot of the unexpired commands."""
+        self._expire()
+        return dict(self._pending)
+
+    @callback
+    def discard(self, sent: dict[str, QueuedCommand]) -> None:
+        """Drop commands that were sent, keeping any queued since the snapshot."""
+        for field, command in sent.items():
+            if self._pending.get(field) is command:
+                del self._pending[field]
+        self._async_schedule_save()
+
+    def _expire(self) -> None:
+        now = self._clock()
+        expired = [
+            field
+            for field, command in self._pending.items()
+            if command.expires_at <= now
+        ]
+        for field in expired:
+            del self._pending[field]
+        if expired:
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, QUEUE_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "commands": {
+                field: {
+                    "value": command.value,
+                    "queued_at": command.queued_at,
+                    "expires_at": command.expires_at,
+                }
+                for field, command in self._pending.items()
+            }
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the pending commands for diagnostics."""
+        now = self._clock()
+        return {
+            field: {
+                "value": command.value,
+                "age": round(now - command.queued_at, 1),
+                "expires_in": round(command.expires_at - now, 1),
+            }
+            for field, command in self._pending.items()
+        }
@@ -0,0 +1,183 @@
+"""Compressor duty cycle and runtime analytics for Bodega BLE fridges.
+
+The compressor state is inferred from the supply voltage by the parser
+(``compressor_status``). Each sample either extends the current run or ends
+it and starts one in the other state. Completed runs are kept in a deque
+covering the analytics window, with running totals updated as runs are
+appended and evicted, so a sample costs O(1) amortized and no query scans
+history.
+
+Only time between samples at most ``max_gap`` apart is tracked; a longer
+gap (the fridge out of range) ends the current run without counting the
+gap as either state. A run's duration counts towards the mean on and off
+times only if both its start and its end were seen as transitions.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, NamedTuple
+
+from .const import COMPRESSOR_MAX_GAP
+
+_COMPRESSOR_STATES = {"Compressor On": True, "Compressor Off": False}
+
+
+class CompressorRun(NamedTuple):
+    """A stretch of time the compressor stayed on or off."""
+
+    start: float
+    end: float
+    on: bool
+    # Whether the run began with, and ended with, a change of state.
+    started: bool
+    complete: bool
+
+
+class CompressorAnalytics:
+    """Track compressor runs over a sliding window."""
+
+    def __init__(
+        self, window: float, power: float, max_gap: float = COMPRESSOR_MAX_GAP
+    ) -> None:
+        self._window = window
+        self._power = power
+        self._max_gap = max_gap
+        self._runs: deque[CompressorRun] = deque()
+        # Totals over the runs in the deque, indexed by state (False, True).
+        self._time = [0.0, 0.0]
+        self._complete_time = [0.0, 0.0]
+        self._complete_count = [0, 0]
+        self._starts = 0
+        # The open run, and the last sample.
+        self._state: bool | None = None
+        self._start = 0.0
+        self._started = False
+        self._last: float | None = None
+
+    @property
+    def window(self) -> float:
+        """Return the window length in seconds."""
+        return self._window
+
+    def add(self, timestamp: float, status: Any) -> None:
+        """Fold in a compressor status sample."""
+        on = _COMPRESSOR_STATES.get(status)
+        last = self._last
+        if on is None or (last is not None and timestamp < last):
+            return
+        if last is not None and timestamp - last > self._max_gap:
+            self._close(last, complete=False)
+            self._state = None
+        if on != self._state:
+            switched = self._state is not None
+            if switched:
+                self._close(timestamp, complete=True)
+            self._state = on
+            self._start = timestamp
+            self._started = switched
+        self._last = timestamp
+        self._evict(timestamp - self._window)
+
+    def _close(self, end: float, complete: bool) -> None:
+        if self._state is None or end <= self._start:
+            return
+        run = CompressorRun(
+            self._start, end, self._state, self._started, complete and self._started
+        )
+        self._runs.append(run)
+        self._count(run, 1)
+
+    def _count(self, run: CompressorRun, sign: int) -> None:
+        duration = run.end - run.start
+        self._time[run.on] += sign * duration
+        if run.complete:
+            self._complete_time[run.on] += sign * duration
+            self._complete_count[run.on] += sign
+        if run.on and run.started:
+            self._starts += sign
+
+    def _evict(self, window_start: float) -> None:
+        runs = self._runs
+        while runs and runs[0].end <= window_start:
+            self._count(runs.popleft(), -1)
+
+    def _time_in_window(self, on: bool) -> float:
+        """Return the tracked seconds in a state within the window."""
+        if self._last is None:
+            return 0.0
+        window_start = self._last - self._window
+        total = self._time[on]
+        if self._runs and self._runs[0].on == on:
+            total -= max(0.0, window_start - self._runs[0].start)
+        if self._state == on:
+            total += self._last - max(self._start, window_start)
+        return total
+
+    @property
+    def on_time(self) -> float:
+        """Return the seconds the compressor ran within the window."""
+        return self._time_in_window(True)
+
+    @property
+    def duty_cycle(self) -> float | None:
+        """Return the percentage of tracked time the compressor ran."""
+        on_time = self.on_time
+        tracked = on_time + self._time_in_window(False)
+        if not tracked:
+            return None
+        return round(100 * on_time / tracked, 1)
+
+    @property
+    def cycles(self) -> int:
+        """Return how many times the compressor started within the window."""
+        if self._last is None:
+            return 0
+        starts = self._starts
+        first = self._runs[0] if self._runs else None
+        if (
+            first is not None
+            and first.on
+            and first.started
+            and first.start < self._last - self._window
+        ):
+            starts -= 1
+        if self._state and self._started:
+            starts += 1
+        return starts
+
+    def _mean_duration(self, on: bool) -> float | None:
+        count = self._complete_count[on]
+        if not count:
+            return None
+        return round(self._complete_time[on] / count)
+
+    @property
+    def mean_on_time(self) -> float | None:
+        """Return the mean seconds of the complete on runs in the window."""
+        return self._mean_duration(True)
+
+    @property
+    def mean_off_time(self) -> float | None:
+        """Return the mean seconds of the complete off runs in the window."""
+        return self._mean_duration(False)
+
+    @property
+    def energy(self) -> float | None:
+        """Return the estimated Wh used by the compressor within the window."""
+        if self._last is None:
+            return None
+        return round(self.on_time * self._power / 3600, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the analytics for diagnostics."""
+        return {
+            "window": self._window,
+            "power": self._power,
+            "duty_cycle": self.duty_cycle,
+            "cycles": self.cycles,
+            "mean_on_time": self.mean_on_time,
+            "mean_off_time": self.mean_off_time,
+            "energy": self.energy,
+            "runs": len(self._runs),
+        }
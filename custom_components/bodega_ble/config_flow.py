@@ -28,11 +28,37 @@ from homeassistant.const import CONF_ADDRESS, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 
 from .const import (
+    CONF_ANALYTICS_WINDOW,
+    CONF_CALLBACK_BUDGET,
+    CONF_CAPTURE_FILE,
+    CONF_COMMAND_TIMEOUT,
+    CONF_COMPRESSOR_POWER,
+    CONF_CONNECT_TIMEOUT,
+    CONF_EXCURSION_DURATION,
+    CONF_EXCURSION_MARGIN,
+    CONF_IMPORT_STATISTICS,
+    CONF_LOW_VOLTAGE,
+    CONF_POLL_MODE,
+    CONF_STALE_AFTER,
+    DEFAULT_ANALYTICS_WINDOW,
+    DEFAULT_COMPRESSOR_POWER,
+    DEFAULT_EXCURSION_DURATION,
     DEFAULT_SCAN_INTERVAL,
     DEVICE_NAME_PREFIXES,
     DOMAIN,
+    MAX_ANALYTICS_WINDOW,
     MAX_BACKOFF_INTERVAL,
+    MAX_CALLBACK_BUDGET,
+    MAX_COMMAND_TIMEOUT,
+    MAX_COMPRESSOR_POWER,
+    MAX_CONNECT_TIMEOUT,
+    MAX_EXCURSION_DURATION,
+    MAX_EXCURSION_MARGIN,
+    MAX_LOW_VOLTAGE,
+    MAX_STALE_AFTER,
     NAME,
+    POLL_MODE_ACTIVE,
+    POLL_MODES,
     SERVICE_UUID,
 )
 
@@ -210,9 +236,8 @@ class BodegaBleOptionsFlow(OptionsFlowWithConfigEntry):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        current_interval = self.config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-        )
+        options = self.config_entry.options
+        current_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
         return self.async_show_form(
             step_id="init",
@@ -225,6 +250,87 @@ class BodegaBleOptionsFlow(OptionsFlowWithConfigEntry):
                         vol.Coerce(int),
                         vol.Range(min=60, max=MAX_BACKOFF_INTERVAL),
                     ),
+                    vol.Optional(
+                        CONF_CONNECT_TIMEOUT,
+                        default=options.get(CONF_CONNECT_TIMEOUT, 0),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_CONNECT_TIMEOUT),
+                    ),
+                    vol.Optional(
+                        CONF_COMMAND_TIMEOUT,
+                        default=options.get(CONF_COMMAND_TIMEOUT, 0),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_COMMAND_TIMEOUT),
+                    ),
+                    vol.Optional(
+                        CONF_POLL_MODE,
+                        default=options.get(CONF_POLL_MODE, POLL_MODE_ACTIVE),
+                    ): vol.In(POLL_MODES),
+                    vol.Optional(
+                        CONF_CAPTURE_FILE,
+                        default=options.get(CONF_CAPTURE_FILE, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_IMPORT_STATISTICS,
+                        default=options.get(CONF_IMPORT_STATISTICS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ANALYTICS_WINDOW,
+                        default=options.get(
+                            CONF_ANALYTICS_WINDOW, DEFAULT_ANALYTICS_WINDOW
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_ANALYTICS_WINDOW),
+                    ),
+                    vol.Optional(
+                        CONF_COMPRESSOR_POWER,
+                        default=options.get(
+                            CONF_COMPRESSOR_POWER, DEFAULT_COMPRESSOR_POWER
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_COMPRESSOR_POWER),
+                    ),
+                    vol.Optional(
+                        CONF_EXCURSION_MARGIN,
+                        default=options.get(CONF_EXCURSION_MARGIN, 0),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_EXCURSION_MARGIN),
+                    ),
+                    vol.Optional(
+                        CONF_EXCURSION_DURATION,
+                        default=options.get(
+                            CONF_EXCURSION_DURATION, DEFAULT_EXCURSION_DURATION
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_EXCURSION_DURATION),
+                    ),
+                    vol.Optional(
+                        CONF_STALE_AFTER,
+                        default=options.get(CONF_STALE_AFTER, 0),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_STALE_AFTER),
+                    ),
+                    vol.Optional(
+                        CONF_LOW_VOLTAGE,
+                        default=options.get(CONF_LOW_VOLTAGE, 0),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0, max=MAX_LOW_VOLTAGE),
+                    ),
+                    vol.Optional(
+                        CONF_CALLBACK_BUDGET,
+                        default=options.get(CONF_CALLBACK_BUDGET, 0),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_CALLBACK_BUDGET),
+                    ),
                 }
             ),
         )
@@ -12,15 +12,137 @@ NAME = "Bodega BLE Fridge"
 DEFAULT_SCAN_INTERVAL = 60  # seconds
 MAX_BACKOFF_INTERVAL = 600  # seconds
 
+# Circuit breaker
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive poll failures before opening
+BREAKER_OPEN_SECONDS = MAX_BACKOFF_INTERVAL
+
 # BLE timeouts
 DEFAULT_CONNECT_TIMEOUT = 10
 DEFAULT_COMMAND_TIMEOUT = 10
+MIN_CONNECT_TIMEOUT = 3
+MAX_CONNECT_TIMEOUT = 30
+MIN_COMMAND_TIMEOUT = 2
+MAX_COMMAND_TIMEOUT = 20
+
+# Self-tuning timeouts: p95 latency × margin, once enough samples exist that
+# the percentile is not simply the slowest sample
+LATENCY_WINDOW = 50  # samples per phase
+LATENCY_MIN_SAMPLES = 20
+TIMEOUT_PERCENTILE = 95
+TIMEOUT_MARGIN = 2.0
+# Upper bounds (seconds) of the latency histogram buckets; the last is open
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Latency phases; only connect, write and notify feed the derived timeouts
+PHASE_QUEUE_WAIT = "queue_wait"  # waiting for the device actor
+PHASE_LOOKUP = "lookup"  # choosing a BLEDevice and connection path
+PHASE_CONNECT = "connect"
+PHASE_SUBSCRIBE = "subscribe"  # start_notify
+PHASE_WRITE = "write"
+PHASE_NOTIFY = "notify"  # wait for the first valid frame
+PHASES = (
+    PHASE_QUEUE_WAIT,
+    PHASE_LOOKUP,
+    PHASE_CONNECT,
+    PHASE_SUBSCRIBE,
+    PHASE_WRITE,
+    PHASE_NOTIFY,
+)
+
+# Connection path (scanner) selection
+LINK_CONNECT_WINDOW = 20  # connect times kept per path
+LINK_RSSI_SMOOTHING = 0.3  # EMA weight of the newest advertisement RSSI
+LINK_FAILURE_PENALTY = 30.0  # dB subtracted for a path that always fails
+LINK_SLOW_CONNECT_PENALTY = 2.0  # dB subtracted per second of median connect
+
+# Options (0 = derive automatically from measured latency)
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+CONF_POLL_MODE = "poll_mode"
+CONF_CAPTURE_FILE = "capture_file"
+CONF_CALLBACK_BUDGET = "callback_budget"  # ms; 0 = callbacks are not timed
+CONF_IMPORT_STATISTICS = "import_statistics"
+CONF_ANALYTICS_WINDOW = "analytics_window"  # hours
+CONF_COMPRESSOR_POWER = "compressor_power"  # watts
+CONF_EXCURSION_MARGIN = "excursion_margin"  # degrees; 0 = off
+CONF_EXCURSION_DURATION = "excursion_duration"  # minutes
+CONF_STALE_AFTER = "stale_after"  # minutes; 0 = off
+CONF_LOW_VOLTAGE = "low_voltage"  # volts; 0 = off
+
+# Poll modes
+POLL_MODE_ACTIVE = "active"  # GATT query every scan interval
+POLL_MODE_PASSIVE = "passive"  # telemetry from advertisements, GATT for settings
+POLL_MODES = (POLL_MODE_ACTIVE, POLL_MODE_PASSIVE)
+
+# Passive mode: GATT poll once advertisements or settings get this old
+ADVERTISEMENT_STALE_SECONDS = 180
+PASSIVE_SETTINGS_INTERVAL = 1800
+
+# Offline command queue: commands for an unreachable fridge wait this long
+DEFAULT_QUEUE_TTL = 900  # seconds
+MAX_QUEUE_TTL = 86400
+QUEUE_FLUSH_INTERVAL = 30  # minimum seconds between flush attempts
+QUEUE_SAVE_DELAY = 1
+QUEUE_STORAGE_VERSION = 1
+
+# Device actor: an idle connection is kept this long for the next job
+SESSION_LINGER = 2.0  # seconds
+# Unload: time allowed to release a connection, and to stop the actor
+RELEASE_TIMEOUT = 2.0
+SHUTDOWN_TIMEOUT = 5.0
+
+# Raw frame capture: frames kept per device, and how long file writes batch
+CAPTURE_SIZE = 200
+CAPTURE_FLUSH_DELAY = 5  # seconds
+REPLAY_BATCH = 500  # records read per executor job
+
+# Telemetry history: one day of samples at most a minute apart
+HISTORY_SIZE = 1440
+HISTORY_MIN_INTERVAL = 60  # seconds
+
+# Long-term statistics: 5-minute periods, kept for a day, and how many
+# completed hours wait for the recorder before the oldest are dropped
+STATISTICS_SHORT_TERM = 300  # seconds
+STATISTICS_SHORT_TERM_KEEP = 288
+STATISTICS_PENDING_HOURS = 48
+
+# Compressor analytics: window of the duty cycle sensors, the power drawn
+# while running for the energy estimate, and the longest gap between samples
+# still counted as running or idle
+DEFAULT_ANALYTICS_WINDOW = 24  # hours
+MAX_ANALYTICS_WINDOW = 168
+DEFAULT_COMPRESSOR_POWER = 45  # watts
+MAX_COMPRESSOR_POWER = 500
+COMPRESSOR_MAX_GAP = 900  # seconds
+
+# Alerts: fired as bodega_ble_alert events when one becomes active or clears
+EVENT_ALERT = f"{DOMAIN}_alert"
+DEFAULT_EXCURSION_DURATION = 15  # minutes
+MAX_EXCURSION_MARGIN = 20  # degrees
+MAX_EXCURSION_DURATION = 240  # minutes
+MAX_STALE_AFTER = 1440  # minutes
+MAX_LOW_VOLTAGE = 30  # volts
+
+# WebSocket telemetry: slowest rate a subscriber may ask for, and the most
+# points or buckets a history request may return
+MAX_SUBSCRIPTION_INTERVAL = 3600  # seconds
+MAX_HISTORY_POINTS = HISTORY_SIZE
+
+# Callback monitor: slowest calls kept, stack frames kept per call, and how
+# often a callback that keeps running over budget is logged
+MAX_CALLBACK_BUDGET = 1000  # ms
+MONITOR_SLOW_CALLS = 10
+MONITOR_STACK_DEPTH = 8
+MONITOR_WARN_INTERVAL = 300  # seconds
 
 # Bodega BLE service and characteristics (UUIDs).
 SERVICE_UUID = "00001234-0000-1000-8000-00805f9b34fb"
 CHAR_WRITE_UUID = "00001235-0000-1000-8000-00805f9b34fb"
 CHAR_NOTIFY_UUID = "00001236-0000-1000-8000-00805f9b34fb"
 
+# Encoded command frames kept per device, keyed by raw settings state
+FRAME_CACHE_SIZE = 32
+
 # BLE command codes
 CMD_BIND = 0x00
 CMD_QUERY = 0x01
@@ -79,3 +201,14 @@ SERVICE_SET_POWER = "set_power"
 SERVICE_SET_LOCK = "set_lock"
 SERVICE_SET_RUN_MODE = "set_run_mode"
 SERVICE_SET_BATTERY_SAVER = "set_battery_saver"
+SERVICE_APPLY_SETTINGS = "apply_settings"
+SERVICE_SAVE_PROFILE = "save_profile"
+SERVICE_DELETE_PROFILE = "delete_profile"
+SERVICE_GET_STATE = "get_state"
+
+# Named settings profiles, shared by all fridges
+PROFILE_STORAGE_VERSION = 1
+
+# Fridges commanded at once by a multi-target service call
+DEFAULT_SERVICE_CONCURRENCY = 5
+MAX_SERVICE_CONCURRENCY = 20
@@ -8,14 +8,17 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import Counter
 from collections.abc import Callable
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from bleak import BleakClient, BleakError
+from bleak import BleakError
 from bleak.backends.device import BLEDevice
+from bleak.exc import BleakDeviceNotFoundError
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 from bleak_retry_connector import BleakError as BleakRetryError
-from bleak_retry_connector import establish_connection
 from homeassistant.components.bluetooth import (
     BluetoothCallbackMatcher,
     BluetoothChange,
@@ -23,32 +26,50 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_ble_device_from_address,
     async_register_callback,
+    async_scanner_devices_by_address,
 )
 from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.util import dt as dt_util
 
+from .actor import DeviceActor
+from .alerts import ALERT_STALE, AlertEngine, AlertRules, AlertTransition
+from .capture import FrameCapture, capture_path
+from .command_queue import CommandQueue
+from .compressor import CompressorAnalytics
 from .const import (
+    ADVERTISEMENT_STALE_SECONDS,
     BLE_STATUS_ADVERTISING,
     BLE_STATUS_CONNECTED,
     BLE_STATUS_DISCONNECTED,
-    CHAR_NOTIFY_UUID,
-    CHAR_WRITE_UUID,
     CMD_SET,
     CMD_SET_UNIT1_TARGET,
     CMD_SET_UNIT2_TARGET,
+    CONF_ANALYTICS_WINDOW,
+    CONF_CALLBACK_BUDGET,
+    CONF_CAPTURE_FILE,
+    CONF_COMMAND_TIMEOUT,
+    CONF_COMPRESSOR_POWER,
+    CONF_CONNECT_TIMEOUT,
+    CONF_IMPORT_STATISTICS,
+    CONF_POLL_MODE,
+    DEFAULT_ANALYTICS_WINDOW,
     DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_COMPRESSOR_POWER,
     DEFAULT_CONNECT_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    EVENT_ALERT,
     FRAME_BIND,
     FRAME_QUERY,
     KEY_BATTERY_SAVER,
     KEY_BLE_STATUS,
+    KEY_COMPRESSOR_STATUS,
     KEY_LEFT_CURRENT,
     KEY_LEFT_RET_DIFF,
     KEY_LEFT_TARGET,
@@ -70,16 +91,56 @@ from .const import (
     KEY_TEMP_MAX,
     KEY_TEMP_MIN,
     KEY_TEMP_UNIT,
-    MAX_BACKOFF_INTERVAL,
+    MAX_COMMAND_TIMEOUT,
+    MAX_CONNECT_TIMEOUT,
+    MIN_COMMAND_TIMEOUT,
+    MIN_CONNECT_TIMEOUT,
+    PASSIVE_SETTINGS_INTERVAL,
+    PHASE_CONNECT,
+    PHASE_LOOKUP,
+    PHASE_NOTIFY,
+    PHASE_QUEUE_WAIT,
+    PHASE_SUBSCRIBE,
+    PHASE_WRITE,
+    POLL_MODE_ACTIVE,
+    POLL_MODE_PASSIVE,
+    QUEUE_FLUSH_INTERVAL,
+    RELEASE_TIMEOUT,
+    SHUTDOWN_TIMEOUT,
 )
-from .exceptions import BodegaBleMissingDataError
-from .parser import parse_notify_payload
+from .exceptions import (
+    BodegaBleInvalidFrameError,
+    BodegaBleInvalidSettingsError,
+    BodegaBleMissingDataError,
+    BodegaBleShutdownError,
+)
+from .history import TelemetryHistory
+from .latency import LatencyTracker
+from .link import LinkQualityTracker
+from .long_term import StatisticsAggregator, async_import_statistics
+from .loop_monitor import (
+    CALLBACK_ADVERTISEMENT,
+    CALLBACK_NORMALIZE,
+    CALLBACK_NOTIFY,
+    CALLBACK_STATE_WRITE,
+    CALLBACK_UPDATE,
+    CallbackMonitor,
+)
+from .parser import decode_frame, parse_advertisement, parse_notify_payload
+from .protocol import ProtocolContext
+from .retry import ErrorClass, RetryPolicy, classify_error
+from .settings import SETTINGS_FIELDS, validate_settings
 
 if TYPE_CHECKING:
     from . import BodegaBleConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+# Failures that mean the fridge is out of reach rather than misbehaving.
+_UNREACHABLE_ERRORS = frozenset(
+    {ErrorClass.DEVICE_ABSENT, ErrorClass.SLOT_EXHAUSTION, ErrorClass.TIMEOUT}
+)
+
 
 class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator for Bodega BLE device data."""
@@ -101,12 +162,61 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=scan_interval),
         )
         self.address = entry.data["address"]
-        self._connect_lock = asyncio.Lock()
+        self._entry_id = entry.entry_id
+        self._actor = DeviceActor(
+            hass,
+            f"{DOMAIN} actor {self.address}",
+            self._async_connect_session,
+            self._async_release_session,
+        )
         self._cancel_bluetooth_callback: Callable[[], None] | None = None
         self._ble_device: BLEDevice | None = ble_device
         self._last_seen: dt_util.dt.datetime | None = None
         self._base_interval = timedelta(seconds=scan_interval)
-        self._backoff_step = 0
+        self._retry = RetryPolicy(min_delay=scan_interval)
+        self._protocol = ProtocolContext()
+        self._links = LinkQualityTracker()
+        self._connect_source: str | None = None
+        self._poll_mode: str = entry.options.get(CONF_POLL_MODE, POLL_MODE_ACTIVE)
+        self._last_gatt_poll: float | None = None
+        self._last_advertised_telemetry: float | None = None
+        self._queue = CommandQueue(hass, entry.entry_id)
+        self._capture = FrameCapture(
+            hass,
+            self.address,
+            capture_path(hass, self.address)
+            if entry.options.get(CONF_CAPTURE_FILE)
+            else None,
+        )
+        budget_ms = entry.options.get(CONF_CALLBACK_BUDGET, 0)
+        self._monitor = CallbackMonitor(budget_ms / 1000 if budget_ms else None)
+        self._history = TelemetryHistory()
+        self._statistics = (
+            StatisticsAggregator(self.address, entry.title)
+            if entry.options.get(CONF_IMPORT_STATISTICS)
+            else None
+        )
+        self._compressor = CompressorAnalytics(
+            entry.options.get(CONF_ANALYTICS_WINDOW, DEFAULT_ANALYTICS_WINDOW) * 3600,
+            entry.options.get(CONF_COMPRESSOR_POWER, DEFAULT_COMPRESSOR_POWER),
+        )
+        self._alerts = AlertEngine(AlertRules.from_entry(entry))
+        self._alert_listeners: list[CALLBACK_TYPE] = []
+        self._unsub_stale_check: CALLBACK_TYPE | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+        self._last_flush_attempt: float | None = None
+        self._latency: dict[str, LatencyTracker] = {
+            PHASE_QUEUE_WAIT: self._actor.wait_latency,
+            PHASE_LOOKUP: LatencyTracker(),
+            PHASE_CONNECT: LatencyTracker(),
+            PHASE_SUBSCRIBE: LatencyTracker(),
+            PHASE_WRITE: LatencyTracker(),
+            PHASE_NOTIFY: LatencyTracker(),
+        }
+        # Session outcomes: "success" or the ErrorClass of the failure.
+        self._outcomes: Counter[str] = Counter()
+        self._connect_timeout_override: int = entry.options.get(CONF_CONNECT_TIMEOUT, 0)
+        self._command_timeout_override: int = entry.options.get(CONF_COMMAND_TIMEOUT, 0)
 
     def async_start(self) -> Callable[[], None]:
         """Start listening for Bluetooth advertisements."""
@@ -118,15 +228,22 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             service_info: BluetoothServiceInfoBleak,
             change: BluetoothChange,
         ) -> None:
-            if change == BluetoothChange.ADVERTISEMENT:
+            if change != BluetoothChange.ADVERTISEMENT:
+                return
+            with self._monitor.measure(CALLBACK_ADVERTISEMENT):
                 self._ble_device = service_info.device
                 self._last_seen = dt_util.utcnow()
-                self.async_set_updated_data(
-                    {
-                        **(self.data or {}),
-                        KEY_BLE_STATUS: BLE_STATUS_ADVERTISING,
-                    }
-                )
+                self._links.record_advertisement(service_info.source, service_info.rssi)
+                telemetry = self._async_decode_advertisement(service_info)
+                data = {
+                    **(self.data or {}),
+                    **telemetry,
+                    KEY_BLE_STATUS: BLE_STATUS_ADVERTISING,
+                }
+                if telemetry:
+                    self._async_record_telemetry(data)
+                self.async_set_updated_data(data)
+                self._async_maybe_flush_queue()
                 _LOGGER.debug(
                     "BLE advertisement received for %s (%s)",
                     service_info.name,
@@ -143,105 +260,539 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         return self._cancel_bluetooth_callback
 
     def async_stop(self) -> None:
-        """Stop listening for Bluetooth advertisements."""
+        """Stop listening for Bluetooth advertisements and release the device."""
         if self._cancel_bluetooth_callback:
             self._cancel_bluetooth_callback()
             self._cancel_bluetooth_callback = None
+        if self._unsub_stale_check:
+            self._unsub_stale_check()
+            self._unsub_stale_check = None
+        self._actor.async_stop()
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and release the fridge within a bounded time.
+
+        In-flight connects and notify waits are cancelled instead of being
+        left to run into their timeouts.
+        """
+        await super().async_shutdown()
+        self.async_stop()
+        await self._actor.async_wait_stopped(SHUTDOWN_TIMEOUT)
+        await self._capture.async_stop()
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._statistics is not None:
+            self._statistics.close()
+            async_import_statistics(self.hass, self._statistics)
+
+    @property
+    def history(self) -> TelemetryHistory:
+        """Return the fridge's recent telemetry history."""
+        return self._history
+
+    @property
+    def alerts(self) -> AlertEngine:
+        """Return the fridge's alert state."""
+        return self._alerts
+
+    @callback
+    def async_add_alert_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back when an alert becomes active or clears."""
+        self._alert_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._alert_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_alert_transitions(self, transitions: list[AlertTransition]) -> None:
+        """Fire an event per alert that changed, then update alert listeners."""
+        if not transitions:
+            return
+        for transition in transitions:
+            _LOGGER.debug(
+                "Alert %s %s for %s",
+                transition.alert,
+                "raised" if transition.active else "cleared",
+                self.address,
+            )
+            self.hass.bus.async_fire(
+                EVENT_ALERT,
+                {
+                    "entry_id": self._entry_id,
+                    "address": self.address,
+                    "alert": transition.alert,
+                    "active": transition.active,
+                    "value": transition.value,
+                },
+            )
+        for update_callback in list(self._alert_listeners):
+            update_callback()
+
+    @callback
+    def _async_schedule_stale_check(self) -> None:
+        """Check for stale telemetry once the rule's time has passed."""
+        last_update = self._alerts.last_update
+        if self._unsub_stale_check or last_update is None:
+            return
+        self._unsub_stale_check = async_call_later(
+            self.hass,
+            max(0.0, last_update + self._alerts.rules.stale_after - time.time()),
+            self._async_check_stale,
+        )
+
+    @callback
+    def _async_check_stale(self, now: datetime) -> None:
+        self._unsub_stale_check = None
+        self._async_alert_transitions(self._alerts.check_stale(now.timestamp()))
+        if not self._alerts.is_active(ALERT_STALE):
+            # Telemetry arrived since the check was scheduled.
+            self._async_schedule_stale_check()
+
+    @property
+    def compressor(self) -> CompressorAnalytics:
+        """Return the fridge's compressor runtime analytics."""
+        return self._compressor
+
+    @callback
+    def _async_record_telemetry(
+        self, data: dict[str, Any], timestamp: float | None = None
+    ) -> None:
+        """Fold newly received telemetry into history and analytics.
+
+        Called once per GATT read, telemetry advertisement or applied frame,
+        before the data is published, so that re-published data such as a
+        BLE status change never counts a reading twice. A timestamp marks a
+        reading taken earlier, such as a replayed frame; it is filed at that
+        time and does not drive the alerts, which describe the fridge now.
+        """
+        now = time.time() if timestamp is None else timestamp
+        self._history.record(now, data)
+        self._compressor.add(now, data.get(KEY_COMPRESSOR_STATUS))
+        if timestamp is None:
+            self._async_alert_transitions(self._alerts.evaluate(now, data))
+            if self._alerts.rules.stale_after:
+                self._async_schedule_stale_check()
+        if self._statistics is not None:
+            self._statistics.add(now, data)
+            if self._statistics.has_pending:
+                async_import_statistics(self.hass, self._statistics)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners.
+
+        When callbacks are monitored, each entity's state write is timed.
+        """
+        if not self._monitor.enabled:
+            super().async_update_listeners()
+            return
+        with self._monitor.measure(CALLBACK_UPDATE):
+            for update_callback, _ in list(self._listeners.values()):
+                entity = getattr(update_callback, "__self__", None)
+                with self._monitor.measure(
+                    CALLBACK_STATE_WRITE, getattr(entity, "entity_id", None)
+                ):
+                    update_callback()
+
+    async def async_load_command_queue(self) -> None:
+        """Restore commands queued before a restart."""
+        await self._queue.async_load()
 
     async def async_send_bind(self) -> None:
         """Send bind command to the fridge."""
         await self._async_send_command(FRAME_BIND)
 
+    @callback
+    def _async_decode_advertisement(
+        self, service_info: BluetoothServiceInfoBleak
+    ) -> dict[str, Any]:
+        """Return normalized telemetry from an advertisement in passive mode."""
+        if self._poll_mode != POLL_MODE_PASSIVE:
+            return {}
+        raw = parse_advertisement(
+            service_info.manufacturer_data, service_info.service_data
+        )
+        if not raw:
+            return {}
+        self._last_advertised_telemetry = time.monotonic()
+        if self._settings_stale() and self._retry.attempt_due:
+            # Adverts keep rescheduling the poll, so ask for settings directly,
+            # but no sooner than the backoff after a failed poll allows.
+            self.hass.async_create_task(self.async_request_refresh())
+        return self._normalize_data(raw)
+
+    @callback
+    def async_apply_frame(self, frame: bytes, timestamp: float | None = None) -> bool:
+        """Apply a status frame received outside a session, such as a replayed one.
+
+        A replayed frame passes its capture timestamp, so its reading lands in
+        history and statistics at the time it was recorded. Returns False if
+        the frame does not parse.
+        """
+        raw = parse_notify_payload(frame)
+        if not raw:
+            return False
+        data = {**(self.data or {}), **self._normalize_data(raw)}
+        self._async_record_telemetry(data, timestamp)
+        self.async_set_updated_data(data)
+        return True
+
+    def _settings_stale(self) -> bool:
+        """Return True if the last GATT poll is too old for passive mode."""
+        return (
+            self._last_gatt_poll is None
+            or time.monotonic() - self._last_gatt_poll > PASSIVE_SETTINGS_INTERVAL
+        )
+
+    def _advertisements_fresh(self) -> bool:
+        """Return True if an advertisement recently carried telemetry."""
+        return (
+            self._last_advertised_telemetry is not None
+            and time.monotonic() - self._last_advertised_telemetry
+            <= ADVERTISEMENT_STALE_SECONDS
+        )
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the Bluetooth device."""
+        if (
+            self._poll_mode == POLL_MODE_PASSIVE
+            and self.data
+            and self._advertisements_fresh()
+            and not self._settings_stale()
+        ):
+            return self.data
+        if not self._retry.allow_request():
+            raise UpdateFailed("Circuit breaker open; skipping BLE poll")
         try:
-            async with self._connect_lock:
-                data = await self._async_query_state()
-                self._reset_backoff()
-                return data
+            data = await self._actor.async_run(self._async_read_state)
+        except BodegaBleShutdownError:
+            # Unloading; keep the last data rather than report a failure.
+            return self.data or {}
         except EOFError as err:
             _LOGGER.debug("BLE disconnect glitch while updating data: %s", err)
-            self._set_ble_status(BLE_STATUS_DISCONNECTED)
-            self._increase_backoff()
+            self._record_poll_failure(err)
             return self.data or {}
-        except (BleakError, BleakRetryError) as err:
-            self._set_ble_status(BLE_STATUS_DISCONNECTED)
-            self._increase_backoff()
+        except (BleakError, BleakRetryError, BodegaBleInvalidFrameError) as err:
+            self._record_poll_failure(err)
             raise UpdateFailed(f"BLE error: {err}") from err
         except TimeoutError as err:
-            self._set_ble_status(BLE_STATUS_DISCONNECTED)
-            self._increase_backoff()
+            self._record_poll_failure(err)
             raise UpdateFailed("Timeout waiting for BLE response") from err
+        self._last_gatt_poll = time.monotonic()
+        self._record_success()
+        self._async_record_telemetry(data)
+        return data
 
-    async def _async_send_command(self, payload: bytes) -> None:
-        """Connect and send a write-only command."""
-        async with self._connect_lock:
-            ble_device = self._async_get_ble_device()
-            if not ble_device:
-                self._set_ble_status(BLE_STATUS_DISCONNECTED)
-                raise UpdateFailed("Device not found")
-
-            self._set_ble_status(BLE_STATUS_CONNECTED)
-            try:
-                async with asyncio.timeout(DEFAULT_CONNECT_TIMEOUT):
-                    async with await establish_connection(
-                        BleakClient, ble_device, self.address
-                    ) as client:
-                        async with asyncio.timeout(DEFAULT_COMMAND_TIMEOUT):
-                            await client.write_gatt_char(
-                                _format_uuid(CHAR_WRITE_UUID),
-                                payload,
-                                response=True,
-                            )
-            except (BleakError, BleakRetryError) as err:
-                self._set_ble_status(BLE_STATUS_DISCONNECTED)
-                self._increase_backoff()
-                raise UpdateFailed(f"BLE error: {err}") from err
-            except TimeoutError as err:
-                self._set_ble_status(BLE_STATUS_DISCONNECTED)
-                self._increase_backoff()
-                raise UpdateFailed("Timeout waiting for BLE response") from err
-
-    async def _async_query_state(self) -> dict[str, Any]:
-        """Send a query and parse the notify response."""
-        ble_device = self._async_get_ble_device()
-        if not ble_device:
-            self._set_ble_status(BLE_STATUS_DISCONNECTED)
-            raise UpdateFailed("Device not found")
+    async def async_read_state(self) -> dict[str, Any]:
+        """Read the device state now, outside the poll schedule."""
+        return await self._async_send_command()
 
-        notify_future: asyncio.Future[bytes] = self.hass.loop.create_future()
+    async def _async_send_command(self, *payloads: bytes) -> dict[str, Any]:
+        """Send commands in one session and return the state read back."""
+        self._set_ble_status(BLE_STATUS_CONNECTED)
+        try:
+            data = await self._actor.async_run(
+                lambda client: self._async_read_state(client, *payloads)
+            )
+        except (BleakError, BleakRetryError, BodegaBleInvalidFrameError) as err:
+            self._record_command_failure(err)
+            raise UpdateFailed(f"BLE error: {err}") from err
+        except TimeoutError as err:
+            self._record_command_failure(err)
+            raise UpdateFailed("Timeout waiting for BLE response") from err
+        self._last_gatt_poll = time.monotonic()
+        self._record_success()
+        self._async_record_telemetry(data)
+        self.async_set_updated_data(data)
+        return data
+
+    async def _async_apply(
+        self, updates: dict[str, Any], queue_ttl: float
+    ) -> dict[str, Any] | None:
+        """Send field updates, queueing them if the fridge is out of reach.
+
+        A queue_ttl of 0, the default of the public setters used by entities,
+        fails fast instead; services pass the TTL the caller asked for. Return
+        the state read back after the updates, or None if they were queued.
+        """
+        try:
+            return await self._async_send_command(*self._encode_updates(updates))
+        except BodegaBleMissingDataError:
+            # Nothing to build the frame from yet; the flush reads state first.
+            if not queue_ttl:
+                raise
+        except UpdateFailed as err:
+            cause = err.__cause__
+            if (
+                not queue_ttl
+                or cause is None
+                or classify_error(cause) not in _UNREACHABLE_ERRORS
+            ):
+                raise
+        self._queue.put(updates, queue_ttl)
+        _LOGGER.info(
+            "Fridge %s is unreachable; queued %s for up to %d seconds",
+            self.address,
+            ", ".join(updates),
+            queue_ttl,
+        )
+        return None
+
+    @callback
+    def _async_maybe_flush_queue(self) -> None:
+        """Start flushing queued commands now that the fridge advertises."""
+        if self._flush_task and not self._flush_task.done():
+            return
+        now = time.monotonic()
+        if (
+            self._last_flush_attempt is not None
+            and now - self._last_flush_attempt < QUEUE_FLUSH_INTERVAL
+        ):
+            return
+        if not self._queue:
+            return
+        self._last_flush_attempt = now
+        self._flush_task = self.hass.async_create_background_task(
+            self._async_flush_queue(), f"{DOMAIN} command queue {self.address}"
+        )
+
+    async def _async_flush_queue(self) -> None:
+        """Send every queued command in a single session.
+
+        The state is read first in the same session so the Set frame is built
+        from current settings even when the queue was restored after a restart;
+        listeners are only notified of the state read back afterwards.
+        """
+        pending = self._queue.pending()
+        if not pending:
+            return
+        updates = {field: command.value for field, command in pending.items()}
+
+        async def _flush(client: BleakClientWithServiceCache) -> dict[str, Any]:
+            self.data = await self._async_read_state(client)
+            validate_settings(updates, self.data)
+            return await self._async_read_state(client, *self._encode_updates(updates))
+
+        try:
+            data = await self._actor.async_run(_flush)
+        except BodegaBleShutdownError:
+            return
+        except BodegaBleInvalidSettingsError as err:
+            # Retrying cannot fix these; drop them instead of looping.
+            _LOGGER.warning("Dropping queued commands for %s: %s", self.address, err)
+            self._queue.discard(pending)
+            return
+        except (
+            BleakError,
+            BleakRetryError,
+            TimeoutError,
+            BodegaBleInvalidFrameError,
+            BodegaBleMissingDataError,
+        ) as err:
+            self._record_command_failure(err)
+            _LOGGER.debug(
+                "Flushing queued commands for %s failed: %s", self.address, err
+            )
+            return
+        self._queue.discard(pending)
+        self._record_success()
+        self._async_record_telemetry(data)
+        self.async_set_updated_data(data)
+        _LOGGER.info("Sent queued %s to fridge %s", ", ".join(updates), self.address)
+
+    async def _async_read_state(
+        self, client: BleakClientWithServiceCache, *payloads: bytes
+    ) -> dict[str, Any]:
+        """Write frames over an open session and return the state reported back.
+
+        The fridge answers a Set frame with its full state; if nothing valid
+        has arrived once the frames are written, a query is sent as well.
+        """
+        notify_future: asyncio.Future[dict[str, Any]] = self.hass.loop.create_future()
+        rejected = 0
 
         def _handle_notify(_: int, payload: bytearray) -> None:
+            nonlocal rejected
+            with self._monitor.measure(CALLBACK_NOTIFY):
+                frame = bytes(payload)
+                outcome, raw = decode_frame(frame)
+                self._capture.record_rx(frame, outcome)
+                if notify_future.done():
+                    return
+                if raw:
+                    notify_future.set_result(raw)
+                else:
+                    rejected += 1
+
+        notify_char = self._protocol.notify_char
+        with self._latency[PHASE_SUBSCRIBE].measure():
+            await client.start_notify(notify_char, _handle_notify)
+        cancelled = False
+        try:
+            for payload in payloads:
+                await self._async_write(client, payload)
             if not notify_future.done():
-                notify_future.set_result(bytes(payload))
-
-        async with asyncio.timeout(DEFAULT_CONNECT_TIMEOUT):
-            async with await establish_connection(
-                BleakClient, ble_device, self.address
-            ) as client:
-                await client.start_notify(
-                    _format_uuid(CHAR_NOTIFY_UUID), _handle_notify
+                await self._async_write(client, FRAME_QUERY)
+            with self._latency[PHASE_NOTIFY].measure():
+                raw_data = await asyncio.wait_for(
+                    notify_future, timeout=self.command_timeout
                 )
-                async with asyncio.timeout(DEFAULT_COMMAND_TIMEOUT):
-                    await client.write_gatt_char(
-                        _format_uuid(CHAR_WRITE_UUID), FRAME_QUERY, response=True
-                    )
-                try:
-                    payload = await asyncio.wait_for(
-                        notify_future, timeout=DEFAULT_COMMAND_TIMEOUT
-                    )
-                finally:
-                    await client.stop_notify(_format_uuid(CHAR_NOTIFY_UUID))
-
-        raw_data = parse_notify_payload(payload)
-        if not raw_data:
-            raise UpdateFailed("No valid payload received")
+        except TimeoutError:
+            if rejected:
+                raise BodegaBleInvalidFrameError from None
+            raise
+        except asyncio.CancelledError:
+            # The session is being torn down and disconnecting drops the
+            # subscription; a hung device would not answer stop_notify.
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                await client.stop_notify(notify_char)
 
         data = self._normalize_data(raw_data)
         data[KEY_BLE_STATUS] = BLE_STATUS_CONNECTED
         return data
 
+    async def _async_connect_session(self) -> BleakClientWithServiceCache:
+        """Connect to the fridge for a new actor session."""
+        with self._latency[PHASE_LOOKUP].measure():
+            ble_device = self._async_require_ble_device()
+        return await self._async_connect(ble_device)
+
+    async def _async_release_session(
+        self, client: BleakClientWithServiceCache, error: BaseException | None
+    ) -> None:
+        """Disconnect after a session, dropping cached GATT data on GATT errors."""
+        if (
+            isinstance(error, BleakError)
+            and classify_error(error) is ErrorClass.GATT_ERROR
+        ):
+            await self._async_invalidate_services(client)
+        try:
+            async with asyncio.timeout(RELEASE_TIMEOUT):
+                await client.disconnect()
+        except (BleakError, TimeoutError) as err:
+            _LOGGER.debug("Failed to disconnect from %s: %s", self.address, err)
+
+    async def _async_connect(
+        self, ble_device: BLEDevice
+    ) -> BleakClientWithServiceCache:
+        """Establish a connection within the current connect timeout.
+
+        BleakClientWithServiceCache reuses bleak's own service cache, so the
+        Bodega characteristics are looked up in client.services for every new
+        client. The outcome is credited to the connection path that was chosen.
+        """
+        source = self._connect_source
+        start = time.monotonic()
+        try:
+            with self._latency[PHASE_CONNECT].measure():
+                async with asyncio.timeout(self.connect_timeout):
+                    client = await establish_connection(
+                        BleakClientWithServiceCache,
+                        ble_device,
+                        self.address,
+                        ble_device_callback=lambda: (
+                            self._async_get_ble_device() or ble_device
+                        ),
+                    )
+        except (BleakError, TimeoutError):
+            if source:
+                self._links.record_connect(source, False, time.monotonic() - start)
+            raise
+        elapsed = time.monotonic() - start
+        if source:
+            self._links.record_connect(source, True, elapsed)
+        try:
+            self._protocol.resolve(client.services)
+        except BleakError:
+            await self._async_invalidate_services(client)
+            await client.disconnect()
+            raise
+        return client
+
+    async def _async_invalidate_services(
+        self, client: BleakClientWithServiceCache
+    ) -> None:
+        """Clear bleak's service cache so the next session rediscovers it."""
+        _LOGGER.debug("Clearing cached GATT services for %s", self.address)
+        self._protocol.invalidate()
+        try:
+            await client.clear_cache()
+        except BleakError as err:
+            _LOGGER.debug("Failed to clear GATT cache for %s: %s", self.address, err)
+
+    async def _async_write(
+        self, client: BleakClientWithServiceCache, payload: bytes
+    ) -> None:
+        """Write a frame within the current command timeout."""
+        self._capture.record_tx(payload)
+        with self._latency[PHASE_WRITE].measure():
+            async with asyncio.timeout(self.command_timeout):
+                await client.write_gatt_char(
+                    self._protocol.write_char,
+                    payload,
+                    response=True,
+                )
+
+    @property
+    def connect_timeout(self) -> float:
+        """Return the connect timeout, from options or measured latency."""
+        if self._connect_timeout_override:
+            return float(self._connect_timeout_override)
+        return self._latency[PHASE_CONNECT].derive_timeout(
+            DEFAULT_CONNECT_TIMEOUT, MIN_CONNECT_TIMEOUT, MAX_CONNECT_TIMEOUT
+        )
+
+    @property
+    def command_timeout(self) -> float:
+        """Return the write/notify timeout, from options or measured latency."""
+        if self._command_timeout_override:
+            return float(self._command_timeout_override)
+        return max(
+            self._latency[phase].derive_timeout(
+                DEFAULT_COMMAND_TIMEOUT, MIN_COMMAND_TIMEOUT, MAX_COMMAND_TIMEOUT
+            )
+            for phase in (PHASE_WRITE, PHASE_NOTIFY)
+        )
+
+    def latency_summary(self) -> dict[str, Any]:
+        """Return per-phase latency percentiles and the derived timeouts."""
+        return {
+            "phases": {
+                phase: tracker.as_dict() for phase, tracker in self._latency.items()
+            },
+            "connect_timeout": self.connect_timeout,
+            "command_timeout": self.command_timeout,
+            "outcomes": dict(self._outcomes),
+        }
+
+    def phase_latency(self, phase: str) -> LatencyTracker:
+        """Return the latency tracker of one BLE phase."""
+        return self._latency[phase]
+
+    def outcome_counts(self) -> dict[str, int]:
+        """Return session outcome counts by "success" or error class."""
+        return dict(self._outcomes)
+
+    def statistics_summary(self) -> dict[str, Any] | None:
+        """Return the long-term statistics state, if importing is enabled."""
+        return self._statistics.as_dict() if self._statistics else None
+
+    def callback_summary(self) -> dict[str, Any]:
+        """Return event loop time per callback and the slowest calls."""
+        return self._monitor.as_dict()
+
     def _normalize_data(self, raw: dict[str, Any]) -> dict[str, Any]:
+        with self._monitor.measure(CALLBACK_NORMALIZE):
+            return self._normalize_raw(raw)
+
+    def _normalize_raw(self, raw: dict[str, Any]) -> dict[str, Any]:
         unit = raw.get(KEY_TEMP_UNIT, "C")
         parsed = dict(raw)
         temp_keys = (
@@ -273,6 +824,16 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         return parsed
 
     def _async_get_ble_device(self) -> BLEDevice | None:
+        """Return the device via the best-scoring connection path."""
+        best = self._links.choose(
+            async_scanner_devices_by_address(self.hass, self.address, connectable=True)
+        )
+        if best:
+            self._connect_source = best.scanner.source
+            self._ble_device = best.ble_device
+            return best.ble_device
+
+        self._connect_source = None
         ble_device = async_ble_device_from_address(
             self.hass, self.address, connectable=True
         ) or async_ble_device_from_address(self.hass, self.address)
@@ -286,21 +847,44 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             )
         return ble_device or self._ble_device
 
+    def _async_require_ble_device(self) -> BLEDevice:
+        """Return the BLE device or raise if it has never been seen."""
+        ble_device = self._async_get_ble_device()
+        if not ble_device:
+            self._set_ble_status(BLE_STATUS_DISCONNECTED)
+            raise BleakDeviceNotFoundError(self.address, "Device not found")
+        return ble_device
+
     def _set_ble_status(self, status: str) -> None:
         self.async_set_updated_data({**(self.data or {}), KEY_BLE_STATUS: status})
 
-    def _increase_backoff(self) -> None:
-        self._backoff_step = min(self._backoff_step + 1, 5)
-        next_seconds = min(
-            DEFAULT_SCAN_INTERVAL * (2**self._backoff_step), MAX_BACKOFF_INTERVAL
+    def _record_poll_failure(self, err: BaseException) -> None:
+        """Classify a poll failure and schedule the next poll with jitter."""
+        self._set_ble_status(BLE_STATUS_DISCONNECTED)
+        error_class = classify_error(err)
+        self._outcomes[error_class.value] += 1
+        delay = self._retry.record_failure(error_class)
+        self.update_interval = timedelta(seconds=delay)
+        _LOGGER.debug(
+            "BLE poll failed (%s); next poll in %.0f seconds, breaker %s",
+            error_class,
+            delay,
+            self._retry.state,
         )
-        self.update_interval = timedelta(seconds=next_seconds)
-        _LOGGER.debug("BLE backoff set to %s seconds", next_seconds)
 
-    def _reset_backoff(self) -> None:
-        if self._backoff_step:
-            self._backoff_step = 0
+    def _record_command_failure(self, err: BaseException) -> None:
+        """Classify a command failure; the poll schedule is left alone."""
+        self._set_ble_status(BLE_STATUS_DISCONNECTED)
+        error_class = classify_error(err)
+        self._outcomes[error_class.value] += 1
+        self._retry.record_command_failure(error_class)
+
+    def _record_success(self) -> None:
+        """Close the breaker and restore the normal poll interval."""
+        self._outcomes["success"] += 1
+        if self._retry.backing_off:
             self.update_interval = self._base_interval
+        self._retry.record_success()
 
     def _normalize_temp(self, raw: int, unit: str) -> float:
         """Normalize a temperature reading to HA's unit system."""
@@ -315,56 +899,131 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return value_c * 9.0 / 5.0
         return value_c
 
-    async def async_set_left_target(self, temperature: float) -> None:
+    async def async_set_left_target(
+        self, temperature: float, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set the left (fridge) target temperature."""
-        payload = self._encode_target_command(CMD_SET_UNIT1_TARGET, temperature)
-        await self._async_send_command(payload)
+        return await self._async_apply({KEY_LEFT_TARGET: temperature}, queue_ttl)
 
-    async def async_set_right_target(self, temperature: float) -> None:
+    async def async_set_right_target(
+        self, temperature: float, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set the right (freezer) target temperature."""
-        payload = self._encode_target_command(CMD_SET_UNIT2_TARGET, temperature)
-        await self._async_send_command(payload)
+        return await self._async_apply({KEY_RIGHT_TARGET: temperature}, queue_ttl)
 
-    async def async_set_power(self, powered: bool) -> None:
+    async def async_set_power(
+        self, powered: bool, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set fridge power state."""
-        await self._async_send_command(self._encode_set_other({"powered": powered}))
+        return await self._async_apply({KEY_POWERED: powered}, queue_ttl)
 
-    async def async_set_lock(self, locked: bool) -> None:
+    async def async_set_lock(
+        self, locked: bool, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set fridge lock state."""
-        await self._async_send_command(self._encode_set_other({"locked": locked}))
+        return await self._async_apply({KEY_LOCKED: locked}, queue_ttl)
 
-    async def async_set_run_mode(self, mode: str) -> None:
+    async def async_set_run_mode(
+        self, mode: str, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set fridge run mode (Max/Eco)."""
-        await self._async_send_command(
-            self._encode_set_other({"run_mode": _parse_run_mode(mode)})
-        )
+        return await self._async_apply({KEY_RUN_MODE: _parse_run_mode(mode)}, queue_ttl)
 
-    async def async_set_battery_saver(self, level: str) -> None:
+    async def async_set_battery_saver(
+        self, level: str, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set battery saver level (Low/Mid/High)."""
-        await self._async_send_command(
-            self._encode_set_other({"battery_saver": _parse_battery_saver(level)})
+        return await self._async_apply(
+            {KEY_BATTERY_SAVER: _parse_battery_saver(level)}, queue_ttl
         )
 
-    async def async_set_temp_unit(self, fahrenheit: bool) -> None:
+    async def async_set_temp_unit(
+        self, fahrenheit: bool, queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
         """Set device temperature display unit (Celsius/Fahrenheit)."""
-        await self._async_send_command(
-            self._encode_set_other({KEY_TEMP_UNIT: "F" if fahrenheit else "C"})
+        return await self._async_apply(
+            {KEY_TEMP_UNIT: "F" if fahrenheit else "C"}, queue_ttl
         )
 
+    async def async_apply_settings(
+        self, settings: dict[str, Any], queue_ttl: float = 0
+    ) -> dict[str, Any] | None:
+        """Write any subset of settings atomically in one Set frame.
+
+        Settings are checked against the last known device state first; when
+        the fridge has not been read yet they are queued and checked against
+        the state read at flush time.
+        """
+        updates = dict(settings)
+        if KEY_RUN_MODE in updates:
+            updates[KEY_RUN_MODE] = _parse_run_mode(updates[KEY_RUN_MODE])
+        if KEY_BATTERY_SAVER in updates:
+            updates[KEY_BATTERY_SAVER] = _parse_battery_saver(
+                updates[KEY_BATTERY_SAVER]
+            )
+        if self.data:
+            validate_settings(updates, self.data)
+        return await self._async_apply(updates, queue_ttl)
+
+    def current_settings(self) -> dict[str, Any]:
+        """Return the settings fields of the last query."""
+        data = self.data or {}
+        return {key: data[key] for key in SETTINGS_FIELDS if key in data}
+
+    def _encode_updates(self, updates: dict[str, Any]) -> list[bytes]:
+        """Encode field updates as the fewest frames that apply them all.
+
+        A Set frame carries both targets, so target changes ride along with
+        any other setting; on their own they use the short target commands.
+        """
+        if updates.keys() - {KEY_LEFT_TARGET, KEY_RIGHT_TARGET}:
+            return [self._encode_set(updates)]
+        payloads = []
+        if KEY_LEFT_TARGET in updates:
+            payloads.append(
+                self._encode_target_command(
+                    CMD_SET_UNIT1_TARGET, updates[KEY_LEFT_TARGET]
+                )
+            )
+        if KEY_RIGHT_TARGET in updates:
+            payloads.append(
+                self._encode_target_command(
+                    CMD_SET_UNIT2_TARGET, updates[KEY_RIGHT_TARGET]
+                )
+            )
+        return payloads
+
     def _encode_target_command(self, command: int, temperature: float) -> bytes:
         """Encode a target temperature command."""
         data = self._require_last_data()
         unit = _unit_from_data(data)
+        key = (command, self.hass.config.units.temperature_unit, unit, temperature)
+        if (frame := self._protocol.cached_frame(key)) is not None:
+            return frame
         temp = _to_device_temp(temperature, unit, self.hass)
-        return _create_packet(bytes([command, _int8_from_float(temp)]))
+        return self._protocol.add_frame(key, bytes([command, _int8_from_float(temp)]))
 
-    def _encode_set_other(self, updates: dict[str, Any]) -> bytes:
-        """Encode a Set command using the last query data plus updates."""
+    def _encode_set(self, updates: dict[str, Any]) -> bytes:
+        """Encode a Set frame from the last query data with fields overridden.
+
+        The frame is looked up by the settings values before any of it is
+        built; only a new settings state is converted and encoded.
+        """
         data = self._require_last_data()
-        # Allow temp_unit override from updates
-        unit = updates.get(KEY_TEMP_UNIT, _unit_from_data(data))
-        if unit not in ("C", "F"):
-            unit = "C"
+        key = (
+            CMD_SET,
+            self.hass.config.units.temperature_unit,
+            KEY_RIGHT_TARGET in data,
+            *[updates.get(field, data.get(field, _MISSING)) for field in _SET_FIELDS],
+        )
+        if (frame := self._protocol.cached_frame(key)) is not None:
+            return frame
+        return self._protocol.add_frame(key, self._set_body(data, updates))
+
+    def _set_body(self, data: dict[str, Any], updates: dict[str, Any]) -> bytes:
+        """Build the body of a Set frame."""
+        settings = {**data, **updates}
+        unit = _unit_from_data(settings)
         required_keys = (
             KEY_LEFT_TARGET,
             KEY_TEMP_MAX,
@@ -376,70 +1035,55 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             KEY_LEFT_TC_COLD,
             KEY_LEFT_TC_HALT,
         )
-        missing = [key for key in required_keys if key not in data]
+        missing = [key for key in required_keys if key not in settings]
         if missing:
             raise BodegaBleMissingDataError(
                 translation_placeholders={"keys": ", ".join(missing)}
             )
 
-        locked = updates.get(KEY_LOCKED, data.get(KEY_LOCKED, False))
-        powered = updates.get(KEY_POWERED, data.get(KEY_POWERED, False))
-        run_mode = updates.get("run_mode", _run_mode_from_data(data))
-        battery_saver = updates.get("battery_saver", _battery_saver_from_data(data))
-
-        left_target = _to_device_temp(data[KEY_LEFT_TARGET], unit, self.hass)
-        temp_max = _to_device_temp(data[KEY_TEMP_MAX], unit, self.hass)
-        temp_min = _to_device_temp(data[KEY_TEMP_MIN], unit, self.hass)
-        left_ret_diff = _to_device_delta(data[KEY_LEFT_RET_DIFF], unit, self.hass)
-        start_delay = int(data[KEY_START_DELAY])
-        left_tc_hot = _to_device_delta(data[KEY_LEFT_TC_HOT], unit, self.hass)
-        left_tc_mid = _to_device_delta(data[KEY_LEFT_TC_MID], unit, self.hass)
-        left_tc_cold = _to_device_delta(data[KEY_LEFT_TC_COLD], unit, self.hass)
-        left_tc_halt = _to_device_delta(data[KEY_LEFT_TC_HALT], unit, self.hass)
+        def temp(key: str) -> int:
+            return _int8_from_float(_to_device_temp(settings[key], unit, self.hass))
+
+        def delta(key: str) -> int:
+            return _int8_from_float(_to_device_delta(settings[key], unit, self.hass))
 
         payload = [
             CMD_SET,
-            int(locked),
-            int(powered),
-            int(run_mode),
-            int(battery_saver),
-            _int8_from_float(left_target),
-            _int8_from_float(temp_max),
-            _int8_from_float(temp_min),
-            _int8_from_float(left_ret_diff),
-            start_delay & 0xFF,
+            int(settings.get(KEY_LOCKED, False)),
+            int(settings.get(KEY_POWERED, False)),
+            _run_mode_from_data(settings),
+            _battery_saver_from_data(settings),
+            temp(KEY_LEFT_TARGET),
+            temp(KEY_TEMP_MAX),
+            temp(KEY_TEMP_MIN),
+            delta(KEY_LEFT_RET_DIFF),
+            int(settings[KEY_START_DELAY]) & 0xFF,
             1 if unit == "F" else 0,
-            _int8_from_float(left_tc_hot),
-            _int8_from_float(left_tc_mid),
-            _int8_from_float(left_tc_cold),
-            _int8_from_float(left_tc_halt),
+            delta(KEY_LEFT_TC_HOT),
+            delta(KEY_LEFT_TC_MID),
+            delta(KEY_LEFT_TC_COLD),
+            delta(KEY_LEFT_TC_HALT),
         ]
 
+        # The frame layout follows the device, not the requested fields.
         if KEY_RIGHT_TARGET in data:
-            right_target = _to_device_temp(data[KEY_RIGHT_TARGET], unit, self.hass)
-            right_ret_diff = _to_device_delta(data[KEY_RIGHT_RET_DIFF], unit, self.hass)
-            right_tc_hot = _to_device_delta(data[KEY_RIGHT_TC_HOT], unit, self.hass)
-            right_tc_mid = _to_device_delta(data[KEY_RIGHT_TC_MID], unit, self.hass)
-            right_tc_cold = _to_device_delta(data[KEY_RIGHT_TC_COLD], unit, self.hass)
-            right_tc_halt = _to_device_delta(data[KEY_RIGHT_TC_HALT], unit, self.hass)
-
             payload.extend(
                 [
-                    _int8_from_float(right_target),
+                    temp(KEY_RIGHT_TARGET),
                     0x00,
                     0x00,
-                    _int8_from_float(right_ret_diff),
-                    _int8_from_float(right_tc_hot),
-                    _int8_from_float(right_tc_mid),
-                    _int8_from_float(right_tc_cold),
-                    _int8_from_float(right_tc_halt),
+                    delta(KEY_RIGHT_RET_DIFF),
+                    delta(KEY_RIGHT_TC_HOT),
+                    delta(KEY_RIGHT_TC_MID),
+                    delta(KEY_RIGHT_TC_COLD),
+                    delta(KEY_RIGHT_TC_HALT),
                     0x00,
                     0x00,
                     0x00,
                 ]
             )
 
-        return _create_packet(bytes(payload))
+        return bytes(payload)
 
     def _require_last_data(self) -> dict[str, Any]:
         """Get the last coordinator data or raise if unavailable."""
@@ -448,11 +1092,30 @@ class BodegaBleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         return self.data
 
 
-def _format_uuid(value: str) -> str:
-    """Expand 16-bit UUIDs into the full BLE UUID string."""
-    if len(value) == 4:
-        return f"0000{value}-0000-1000-8000-00805f9b34fb"
-    return value
+# Coordinator data read by _set_body; with the units they key the frame cache.
+_SET_FIELDS = (
+    KEY_LOCKED,
+    KEY_POWERED,
+    KEY_RUN_MODE,
+    KEY_BATTERY_SAVER,
+    KEY_TEMP_UNIT,
+    KEY_LEFT_TARGET,
+    KEY_TEMP_MAX,
+    KEY_TEMP_MIN,
+    KEY_LEFT_RET_DIFF,
+    KEY_START_DELAY,
+    KEY_LEFT_TC_HOT,
+    KEY_LEFT_TC_MID,
+    KEY_LEFT_TC_COLD,
+    KEY_LEFT_TC_HALT,
+    KEY_RIGHT_TARGET,
+    KEY_RIGHT_RET_DIFF,
+    KEY_RIGHT_TC_HOT,
+    KEY_RIGHT_TC_MID,
+    KEY_RIGHT_TC_COLD,
+    KEY_RIGHT_TC_HALT,
+)
+_MISSING = object()
 
 
 def _int8_from_float(value: float) -> int:
@@ -504,6 +1167,7 @@ def _to_device_delta(value: float, device_unit: str, hass: HomeAssistant) -> flo
 
 
 def _create_packet(data: bytes) -> bytes:
+    """Frame a command body; reference encoder for protocol.encode_frame."""
     frame = bytearray()
     frame.extend([0xFE, 0xFE, (len(data) + 2) & 0xFF])
     frame.extend(data)
@@ -50,8 +50,20 @@ async def async_get_config_entry_diagnostics(
             "last_seen": (
                 coordinator._last_seen.isoformat() if coordinator._last_seen else None
             ),
-            "backoff_step": coordinator._backoff_step,
             "device_available": coordinator._ble_device is not None,
         }
 
+        diagnostics_data["latency"] = coordinator.latency_summary()
+        diagnostics_data["retry"] = coordinator._retry.as_dict()
+        diagnostics_data["protocol"] = coordinator._protocol.as_dict()
+        diagnostics_data["connection_paths"] = coordinator._links.as_dict()
+        diagnostics_data["command_queue"] = coordinator._queue.as_dict()
+        diagnostics_data["actor"] = coordinator._actor.as_dict()
+        diagnostics_data["frame_capture"] = coordinator._capture.as_dict()
+        diagnostics_data["callbacks"] = coordinator.callback_summary()
+        diagnostics_data["history"] = coordinator.history.as_dict()
+        diagnostics_data["statistics"] = coordinator.statistics_summary()
+        diagnostics_data["compressor"] = coordinator.compressor.as_dict()
+        diagnostics_data["alerts"] = coordinator.alerts.as_dict()
+
     return diagnostics_data
@@ -33,3 +33,33 @@ class BodegaBleTimeoutError(BodegaBleError):
     """Timeout communicating with Bodega BLE device."""
 
     translation_key = "timeout"
+
+
+class BodegaBleInvalidFrameError(BodegaBleError):
+    """Notify frame from the device failed validation."""
+
+    translation_key = "invalid_frame"
+
+
+class BodegaBleTargetsFailedError(BodegaBleError):
+    """A service call failed for one or more targeted fridges."""
+
+    translation_key = "targets_failed"
+
+
+class BodegaBleInvalidSettingsError(BodegaBleError):
+    """Requested settings do not fit the device."""
+
+    translation_key = "invalid_settings"
+
+
+class BodegaBleUnknownProfileError(BodegaBleError):
+    """No settings profile with the requested name."""
+
+    translation_key = "unknown_profile"
+
+
+class BodegaBleShutdownError(BodegaBleError):
+    """The fridge connection was shut down before the request ran."""
+
+    translation_key = "shutting_down"
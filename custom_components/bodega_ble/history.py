@@ -0,0 +1,245 @@
+"""In-memory telemetry history of a Bodega BLE fridge.
+
+TelemetryHistory keeps the last readings of a fridge in fixed-size arrays,
+one per field plus one of timestamps, written as a ring: appending never
+allocates and overwrites the oldest sample once the buffer is full. Samples
+are at least a minimum interval apart, so advertisements arriving several
+times a second do not flush the buffer. Values are stored as float32 in the
+coordinator's units; a missing value is NaN, and the compressor is 1.0 when
+on, 0.0 when off.
+
+Range queries find their first and last sample by bisection and return the
+raw points, min/max/mean buckets or an LTTB downsample, so a dashboard can
+ask for a day of history at the resolution it can draw.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    HISTORY_MIN_INTERVAL,
+    HISTORY_SIZE,
+    KEY_BATTERY_VOLTAGE,
+    KEY_COMPRESSOR_STATUS,
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_TARGET,
+    KEY_RIGHT_CURRENT,
+    KEY_RIGHT_TARGET,
+)
+
+HISTORY_FIELDS = (
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_TARGET,
+    KEY_RIGHT_CURRENT,
+    KEY_RIGHT_TARGET,
+    KEY_BATTERY_VOLTAGE,
+    KEY_COMPRESSOR_STATUS,
+)
+_COMPRESSOR_STATES = {"Compressor On": 1.0, "Compressor Off": 0.0}
+# float32 keeps about seven significant digits.
+_PRECISION = 3
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryBucket:
+    """Aggregate of the samples of one field in a time bucket."""
+
+    start: float
+    end: float
+    min: float
+    max: float
+    mean: float
+    count: int
+
+
+def _sample_value(data: dict[str, Any], field: str) -> float:
+    value = data.get(field)
+    if field == KEY_COMPRESSOR_STATUS:
+        return _COMPRESSOR_STATES.get(value, math.nan)
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+class TelemetryHistory:
+    """Fixed-capacity ring buffer of timestamped fridge readings."""
+
+    def __init__(
+        self,
+        capacity: int = HISTORY_SIZE,
+        min_interval: float = HISTORY_MIN_INTERVAL,
+    ) -> None:
+        self._capacity = capacity
+        self._min_interval = min_interval
+        self._times = array("d", [0.0]) * capacity
+        self._values = {
+            field: array("f", [math.nan]) * capacity for field in HISTORY_FIELDS
+        }
+        # Slot the next sample is written to, and how many slots are in use.
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of samples kept."""
+        return self._capacity
+
+    @property
+    def newest(self) -> float | None:
+        """Return the timestamp of the newest sample, if any."""
+        return self._times[self._next - 1] if self._count else None
+
+    @property
+    def oldest(self) -> float | None:
+        """Return the timestamp of the oldest sample, if any."""
+        return self._times[self._slot(0)] if self._count else None
+
+    def record(self, timestamp: float, data: dict[str, Any]) -> bool:
+        """Append the history fields of coordinator data.
+
+        Returns False if the sample was dropped because it came too soon
+        after the previous one (or before it) or carried no history field.
+        """
+        newest = self.newest
+        if newest is not None and timestamp - newest < self._min_interval:
+            return False
+        values = [(field, _sample_value(data, field)) for field in HISTORY_FIELDS]
+        if all(math.isnan(value) for _, value in values):
+            return False
+        slot = self._next
+        self._times[slot] = timestamp
+        for field, value in values:
+            self._values[field][slot] = value
+        self._next = (slot + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+        return True
+
+    def _slot(self, position: int) -> int:
+        """Return the slot of the sample at a position, 0 being the oldest."""
+        return (self._next - self._count + position) % self._capacity
+
+    def _positions(self, start: float | None, end: float | None) -> range:
+        """Return the positions of the samples taken in [start, end]."""
+
+        def time_at(position: int) -> float:
+            return self._times[self._slot(position)]
+
+        positions = range(self._count)
+        first = 0 if start is None else bisect_left(positions, start, key=time_at)
+        last = (
+            self._count
+            if end is None
+            else bisect_right(positions, end, key=time_at, lo=first)
+        )
+        return range(first, last)
+
+    def series(
+        self, field: str, start: float | None = None, end: float | None = None
+    ) -> list[tuple[float, float]]:
+        """Return the (timestamp, value) samples of a field in [start, end]."""
+        values = self._values[field]
+        points = []
+        for position in self._positions(start, end):
+            slot = self._slot(position)
+            value = values[slot]
+            if not math.isnan(value):
+                points.append((self._times[slot], round(value, _PRECISION)))
+        return points
+
+    def buckets(
+        self,
+        field: str,
+        count: int,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[HistoryBucket]:
+        """Return min/max/mean of a field in equal time buckets of [start, end].
+
+        Buckets without samples are left out.
+        """
+        points = self.series(field, start, end)
+        if not points or count < 1:
+            return []
+        start = points[0][0] if start is None else start
+        end = points[-1][0] if end is None else end
+        width = (end - start) / count or 1.0
+        aggregates: dict[int, list[float]] = {}
+        for timestamp, value in points:
+            index = min(count - 1, int((timestamp - start) / width))
+            aggregate = aggregates.get(index)
+            if aggregate is None:
+                aggregates[index] = [value, value, value, 1]
+            else:
+                aggregate[0] = min(aggregate[0], value)
+                aggregate[1] = max(aggregate[1], value)
+                aggregate[2] += value
+                aggregate[3] += 1
+        return [
+            HistoryBucket(
+                start + index * width,
+                start + (index + 1) * width,
+                low,
+                high,
+                round(total / samples, _PRECISION),
+                int(samples),
+            )
+            for index, (low, high, total, samples) in sorted(aggregates.items())
+        ]
+
+    def downsample(
+        self,
+        field: str,
+        threshold: int,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> list[tuple[float, float]]:
+        """Return at most threshold samples of a field, chosen by LTTB.
+
+        Largest-Triangle-Three-Buckets keeps the first and last sample and,
+        from each bucket in between, the one forming the largest triangle
+        with the previous pick and the next bucket's mean, which preserves
+        peaks and dips that averaging would flatten.
+        """
+        points = self.series(field, start, end)
+        if threshold < 3 or len(points) <= threshold:
+            return points
+        sampled = [points[0]]
+        every = (len(points) - 2) / (threshold - 2)
+        previous = points[0]
+        for bucket in range(threshold - 2):
+            first = int(bucket * every) + 1
+            last = int((bucket + 1) * every) + 1
+            following = points[last : min(int((bucket + 2) * every) + 1, len(points))]
+            if not following:
+                following = points[-1:]
+            mean_t = sum(point[0] for point in following) / len(following)
+            mean_v = sum(point[1] for point in following) / len(following)
+            chosen = max(
+                points[first:last],
+                key=lambda point: abs(
+                    (previous[0] - mean_t) * (point[1] - previous[1])
+                    - (previous[0] - point[0]) * (mean_v - previous[1])
+                ),
+            )
+            sampled.append(chosen)
+            previous = chosen
+        sampled.append(points[-1])
+        return sampled
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            "samples": self._count,
+            "capacity": self._capacity,
+            "min_interval": self._min_interval,
+            "oldest": self.oldest,
+            "newest": self.newest,
+        }
@@ -0,0 +1,95 @@
+"""Rolling latency tracking for Bodega BLE connection phases."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from .const import (
+    LATENCY_BUCKETS,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW,
+    TIMEOUT_MARGIN,
+    TIMEOUT_PERCENTILE,
+)
+
+
+class LatencyTracker:
+    """Keep a rolling window of latency samples for one BLE phase."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._timeouts = 0
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    @property
+    def timeouts(self) -> int:
+        """Return how many measured blocks timed out."""
+        return self._timeouts
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample in seconds."""
+        self._samples.append(seconds)
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Time the wrapped block and record it.
+
+        A timeout only says the deadline passed, so it is counted instead of
+        entering the window; one hiccup must not raise the next deadline.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        except TimeoutError:
+            self._timeouts += 1
+            raise
+        self.record(time.monotonic() - start)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the nearest-rank percentile of the window, if any."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    def histogram(self) -> dict[str, int]:
+        """Return the window's samples counted into latency buckets."""
+        counts = dict.fromkeys(
+            [f"le_{bound:g}" for bound in LATENCY_BUCKETS] + ["inf"], 0
+        )
+        for sample in self._samples:
+            bucket = next(
+                (f"le_{bound:g}" for bound in LATENCY_BUCKETS if sample <= bound),
+                "inf",
+            )
+            counts[bucket] += 1
+        return counts
+
+    def derive_timeout(self, default: float, floor: float, ceiling: float) -> float:
+        """Derive a timeout from the p95 latency, clamped to floor/ceiling."""
+        latency = self.percentile(TIMEOUT_PERCENTILE)
+        if latency is None or self.count < LATENCY_MIN_SAMPLES:
+            return default
+        return max(floor, min(ceiling, latency * TIMEOUT_MARGIN))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": max(self._samples, default=None),
+            "timeouts": self._timeouts,
+            "histogram": self.histogram(),
+        }
@@ -0,0 +1,128 @@
+"""Per-scanner link quality tracking for Bodega BLE fridges.
+
+Each adapter or proxy that hears a fridge is a separate connection path.
+For every path we keep an RSSI average from advertisements plus the
+outcome and duration of connects routed through it, and use those to
+pick the path to hand to the connector.
+"""
+
+from __future__ import annotations
+
+import statistics
+from collections import deque
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    LINK_CONNECT_WINDOW,
+    LINK_FAILURE_PENALTY,
+    LINK_RSSI_SMOOTHING,
+    LINK_SLOW_CONNECT_PENALTY,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.components.bluetooth import BluetoothScannerDevice
+
+
+class PathStats:
+    """Link statistics for one scanner (adapter or proxy)."""
+
+    def __init__(self) -> None:
+        self.rssi: float | None = None
+        self.attempts = 0
+        self.successes = 0
+        self._connect_times: deque[float] = deque(maxlen=LINK_CONNECT_WINDOW)
+
+    def record_rssi(self, rssi: int) -> None:
+        """Fold an advertisement RSSI into the moving average."""
+        if self.rssi is None:
+            self.rssi = float(rssi)
+        else:
+            self.rssi += LINK_RSSI_SMOOTHING * (rssi - self.rssi)
+
+    def record_connect(self, success: bool, seconds: float) -> None:
+        """Record the outcome of a connect routed through this path."""
+        self.attempts += 1
+        if success:
+            self.successes += 1
+            self._connect_times.append(seconds)
+
+    @property
+    def success_ratio(self) -> float:
+        """Return the connect success ratio with a one-each prior.
+
+        The prior keeps a path with no history from scoring as either
+        perfect or hopeless.
+        """
+        return (self.successes + 1) / (self.attempts + 2)
+
+    @property
+    def median_connect_time(self) -> float | None:
+        """Return the median successful connect time, if known."""
+        if not self._connect_times:
+            return None
+        return statistics.median(self._connect_times)
+
+    def score(self, rssi: int | None = None) -> float:
+        """Return a path score in dBm-like units; higher is better."""
+        score = float(rssi if rssi is not None else (self.rssi or -100.0))
+        score -= LINK_FAILURE_PENALTY * (1.0 - self.success_ratio)
+        if (median := self.median_connect_time) is not None:
+            score -= LINK_SLOW_CONNECT_PENALTY * median
+        return score
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            "rssi": None if self.rssi is None else round(self.rssi, 1),
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "success_ratio": round(self.success_ratio, 3),
+            "median_connect_time": self.median_connect_time,
+            "score": round(self.score(), 1),
+        }
+
+
+# Scores a path nothing has been recorded for; never updated.
+_NO_HISTORY = PathStats()
+
+
+class LinkQualityTracker:
+    """Track link statistics per scanner source and choose a path."""
+
+    def __init__(self) -> None:
+        self._paths: dict[str, PathStats] = {}
+
+    def _path(self, source: str) -> PathStats:
+        if (stats := self._paths.get(source)) is None:
+            stats = self._paths[source] = PathStats()
+        return stats
+
+    def record_advertisement(self, source: str, rssi: int) -> None:
+        """Record an advertisement heard by a scanner."""
+        self._path(source).record_rssi(rssi)
+
+    def record_connect(self, source: str, success: bool, seconds: float) -> None:
+        """Record a connect outcome for a scanner."""
+        self._path(source).record_connect(success, seconds)
+
+    def choose(
+        self, candidates: Sequence[BluetoothScannerDevice]
+    ) -> BluetoothScannerDevice | None:
+        """Return the candidate path with the best score.
+
+        Choosing reads the statistics only; RSSI is recorded from
+        advertisements alone.
+        """
+        best: BluetoothScannerDevice | None = None
+        best_score = float("-inf")
+        for candidate in candidates:
+            stats = self._paths.get(candidate.scanner.source, _NO_HISTORY)
+            score = stats.score(candidate.advertisement.rssi)
+            if score > best_score:
+                best, best_score = candidate, score
+        return best
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return per-path statistics for diagnostics."""
+        return {source: stats.as_dict() for source, stats in self._paths.items()}
@@ -0,0 +1,241 @@
+"""Long-term statistics for Bodega BLE fridges, aggregated in memory.
+
+With statistics import enabled, every reading of the zone temperatures and
+battery voltage is folded into 5-minute aggregates (min, max, mean), which
+roll up into hourly ones. Completed hours are imported into the recorder as
+external statistics, ``bodega_ble:<device id>_<field>``, so the raw sensors
+can be excluded from the recorder while the long-term graphs stay complete.
+The recorder only accepts hourly external statistics; the 5-minute
+aggregates of the last day are kept in memory for diagnostics.
+
+On unload the open hour is imported with the readings so far. If Home
+Assistant starts again within that hour, the hour imported next replaces it
+and holds only the readings taken after the restart.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.const import UnitOfElectricPotential
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .capture import device_id
+from .const import (
+    DOMAIN,
+    KEY_BATTERY_VOLTAGE,
+    KEY_LEFT_CURRENT,
+    KEY_RIGHT_CURRENT,
+    STATISTICS_PENDING_HOURS,
+    STATISTICS_SHORT_TERM,
+    STATISTICS_SHORT_TERM_KEEP,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+# Fields imported, with the name given to their statistics.
+STATISTICS_FIELDS = {
+    KEY_LEFT_CURRENT: "Fridge temperature",
+    KEY_RIGHT_CURRENT: "Freezer temperature",
+    KEY_BATTERY_VOLTAGE: "Battery voltage",
+}
+
+
+@dataclass(slots=True)
+class Aggregate:
+    """Min, max and running mean of the readings in one period."""
+
+    start: float
+    min: float
+    max: float
+    total: float
+    count: int
+
+    @classmethod
+    def of(cls, start: float, value: float) -> Aggregate:
+        """Return an aggregate of a single reading."""
+        return cls(start, value, value, value, 1)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the readings."""
+        return self.total / self.count
+
+    def add(self, value: float) -> None:
+        """Fold in a reading."""
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: Aggregate) -> None:
+        """Fold in the readings of another aggregate."""
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.count += other.count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the aggregate for diagnostics."""
+        return {
+            "start": dt_util.utc_from_timestamp(self.start).isoformat(),
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "count": self.count,
+        }
+
+
+class StatisticsAggregator:
+    """Fold a fridge's readings into 5-minute and hourly aggregates."""
+
+    def __init__(self, address: str, name: str) -> None:
+        self._object_id = device_id(address).hex()
+        self._name = name
+        # Open aggregates per field, and the hours completed but not imported.
+        self._short: dict[str, Aggregate] = {}
+        self._hour: dict[str, Aggregate] = {}
+        self._recent: dict[str, deque[Aggregate]] = {
+            field: deque(maxlen=STATISTICS_SHORT_TERM_KEEP)
+            for field in STATISTICS_FIELDS
+        }
+        self._pending: dict[str, deque[Aggregate]] = {
+            field: deque(maxlen=STATISTICS_PENDING_HOURS) for field in STATISTICS_FIELDS
+        }
+
+    def statistic_id(self, field: str) -> str:
+        """Return the external statistic ID of a field."""
+        return f"{DOMAIN}:{self._object_id}_{field}"
+
+    @property
+    def has_pending(self) -> bool:
+        """Return True if completed hours are waiting to be imported."""
+        return any(self._pending.values())
+
+    def add(self, timestamp: float, data: dict[str, Any]) -> None:
+        """Fold the statistics fields of coordinator data into the aggregates."""
+        for field in STATISTICS_FIELDS:
+            value = data.get(field)
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                self._add(field, timestamp, float(value))
+
+    def _add(self, field: str, timestamp: float, value: float) -> None:
+        start = timestamp - timestamp % STATISTICS_SHORT_TERM
+        short = self._short.get(field)
+        if short is not None and short.start == start:
+            short.add(value)
+            return
+        if short is not None:
+            if start < short.start:
+                # The clock went back; keep the periods in order.
+                return
+            self._close_short(field, short)
+        self._short[field] = Aggregate.of(start, value)
+        hour = self._hour.get(field)
+        if hour is not None and start - start % HOUR != hour.start:
+            self._pending[field].append(hour)
+            del self._hour[field]
+
+    def close(self) -> None:
+        """Complete the open periods, such as on unload, so they are imported."""
+        for field, short in self._short.items():
+            self._close_short(field, short)
+        self._short.clear()
+        for field, hour in self._hour.items():
+            self._pending[field].append(hour)
+        self._hour.clear()
+
+    def _close_short(self, field: str, short: Aggregate) -> None:
+        self._recent[field].append(short)
+        hour_start = short.start - short.start % HOUR
+        hour = self._hour.get(field)
+        if hour is None:
+            self._hour[field] = Aggregate(
+                hour_start, short.min, short.max, short.total, short.count
+            )
+        else:
+            hour.merge(short)
+
+    def pop_pending(self) -> dict[str, list[Aggregate]]:
+        """Return and forget the completed hours of each field."""
+        pending = {
+            field: list(hours) for field, hours in self._pending.items() if hours
+        }
+        for hours in self._pending.values():
+            hours.clear()
+        return pending
+
+    def metadata(self, field: str, unit: str | None) -> dict[str, Any]:
+        """Return the statistic metadata of a field."""
+        return {
+            "has_mean": True,
+            "has_sum": False,
+            "name": f"{self._name} {STATISTICS_FIELDS[field].lower()}",
+            "source": DOMAIN,
+            "statistic_id": self.statistic_id(field),
+            "unit_of_measurement": unit,
+        }
+
+    def recent(self, field: str) -> list[Aggregate]:
+        """Return the completed 5-minute aggregates of a field, oldest first."""
+        return list(self._recent[field])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            field: {
+                "statistic_id": self.statistic_id(field),
+                "pending_hours": len(self._pending[field]),
+                "last_5_minutes": (
+                    self._recent[field][-1].as_dict() if self._recent[field] else None
+                ),
+            }
+            for field in STATISTICS_FIELDS
+        }
+
+
+def _statistics(hours: Iterable[Aggregate]) -> list[dict[str, Any]]:
+    return [
+        {
+            "start": dt_util.utc_from_timestamp(hour.start),
+            "mean": hour.mean,
+            "min": hour.min,
+            "max": hour.max,
+        }
+        for hour in hours
+    ]
+
+
+@callback
+def async_import_statistics(
+    hass: HomeAssistant, aggregator: StatisticsAggregator
+) -> None:
+    """Import completed hours into the recorder, if it is running.
+
+    Hours stay pending while the recorder is not loaded, up to a limit.
+    """
+    if "recorder" not in hass.config.components:
+        return
+    # Imported here so that the integration loads without the recorder.
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+    )
+
+    units = {
+        KEY_LEFT_CURRENT: hass.config.units.temperature_unit,
+        KEY_RIGHT_CURRENT: hass.config.units.temperature_unit,
+        KEY_BATTERY_VOLTAGE: UnitOfElectricPotential.VOLT,
+    }
+    for field, hours in aggregator.pop_pending().items():
+        _LOGGER.debug(
+            "Importing %d hours of %s", len(hours), aggregator.statistic_id(field)
+        )
+        async_add_external_statistics(
+            hass, aggregator.metadata(field, units[field]), _statistics(hours)
+        )
@@ -0,0 +1,166 @@
+"""Event loop time spent in the integration's callbacks.
+
+Everything the integration does between awaits runs on Home Assistant's
+event loop: advertisement callbacks, notify handlers, normalization and the
+entity state writes that follow each update. When a budget is configured,
+CallbackMonitor times those callbacks, keeps totals per callback and the
+slowest calls with the stack that led to them, and warns when a single call
+runs over the budget. Without a budget, measure() only yields.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+import traceback
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import (
+    MONITOR_SLOW_CALLS,
+    MONITOR_STACK_DEPTH,
+    MONITOR_WARN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Callbacks timed by the coordinator. Advertisement and update include the
+# normalization and state writes they trigger.
+CALLBACK_ADVERTISEMENT = "advertisement"
+CALLBACK_NOTIFY = "notify"
+CALLBACK_NORMALIZE = "normalize"
+CALLBACK_UPDATE = "update_listeners"
+CALLBACK_STATE_WRITE = "state_write"
+
+
+@dataclass(slots=True)
+class CallbackStats:
+    """Running totals of one callback."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    over_budget: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals in milliseconds for diagnostics."""
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else None,
+            "max_ms": self.max * 1000,
+            "over_budget": self.over_budget,
+        }
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class SlowCall:
+    """One of the slowest calls seen, ordered by duration."""
+
+    duration: float
+    callback: str = field(compare=False)
+    target: str | None = field(compare=False)
+    timestamp: float = field(compare=False)
+    stack: tuple[str, ...] = field(compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the call for diagnostics."""
+        return {
+            "callback": self.callback,
+            "target": self.target,
+            "duration_ms": self.duration * 1000,
+            "time": self.timestamp,
+            "stack": list(self.stack),
+        }
+
+
+class CallbackMonitor:
+    """Time the integration's event loop callbacks against a budget."""
+
+    def __init__(
+        self,
+        budget: float | None = None,
+        keep: int = MONITOR_SLOW_CALLS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._budget = budget
+        self._keep = keep
+        self._clock = clock
+        self._stats: dict[str, CallbackStats] = {}
+        # Min-heap, so the fastest of the kept calls is the one replaced.
+        self._slowest: list[SlowCall] = []
+        self._last_warning: dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if callbacks are being timed."""
+        return self._budget is not None
+
+    @contextmanager
+    def measure(self, name: str, target: str | None = None) -> Iterator[None]:
+        """Time the wrapped callback, attributing it to a target if given."""
+        if self._budget is None:
+            yield
+            return
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self._record(name, target, self._clock() - start)
+
+    def _record(self, name: str, target: str | None, duration: float) -> None:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = CallbackStats()
+        stats.count += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        if len(self._slowest) < self._keep or duration > self._slowest[0].duration:
+            # Drop the frames of measure() and contextlib's __exit__.
+            stack = traceback.format_list(
+                traceback.extract_stack(limit=MONITOR_STACK_DEPTH + 3)[:-3]
+            )
+            call = SlowCall(
+                duration,
+                name,
+                target,
+                time.time(),
+                tuple(line.rstrip() for line in stack),
+            )
+            if len(self._slowest) < self._keep:
+                heapq.heappush(self._slowest, call)
+            else:
+                heapq.heapreplace(self._slowest, call)
+        assert self._budget is not None
+        if duration <= self._budget:
+            return
+        stats.over_budget += 1
+        now = time.monotonic()
+        last = self._last_warning.get(name)
+        if last is not None and now - last < MONITOR_WARN_INTERVAL:
+            return
+        self._last_warning[name] = now
+        _LOGGER.warning(
+            "Bodega BLE %s callback%s took %.1f ms, over the %.1f ms budget; "
+            "see diagnostics for the slowest calls",
+            name,
+            f" for {target}" if target else "",
+            duration * 1000,
+            self._budget * 1000,
+        )
+
+    def slowest(self) -> list[SlowCall]:
+        """Return the kept calls, slowest first."""
+        return sorted(self._slowest, reverse=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "budget_ms": self._budget * 1000 if self._budget is not None else None,
+            "callbacks": {name: stats.as_dict() for name, stats in self._stats.items()},
+            "slowest": [call.as_dict() for call in self.slowest()],
+        }
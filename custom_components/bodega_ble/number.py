@@ -161,4 +161,3 @@ class BodegaBleNumber(CoordinatorEntity[BodegaBleCoordinator], NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the value."""
         await self.entity_description.set_value_fn(self.coordinator, value)
-        await self.coordinator.async_request_refresh()
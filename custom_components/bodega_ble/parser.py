@@ -6,6 +6,7 @@ https://github.com/tonylofgren/aurora-smart-home
 
 from __future__ import annotations
 
+from enum import StrEnum
 from typing import Any
 
 from .const import (
@@ -37,36 +38,72 @@ from .const import (
     KEY_TEMP_MAX,
     KEY_TEMP_MIN,
     KEY_TEMP_UNIT,
+    SERVICE_UUID,
+)
+
+# Values an advertisement may update; settings still come from GATT polls.
+ADVERTISEMENT_KEYS = (
+    KEY_LEFT_CURRENT,
+    KEY_RIGHT_CURRENT,
+    KEY_BATTERY_PERCENT,
+    KEY_BATTERY_VOLTAGE,
+    KEY_COMPRESSOR_STATUS,
+    KEY_RUNNING_STATUS,
+    KEY_TEMP_UNIT,
 )
 
 
+class FrameOutcome(StrEnum):
+    """Result of validating a notify frame."""
+
+    OK = "ok"
+    DOUBLED_CHECKSUM = "doubled_checksum"
+    BAD_HEADER = "bad_header"
+    SHORT_FRAME = "short_frame"
+    BAD_CHECKSUM = "bad_checksum"
+    UNKNOWN_COMMAND = "unknown_command"
+
+
 def parse_notify_payload(payload: bytes) -> dict[str, Any]:
     """Parse a Bodega notify frame into device-unit values."""
+    return decode_frame(payload)[1]
+
+
+def decode_frame(payload: bytes) -> tuple[FrameOutcome, dict[str, Any]]:
+    """Validate a notify frame and parse it; rejected frames parse to {}."""
     if len(payload) < 6:
-        return {}
+        return FrameOutcome.SHORT_FRAME, {}
     if payload[0] != 0xFE or payload[1] != 0xFE:
-        return {}
+        return FrameOutcome.BAD_HEADER, {}
 
     frame_len = payload[2]
     total_len = 3 + frame_len
     if frame_len < 3 or len(payload) != total_len:
-        return {}
+        return FrameOutcome.SHORT_FRAME, {}
 
     expected = int.from_bytes(payload[total_len - 2 : total_len], "big")
     checksum = sum(payload[: total_len - 2]) & 0xFFFF
-    # Some firmware variants appear to double the checksum value.
-    if expected not in (checksum, (checksum * 2) & 0xFFFF):
-        return {}
+    outcome = FrameOutcome.OK
+    if expected != checksum:
+        # Some firmware variants appear to double the checksum value.
+        if expected != (checksum * 2) & 0xFFFF:
+            return FrameOutcome.BAD_CHECKSUM, {}
+        outcome = FrameOutcome.DOUBLED_CHECKSUM
 
     cmd = payload[3]
     if cmd not in (CMD_QUERY, CMD_SET):
-        return {}
+        return FrameOutcome.UNKNOWN_COMMAND, {}
 
     data_len = frame_len - 3
     if data_len < 0x12:
-        return {}
+        return FrameOutcome.SHORT_FRAME, {}
 
-    data = payload[4 : total_len - 2]
+    return outcome, _parse_data(payload[4 : total_len - 2])
+
+
+def _parse_data(data: bytes) -> dict[str, Any]:
+    """Parse the data bytes of a valid status frame."""
+    data_len = len(data)
     raw_unit = "F" if data[0x09] == 1 else "C"
 
     parsed: dict[str, Any] = {
@@ -110,6 +147,28 @@ def parse_notify_payload(payload: bytes) -> dict[str, Any]:
     return parsed
 
 
+def parse_advertisement(
+    manufacturer_data: dict[int, bytes], service_data: dict[str, bytes]
+) -> dict[str, Any]:
+    """Parse telemetry broadcast in an advertisement into device-unit values.
+
+    Firmware variants that advertise their state embed the same status frame
+    they send on the notify characteristic, either as service data for the
+    Bodega service or inside a manufacturer data record. Only the telemetry
+    keys are returned.
+    """
+    candidates = [service_data.get(SERVICE_UUID, b"")]
+    candidates.extend(manufacturer_data.values())
+    for payload in candidates:
+        start = payload.find(b"\xfe\xfe")
+        if start < 0:
+            continue
+        parsed = parse_notify_payload(payload[start:])
+        if parsed:
+            return {key: parsed[key] for key in ADVERTISEMENT_KEYS if key in parsed}
+    return {}
+
+
 def _int8(value: int) -> int:
     """Convert unsigned byte to signed int8."""
     return int.from_bytes(bytes([value]), "big", signed=True)
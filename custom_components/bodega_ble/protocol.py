@@ -0,0 +1,94 @@
+"""Per-device protocol context for Bodega BLE fridges.
+
+Holds the Bodega characteristics resolved for the current connection and
+the encoded frames for settings states that have been sent before.
+
+Characteristics belong to the adapter or proxy that made the connection, so
+they are resolved again from bleak's own service cache on every new client
+rather than carried across sessions, which may use another connection path.
+
+Frames are cached by a key the coordinator builds from the settings values
+before encoding anything (command, HA and device temperature units, and the
+raw setting values), so a hit skips building the body as well as framing it.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak.backends.service import BleakGATTServiceCollection
+from bleak.exc import BleakCharacteristicNotFoundError
+
+from .const import CHAR_NOTIFY_UUID, CHAR_WRITE_UUID, FRAME_CACHE_SIZE
+
+FRAME_HEADER = 0xFE
+_HEADER_SUM = FRAME_HEADER + FRAME_HEADER
+
+
+def encode_frame(body: bytes) -> bytes:
+    """Frame a command body (command + data) with header, length and checksum."""
+    length = len(body) + 2
+    checksum = (_HEADER_SUM + (length & 0xFF) + sum(body)) & 0xFFFF
+    return b"".join(
+        (
+            bytes((FRAME_HEADER, FRAME_HEADER, length & 0xFF)),
+            body,
+            checksum.to_bytes(2, "big"),
+        )
+    )
+
+
+class ProtocolContext:
+    """Resolved characteristics and an LRU of encoded command frames."""
+
+    def __init__(self, max_frames: int = FRAME_CACHE_SIZE) -> None:
+        self.write_char: BleakGATTCharacteristic | str = CHAR_WRITE_UUID
+        self.notify_char: BleakGATTCharacteristic | str = CHAR_NOTIFY_UUID
+        self._max_frames = max_frames
+        self._frames: OrderedDict[Hashable, bytes] = OrderedDict()
+
+    @property
+    def resolved(self) -> bool:
+        """Return True while characteristics are resolved for a connection."""
+        return not isinstance(self.write_char, str)
+
+    def resolve(self, services: BleakGATTServiceCollection) -> None:
+        """Resolve the Bodega characteristics from a service collection."""
+        write_char = services.get_characteristic(CHAR_WRITE_UUID)
+        notify_char = services.get_characteristic(CHAR_NOTIFY_UUID)
+        if write_char is None or notify_char is None:
+            raise BleakCharacteristicNotFoundError(
+                CHAR_WRITE_UUID if write_char is None else CHAR_NOTIFY_UUID
+            )
+        self.write_char = write_char
+        self.notify_char = notify_char
+
+    def invalidate(self) -> None:
+        """Forget resolved characteristics; encoded frames stay valid."""
+        self.write_char = CHAR_WRITE_UUID
+        self.notify_char = CHAR_NOTIFY_UUID
+
+    def cached_frame(self, key: Hashable) -> bytes | None:
+        """Return the frame cached for a settings key, if any."""
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+        return frame
+
+    def add_frame(self, key: Hashable, body: bytes) -> bytes:
+        """Frame a command body and cache it under a settings key."""
+        frame = encode_frame(body)
+        self._frames[key] = frame
+        if len(self._frames) > self._max_frames:
+            self._frames.popitem(last=False)
+        return frame
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            "services_resolved": self.resolved,
+            "cached_frames": len(self._frames),
+        }
@@ -0,0 +1,69 @@
+"""Replay of Bodega BLE capture files through a coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .capture import CaptureReader, CaptureRecord, FrameDirection
+from .const import REPLAY_BATCH
+
+if TYPE_CHECKING:
+    from .coordinator import BodegaBleCoordinator
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Counts of the frames a replay fed to the coordinator."""
+
+    applied: int = 0
+    rejected: int = 0
+
+
+async def async_replay_capture(
+    coordinator: BodegaBleCoordinator,
+    path: str,
+    speed: float | None = 1.0,
+    device: bytes | None = None,
+) -> ReplayResult:
+    """Feed the received frames of a capture file through a coordinator.
+
+    A speed of 1 keeps the recorded timing, 60 plays an hour in a minute and
+    None applies frames as fast as possible. Frames are paced against the
+    first record, so a slow listener does not make the replay drift. Device
+    limits the replay to one fridge of a merged capture.
+    """
+    hass = coordinator.hass
+    loop = hass.loop
+    result = ReplayResult()
+    reader = await hass.async_add_executor_job(CaptureReader, path)
+    try:
+        records = reader.records(device, FrameDirection.RX)
+        origin: tuple[float, float] | None = None
+        while batch := await hass.async_add_executor_job(_next_batch, records):
+            for record in batch:
+                if speed:
+                    if origin is None:
+                        origin = (record.timestamp, loop.time())
+                    delay = (
+                        origin[1] + (record.timestamp - origin[0]) / speed - loop.time()
+                    )
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                if coordinator.async_apply_frame(record.frame, record.timestamp):
+                    result.applied += 1
+                else:
+                    result.rejected += 1
+            # Let the rest of Home Assistant run between unpaced batches.
+            await asyncio.sleep(0)
+    finally:
+        reader.close()
+    return result
+
+
+def _next_batch(records: Iterator[CaptureRecord]) -> list[CaptureRecord]:
+    """Read the next batch of records; run in the executor as it pages the file."""
+    return list(itertools.islice(records, REPLAY_BATCH))
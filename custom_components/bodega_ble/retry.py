@@ -0,0 +1,190 @@
+"""Error-classified retry policy for Bodega BLE polling."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from bleak.exc import BleakDeviceNotFoundError
+from bleak_retry_connector import (
+    OUT_OF_SLOTS_ERRORS,
+    BleakConnectionError,
+    BleakNotFoundError,
+    BleakOutOfConnectionSlotsError,
+)
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_OPEN_SECONDS,
+    DEFAULT_SCAN_INTERVAL,
+    MAX_BACKOFF_INTERVAL,
+)
+from .exceptions import BodegaBleInvalidFrameError
+
+
+class ErrorClass(StrEnum):
+    """Failure classes with their own backoff policy."""
+
+    DEVICE_ABSENT = "device_absent"
+    SLOT_EXHAUSTION = "slot_exhaustion"
+    GATT_ERROR = "gatt_error"
+    PARSE_ERROR = "parse_error"
+    TIMEOUT = "timeout"
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BackoffPolicy:
+    """Exponential backoff ceiling for one error class."""
+
+    base: float
+    cap: float
+
+
+# Slots free up quickly and corrupt frames are usually one-offs, so those
+# retry sooner than a fridge that has left radio range.
+BACKOFF_POLICIES: dict[ErrorClass, BackoffPolicy] = {
+    ErrorClass.DEVICE_ABSENT: BackoffPolicy(base=60, cap=MAX_BACKOFF_INTERVAL),
+    ErrorClass.SLOT_EXHAUSTION: BackoffPolicy(base=15, cap=120),
+    ErrorClass.GATT_ERROR: BackoffPolicy(base=30, cap=300),
+    ErrorClass.PARSE_ERROR: BackoffPolicy(base=15, cap=120),
+    ErrorClass.TIMEOUT: BackoffPolicy(base=60, cap=MAX_BACKOFF_INTERVAL),
+}
+
+
+def classify_error(err: BaseException) -> ErrorClass:
+    """Map an exception raised during a BLE session to an error class."""
+    if isinstance(err, BodegaBleInvalidFrameError):
+        return ErrorClass.PARSE_ERROR
+    if isinstance(err, TimeoutError):
+        return ErrorClass.TIMEOUT
+    if isinstance(err, BleakOutOfConnectionSlotsError) or any(
+        marker in str(err) for marker in OUT_OF_SLOTS_ERRORS
+    ):
+        return ErrorClass.SLOT_EXHAUSTION
+    if isinstance(
+        err, BleakNotFoundError | BleakDeviceNotFoundError | BleakConnectionError
+    ):
+        return ErrorClass.DEVICE_ABSENT
+    # Remaining Bleak errors and EOF disconnect glitches are GATT failures.
+    return ErrorClass.GATT_ERROR
+
+
+class RetryPolicy:
+    """Per-class exponential backoff with full jitter and a circuit breaker.
+
+    Consecutive failures of the same class double that class's ceiling and
+    the next delay is drawn uniformly from [min_delay, ceiling] so that a
+    fleet does not fall back into lockstep. ``min_delay`` is the normal poll
+    interval: a failing fridge is never polled more often than a healthy one.
+    After ``failure_threshold`` consecutive failures the breaker opens; once
+    ``open_seconds`` have passed a single half-open trial decides whether it
+    closes again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        open_seconds: float = BREAKER_OPEN_SECONDS,
+        min_delay: float = DEFAULT_SCAN_INTERVAL,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._open_seconds = open_seconds
+        self._min_delay = min_delay
+        self._rng = rng or random.Random()  # noqa: S311 - jitter, not crypto
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._attempts: dict[ErrorClass, int] = {}
+        self._failures: dict[ErrorClass, int] = dict.fromkeys(ErrorClass, 0)
+        self._last_error: ErrorClass | None = None
+        self._last_delay: float | None = None
+        self._next_attempt = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the breaker state, moving open to half-open when due."""
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self._open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def backing_off(self) -> bool:
+        """Return True while a failure streak is in progress."""
+        return self._consecutive_failures > 0
+
+    @property
+    def attempt_due(self) -> bool:
+        """Return True once the delay drawn after the last failure has passed."""
+        return self._clock() >= self._next_attempt
+
+    def allow_request(self) -> bool:
+        """Return True if a poll may touch the radio now."""
+        return self.state is not CircuitState.OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker and forget the failure streak."""
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._attempts.clear()
+        self._last_delay = None
+        self._next_attempt = 0.0
+
+    def record_failure(self, error_class: ErrorClass) -> float:
+        """Record a poll failure and return the delay before the next poll."""
+        self._failures[error_class] += 1
+        self._last_error = error_class
+        self._consecutive_failures += 1
+        attempt = self._attempts.get(error_class, 0)
+        self._attempts[error_class] = attempt + 1
+
+        policy = BACKOFF_POLICIES[error_class]
+        ceiling = min(policy.cap, policy.base * (2**attempt))
+        delay = self._rng.uniform(self._min_delay, max(self._min_delay, ceiling))
+
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self._failure_threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+            delay = max(delay, self._open_seconds)
+
+        self._last_delay = delay
+        self._next_attempt = self._clock() + delay
+        return delay
+
+    def record_command_failure(self, error_class: ErrorClass) -> None:
+        """Count a command failure without touching the poll schedule."""
+        self._failures[error_class] += 1
+        self._last_error = error_class
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return retry and breaker state for diagnostics."""
+        return {
+            "circuit_state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "last_error_class": self._last_error,
+            "last_delay": self._last_delay,
+            "failures_by_class": {
+                error_class.value: count
+                for error_class, count in self._failures.items()
+            },
+        }
@@ -69,4 +69,3 @@ class BodegaTempUnitSelect(CoordinatorEntity[BodegaBleCoordinator], SelectEntity
         """Change the selected option."""
         fahrenheit = option == "Fahrenheit"
         await self.coordinator.async_set_temp_unit(fahrenheit)
-        await self.coordinator.async_request_refresh()
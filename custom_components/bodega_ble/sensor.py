@@ -6,7 +6,9 @@ https://github.com/tonylofgren/aurora-smart-home
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -18,12 +20,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
     UnitOfElectricPotential,
+    UnitOfEnergy,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -52,6 +56,12 @@ from .const import (
     KEY_TEMP_MAX,
     KEY_TEMP_MIN,
     KEY_TEMP_UNIT,
+    PHASE_CONNECT,
+    PHASE_LOOKUP,
+    PHASE_NOTIFY,
+    PHASE_QUEUE_WAIT,
+    PHASE_SUBSCRIBE,
+    PHASE_WRITE,
 )
 from .coordinator import BodegaBleCoordinator
 from .entity import device_info_for_entry
@@ -63,6 +73,124 @@ class BodegaSensorEntityDescription(SensorEntityDescription):
 
     data_key: str
     use_temp_unit: bool = False
+    # Metric sensors read the coordinator instead of its data.
+    value_fn: Callable[[BodegaBleCoordinator], StateType] | None = None
+    attributes_fn: Callable[[BodegaBleCoordinator], dict[str, Any]] | None = None
+
+
+def _phase_description(phase: str, name: str) -> BodegaSensorEntityDescription:
+    """Describe a sensor reporting the median latency of one BLE phase."""
+
+    def _median(coordinator: BodegaBleCoordinator) -> float | None:
+        return coordinator.phase_latency(phase).percentile(50)
+
+    def _attributes(coordinator: BodegaBleCoordinator) -> dict[str, Any]:
+        summary = coordinator.phase_latency(phase).as_dict()
+        del summary["p50"]
+        return summary
+
+    return BodegaSensorEntityDescription(
+        key=f"latency_{phase}",
+        data_key=f"latency_{phase}",
+        name=name,
+        translation_key=f"latency_{phase}",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=_median,
+        attributes_fn=_attributes,
+    )
+
+
+def _success_rate(coordinator: BodegaBleCoordinator) -> float | None:
+    outcomes = coordinator.outcome_counts()
+    total = sum(outcomes.values())
+    if not total:
+        return None
+    return round(100 * outcomes.get("success", 0) / total, 1)
+
+
+METRIC_DESCRIPTIONS: tuple[BodegaSensorEntityDescription, ...] = (
+    _phase_description(PHASE_QUEUE_WAIT, "Queue wait time"),
+    _phase_description(PHASE_LOOKUP, "Device lookup time"),
+    _phase_description(PHASE_CONNECT, "Connect time"),
+    _phase_description(PHASE_SUBSCRIBE, "Notify subscribe time"),
+    _phase_description(PHASE_WRITE, "Write time"),
+    _phase_description(PHASE_NOTIFY, "Response time"),
+    BodegaSensorEntityDescription(
+        key="session_success_rate",
+        data_key="session_success_rate",
+        name="BLE success rate",
+        translation_key="session_success_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=_success_rate,
+        attributes_fn=lambda coordinator: coordinator.outcome_counts(),
+    ),
+)
+
+
+# Compressor analytics over the configured window.
+COMPRESSOR_DESCRIPTIONS: tuple[BodegaSensorEntityDescription, ...] = (
+    BodegaSensorEntityDescription(
+        key="compressor_duty_cycle",
+        data_key="compressor_duty_cycle",
+        name="Compressor duty cycle",
+        translation_key="compressor_duty_cycle",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.compressor.duty_cycle,
+    ),
+    BodegaSensorEntityDescription(
+        key="compressor_cycles",
+        data_key="compressor_cycles",
+        name="Compressor cycles",
+        translation_key="compressor_cycles",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.compressor.cycles,
+    ),
+    BodegaSensorEntityDescription(
+        key="compressor_mean_on_time",
+        data_key="compressor_mean_on_time",
+        name="Compressor mean run time",
+        translation_key="compressor_mean_on_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.compressor.mean_on_time,
+    ),
+    BodegaSensorEntityDescription(
+        key="compressor_mean_off_time",
+        data_key="compressor_mean_off_time",
+        name="Compressor mean idle time",
+        translation_key="compressor_mean_off_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.compressor.mean_off_time,
+    ),
+    # Energy over a sliding window goes up and down, so it has no total
+    # state class.
+    BodegaSensorEntityDescription(
+        key="compressor_energy",
+        data_key="compressor_energy",
+        name="Compressor energy",
+        translation_key="compressor_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        value_fn=lambda coordinator: coordinator.compressor.energy,
+        attributes_fn=lambda coordinator: {
+            "window_hours": coordinator.compressor.window / 3600
+        },
+    ),
+)
 
 
 SENSOR_DESCRIPTIONS: tuple[BodegaSensorEntityDescription, ...] = (
@@ -299,7 +427,11 @@ async def async_setup_entry(
 
     async_add_entities(
         BodegaBleSensor(coordinator, entry, description)
-        for description in SENSOR_DESCRIPTIONS
+        for description in (
+            *SENSOR_DESCRIPTIONS,
+            *COMPRESSOR_DESCRIPTIONS,
+            *METRIC_DESCRIPTIONS,
+        )
     )
 
 
@@ -334,6 +466,9 @@ class BodegaBleSensor(CoordinatorEntity[BodegaBleCoordinator], SensorEntity):
 
     @property
     def native_value(self) -> str | int | float | None:
+        if self.entity_description.value_fn:
+            return self.entity_description.value_fn(self.coordinator)
+
         if self.entity_description.key == KEY_BLE_STATUS:
             data = self.coordinator.data or {}
             return data.get(KEY_BLE_STATUS, "Unknown")
@@ -341,8 +476,17 @@ class BodegaBleSensor(CoordinatorEntity[BodegaBleCoordinator], SensorEntity):
         data = self.coordinator.data or {}
         return data.get(self.entity_description.data_key)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self.entity_description.attributes_fn:
+            return self.entity_description.attributes_fn(self.coordinator)
+        return None
+
     @property
     def available(self) -> bool:
-        if self.entity_description.key == KEY_BLE_STATUS:
+        if (
+            self.entity_description.key == KEY_BLE_STATUS
+            or self.entity_description.value_fn
+        ):
             return True
         return super().available
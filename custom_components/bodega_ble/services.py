@@ -0,0 +1,377 @@
+"""Services for the Bodega BLE integration.
+
+Every command service can target several fridges at once, by config entry ID
+or by HA target (entity, device or area). Fridges are commanded concurrently,
+up to ``max_concurrency`` at a time, and each gets its own result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import (
+    DEFAULT_QUEUE_TTL,
+    DEFAULT_SERVICE_CONCURRENCY,
+    DOMAIN,
+    KEY_BATTERY_SAVER,
+    KEY_LOCKED,
+    KEY_POWERED,
+    KEY_RUN_MODE,
+    KEY_START_DELAY,
+    KEY_TEMP_UNIT,
+    MAX_QUEUE_TTL,
+    MAX_SERVICE_CONCURRENCY,
+    SERVICE_APPLY_SETTINGS,
+    SERVICE_DELETE_PROFILE,
+    SERVICE_GET_STATE,
+    SERVICE_SAVE_PROFILE,
+    SERVICE_SET_BATTERY_SAVER,
+    SERVICE_SET_LEFT_TARGET,
+    SERVICE_SET_LOCK,
+    SERVICE_SET_POWER,
+    SERVICE_SET_RIGHT_TARGET,
+    SERVICE_SET_RUN_MODE,
+)
+from .coordinator import BodegaBleCoordinator
+from .exceptions import (
+    BodegaBleInvalidSettingsError,
+    BodegaBleMissingDataError,
+    BodegaBleTargetsFailedError,
+)
+from .settings import DELTA_FIELDS, SETTINGS_FIELDS, TEMPERATURE_FIELDS, ProfileStore
+
+CommandFn = Callable[
+    [BodegaBleCoordinator, ServiceCall], Awaitable[dict[str, Any] | None]
+]
+
+DATA_PROFILES = f"{DOMAIN}_profiles"
+
+RUN_MODES = ("Max", "Eco", "max", "eco", "0", "1")
+BATTERY_SAVER_LEVELS = ("Low", "Mid", "High", "low", "mid", "high", "0", "1", "2")
+
+SETTINGS_SCHEMA: dict[vol.Marker, Any] = {
+    vol.Optional(KEY_LOCKED): cv.boolean,
+    vol.Optional(KEY_POWERED): cv.boolean,
+    vol.Optional(KEY_RUN_MODE): vol.In(RUN_MODES),
+    vol.Optional(KEY_BATTERY_SAVER): vol.In(BATTERY_SAVER_LEVELS),
+    vol.Optional(KEY_TEMP_UNIT): vol.In(("C", "F")),
+    vol.Optional(KEY_START_DELAY): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    **{vol.Optional(key): vol.Coerce(float) for key in TEMPERATURE_FIELDS},
+    **{vol.Optional(key): vol.Coerce(float) for key in DELTA_FIELDS},
+}
+
+TARGET_FIELDS: dict[vol.Marker, Any] = {
+    vol.Optional("entry_id"): vol.All(cv.ensure_list, [cv.string]),
+    **cv.TARGET_SERVICE_FIELDS,
+    vol.Optional("max_concurrency", default=DEFAULT_SERVICE_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_SERVICE_CONCURRENCY)
+    ),
+}
+
+
+def _target_schema(fields: dict[vol.Marker, Any]) -> vol.All:
+    return vol.All(
+        vol.Schema({**TARGET_FIELDS, **fields}),
+        cv.has_at_least_one_key("entry_id", "entity_id", "device_id", "area_id"),
+    )
+
+
+def _command_schema(fields: dict[vol.Marker, Any]) -> vol.All:
+    return _target_schema(
+        {
+            vol.Optional("queue_ttl", default=DEFAULT_QUEUE_TTL): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=MAX_QUEUE_TTL)
+            ),
+            **fields,
+        }
+    )
+
+
+async def _async_get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, BodegaBleCoordinator]:
+    """Resolve the entry IDs and HA targets of a call to coordinators."""
+    coordinators: dict[str, BodegaBleCoordinator] = hass.data.get(DOMAIN, {})
+    selected: dict[str, BodegaBleCoordinator] = {}
+    for entry_id in call.data.get("entry_id", []):
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Unknown entry_id: {entry_id}")
+        selected[entry_id] = coordinators[entry_id]
+    # Targets may reference devices of other integrations; skip those.
+    for entry_id in await async_extract_config_entry_ids(hass, call):
+        if entry_id in coordinators:
+            selected[entry_id] = coordinators[entry_id]
+    if not selected:
+        raise HomeAssistantError("No Bodega fridges match the service target")
+    return selected
+
+
+async def _async_fan_out(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    action: Callable[[BodegaBleCoordinator], Awaitable[dict[str, Any]]],
+) -> dict[str, dict[str, Any]]:
+    """Run an action on every targeted fridge with bounded concurrency."""
+    coordinators = await _async_get_coordinators(hass, call)
+    semaphore = asyncio.Semaphore(call.data["max_concurrency"])
+
+    async def _async_run(coordinator: BodegaBleCoordinator) -> dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await action(coordinator)
+            except (HomeAssistantError, UpdateFailed) as err:
+                return {"success": False, "error": str(err), "state": None}
+        return {"success": True, "error": None, **result}
+
+    outcomes = await asyncio.gather(
+        *(_async_run(coordinator) for coordinator in coordinators.values())
+    )
+    return dict(zip(coordinators, outcomes, strict=True))
+
+
+async def _async_run_command(
+    hass: HomeAssistant, call: ServiceCall, command: CommandFn
+) -> ServiceResponse:
+    """Run a command on every targeted fridge.
+
+    Each result carries the state the fridge reported in the same session,
+    or ``queued`` if the fridge was out of reach.
+    """
+
+    async def _action(coordinator: BodegaBleCoordinator) -> dict[str, Any]:
+        state = await command(coordinator, call)
+        return {"queued": state is None, "state": state}
+
+    results = await _async_fan_out(hass, call, _action)
+
+    if call.return_response:
+        return {"results": results}
+    failed = {
+        entry_id: result["error"]
+        for entry_id, result in results.items()
+        if not result["success"]
+    }
+    if failed:
+        raise BodegaBleTargetsFailedError(
+            translation_placeholders={
+                "failed": "; ".join(f"{k}: {v}" for k, v in failed.items())
+            }
+        )
+    return None
+
+
+async def _async_get_profiles(hass: HomeAssistant) -> ProfileStore:
+    """Return the shared profile store, loading it on first use."""
+    if (profiles := hass.data.get(DATA_PROFILES)) is None:
+        profiles = ProfileStore(hass)
+        await profiles.async_load()
+        hass.data[DATA_PROFILES] = profiles
+    return profiles
+
+
+def _set_left_target(
+    coordinator: BodegaBleCoordinator, call: ServiceCall
+) -> Awaitable[dict[str, Any] | None]:
+    return coordinator.async_set_left_target(
+        call.data["temperature"], call.data["queue_ttl"]
+    )
+
+
+def _set_right_target(
+    coordinator: BodegaBleCoordinator, call: ServiceCall
+) -> Awaitable[dict[str, Any] | None]:
+    return coordinator.async_set_right_target(
+        call.data["temperature"], call.data["queue_ttl"]
+    )
+
+
+def _set_power(
+    coordinator: BodegaBleCoordinator, call: ServiceCall
+) -> Awaitable[dict[str, Any] | None]:
+    return coordinator.async_set_power(call.data["powered"], call.data["queue_ttl"])
+
+
+def _set_lock(
+    coordinator: BodegaBleCoordinator, call: ServiceCall
+) -> Awaitable[dict[str, Any] | None]:
+    return coordinator.async_set_lock(call.data["locked"], call.data["queue_ttl"])
+
+
+def _set_run_mode(
+    coordinator: BodegaBleCoordinator, call: ServiceCall
+) -> Awaitable[dict[str, Any] | None]:
+    return coordinator.async_set_run_mode(call.data["mode"], call.data["queue_ttl"])
+
+
+def _set_battery_saver(
+    coordinator: BodegaBleCoordinator, call: ServiceCall
+) -> Awaitable[dict[str, Any] | None]:
+    return coordinator.async_set_battery_saver(
+        call.data["level"], call.data["queue_ttl"]
+    )
+
+
+def _requested_settings(call: ServiceCall) -> dict[str, Any]:
+    return {key: value for key, value in call.data.items() if key in SETTINGS_FIELDS}
+
+
+COMMAND_SERVICES: dict[str, tuple[CommandFn, vol.All]] = {
+    SERVICE_SET_LEFT_TARGET: (
+        _set_left_target,
+        _command_schema({vol.Required("temperature"): vol.Coerce(float)}),
+    ),
+    SERVICE_SET_RIGHT_TARGET: (
+        _set_right_target,
+        _command_schema({vol.Required("temperature"): vol.Coerce(float)}),
+    ),
+    SERVICE_SET_POWER: (
+        _set_power,
+        _command_schema({vol.Required("powered"): cv.boolean}),
+    ),
+    SERVICE_SET_LOCK: (
+        _set_lock,
+        _command_schema({vol.Required("locked"): cv.boolean}),
+    ),
+    SERVICE_SET_RUN_MODE: (
+        _set_run_mode,
+        _command_schema({vol.Required("mode"): vol.In(RUN_MODES)}),
+    ),
+    SERVICE_SET_BATTERY_SAVER: (
+        _set_battery_saver,
+        _command_schema({vol.Required("level"): vol.In(BATTERY_SAVER_LEVELS)}),
+    ),
+}
+
+
+async def _async_apply_settings(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Apply a profile and/or explicit settings to every targeted fridge."""
+    settings: dict[str, Any] = {}
+    if name := call.data.get("profile"):
+        settings = (await _async_get_profiles(hass)).get(name)
+    settings.update(_requested_settings(call))
+    if not settings:
+        raise BodegaBleInvalidSettingsError(
+            translation_placeholders={"reason": "no settings given"}
+        )
+
+    def _apply(
+        coordinator: BodegaBleCoordinator, call: ServiceCall
+    ) -> Awaitable[dict[str, Any] | None]:
+        return coordinator.async_apply_settings(settings, call.data["queue_ttl"])
+
+    return await _async_run_command(hass, call, _apply)
+
+
+async def _async_save_profile(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Save a profile from a fridge's current settings and/or explicit ones."""
+    settings: dict[str, Any] = {}
+    if entry_id := call.data.get("entry_id"):
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        if not coordinator:
+            raise HomeAssistantError(f"Unknown entry_id: {entry_id}")
+        if not (settings := coordinator.current_settings()):
+            raise BodegaBleMissingDataError(translation_placeholders={"keys": "all"})
+    settings.update(_requested_settings(call))
+    if not settings:
+        raise BodegaBleInvalidSettingsError(
+            translation_placeholders={"reason": "no settings given"}
+        )
+    await (await _async_get_profiles(hass)).async_save(call.data["name"], settings)
+    return {"profile": settings} if call.return_response else None
+
+
+async def _async_get_state(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the cached or, with ``refresh``, freshly read state of fridges."""
+
+    async def _action(coordinator: BodegaBleCoordinator) -> dict[str, Any]:
+        if call.data["refresh"]:
+            return {"state": await coordinator.async_read_state()}
+        return {
+            "state": dict(coordinator.data or {}),
+            "last_update_success": coordinator.last_update_success,
+        }
+
+    return {"results": await _async_fan_out(hass, call, _action)}
+
+
+async def _async_delete_profile(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Delete a saved profile."""
+    await (await _async_get_profiles(hass)).async_delete(call.data["name"])
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+    if not hass.services.has_service(DOMAIN, SERVICE_APPLY_SETTINGS):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_STATE,
+            partial(_async_get_state, hass),
+            schema=_target_schema({vol.Optional("refresh", default=False): cv.boolean}),
+            supports_response=SupportsResponse.ONLY,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_APPLY_SETTINGS,
+            partial(_async_apply_settings, hass),
+            schema=_command_schema(
+                {vol.Optional("profile"): cv.string, **SETTINGS_SCHEMA}
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SAVE_PROFILE,
+            partial(_async_save_profile, hass),
+            schema=vol.Schema(
+                {
+                    vol.Required("name"): cv.string,
+                    vol.Optional("entry_id"): cv.string,
+                    **SETTINGS_SCHEMA,
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_DELETE_PROFILE,
+            partial(_async_delete_profile, hass),
+            schema=vol.Schema({vol.Required("name"): cv.string}),
+        )
+
+    for service_name, (command, schema) in COMMAND_SERVICES.items():
+        if hass.services.has_service(DOMAIN, service_name):
+            continue
+
+        async def _async_handle(
+            call: ServiceCall, command: CommandFn = command
+        ) -> ServiceResponse:
+            return await _async_run_command(hass, call, command)
+
+        hass.services.async_register(
+            DOMAIN,
+            service_name,
+            _async_handle,
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
@@ -0,0 +1,139 @@
+"""Settings fields, validation and named profiles for Bodega BLE fridges.
+
+Every field here is carried by a single Set frame. Temperatures and deltas
+are in Home Assistant's unit system, like the coordinator data.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    KEY_BATTERY_SAVER,
+    KEY_LEFT_RET_DIFF,
+    KEY_LEFT_TARGET,
+    KEY_LEFT_TC_COLD,
+    KEY_LEFT_TC_HALT,
+    KEY_LEFT_TC_HOT,
+    KEY_LEFT_TC_MID,
+    KEY_LOCKED,
+    KEY_POWERED,
+    KEY_RIGHT_RET_DIFF,
+    KEY_RIGHT_TARGET,
+    KEY_RIGHT_TC_COLD,
+    KEY_RIGHT_TC_HALT,
+    KEY_RIGHT_TC_HOT,
+    KEY_RIGHT_TC_MID,
+    KEY_RUN_MODE,
+    KEY_START_DELAY,
+    KEY_TEMP_MAX,
+    KEY_TEMP_MIN,
+    KEY_TEMP_UNIT,
+    PROFILE_STORAGE_VERSION,
+)
+from .exceptions import BodegaBleInvalidSettingsError, BodegaBleUnknownProfileError
+
+TEMPERATURE_FIELDS = (KEY_LEFT_TARGET, KEY_RIGHT_TARGET, KEY_TEMP_MAX, KEY_TEMP_MIN)
+DELTA_FIELDS = (
+    KEY_LEFT_RET_DIFF,
+    KEY_LEFT_TC_HOT,
+    KEY_LEFT_TC_MID,
+    KEY_LEFT_TC_COLD,
+    KEY_LEFT_TC_HALT,
+    KEY_RIGHT_RET_DIFF,
+    KEY_RIGHT_TC_HOT,
+    KEY_RIGHT_TC_MID,
+    KEY_RIGHT_TC_COLD,
+    KEY_RIGHT_TC_HALT,
+)
+RIGHT_ZONE_FIELDS = frozenset(
+    {
+        KEY_RIGHT_TARGET,
+        KEY_RIGHT_RET_DIFF,
+        KEY_RIGHT_TC_HOT,
+        KEY_RIGHT_TC_MID,
+        KEY_RIGHT_TC_COLD,
+        KEY_RIGHT_TC_HALT,
+    }
+)
+SETTINGS_FIELDS = frozenset(
+    {
+        KEY_LOCKED,
+        KEY_POWERED,
+        KEY_RUN_MODE,
+        KEY_BATTERY_SAVER,
+        KEY_TEMP_UNIT,
+        KEY_START_DELAY,
+        *TEMPERATURE_FIELDS,
+        *DELTA_FIELDS,
+    }
+)
+
+
+def validate_settings(updates: dict[str, Any], current: dict[str, Any]) -> None:
+    """Check updates against the device's current settings.
+
+    Right-zone fields need a dual-zone fridge, and both targets must stay
+    within the (possibly updated) min/max range.
+    """
+    if KEY_RIGHT_TARGET not in current and (
+        right := sorted(updates.keys() & RIGHT_ZONE_FIELDS)
+    ):
+        raise BodegaBleInvalidSettingsError(
+            translation_placeholders={
+                "reason": f"single-zone fridge has no {', '.join(right)}"
+            }
+        )
+    merged = {**current, **updates}
+    low, high = merged.get(KEY_TEMP_MIN), merged.get(KEY_TEMP_MAX)
+    if low is None or high is None:
+        return
+    if low > high:
+        raise BodegaBleInvalidSettingsError(
+            translation_placeholders={"reason": f"temp_min {low} above temp_max {high}"}
+        )
+    for key in (KEY_LEFT_TARGET, KEY_RIGHT_TARGET):
+        if key in merged and not low <= merged[key] <= high:
+            raise BodegaBleInvalidSettingsError(
+                translation_placeholders={
+                    "reason": f"{key} {merged[key]} outside {low}..{high}"
+                }
+            )
+
+
+class ProfileStore:
+    """Named settings profiles shared by every fridge."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, PROFILE_STORAGE_VERSION, f"{DOMAIN}.profiles"
+        )
+        self._profiles: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load saved profiles."""
+        stored = await self._store.async_load() or {}
+        self._profiles = stored.get("profiles", {})
+
+    def get(self, name: str) -> dict[str, Any]:
+        """Return the settings of a profile."""
+        if name not in self._profiles:
+            raise BodegaBleUnknownProfileError(translation_placeholders={"name": name})
+        return dict(self._profiles[name])
+
+    async def async_save(self, name: str, settings: dict[str, Any]) -> None:
+        """Create or replace a profile."""
+        self._profiles[name] = {
+            key: value for key, value in settings.items() if key in SETTINGS_FIELDS
+        }
+        await self._store.async_save({"profiles": self._profiles})
+
+    async def async_delete(self, name: str) -> None:
+        """Delete a profile."""
+        if self._profiles.pop(name, None) is None:
+            raise BodegaBleUnknownProfileError(translation_placeholders={"name": name})
+        await self._store.async_save({"profiles": self._profiles})
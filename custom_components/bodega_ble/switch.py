@@ -132,9 +132,7 @@ class BodegaBleSwitch(CoordinatorEntity[BodegaBleCoordinator], SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self.entity_description.turn_on_fn(self.coordinator)
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self.entity_description.turn_off_fn(self.coordinator)
-        await self.coordinator.async_request_refresh()
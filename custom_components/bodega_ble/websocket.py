@@ -0,0 +1,267 @@
+"""WebSocket API for Bodega BLE telemetry.
+
+Dashboards can follow a fridge without going through entity states or the
+recorder:
+
+``bodega_ble/telemetry/subscribe``
+    Sends the selected fields once, then only the fields that changed, as
+    the coordinator receives them. ``min_interval`` limits how often a
+    subscriber is sent an event; changes in between are coalesced into the
+    next one. When the entry unloads, including on a reload after an
+    options change, the subscription ends with an ``entry_unloaded`` error
+    and the client has to subscribe again.
+
+``bodega_ble/telemetry/history``
+    Returns recent history from the coordinator's in-memory buffer, as raw
+    points, LTTB-downsampled points or min/max/mean buckets.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    KEY_BLE_STATUS,
+    KEY_LEFT_TARGET,
+    KEY_RIGHT_TARGET,
+    MAX_HISTORY_POINTS,
+    MAX_SUBSCRIPTION_INTERVAL,
+)
+from .coordinator import BodegaBleCoordinator
+from .history import HISTORY_FIELDS
+from .parser import ADVERTISEMENT_KEYS
+
+TELEMETRY_FIELDS = (
+    *ADVERTISEMENT_KEYS,
+    KEY_LEFT_TARGET,
+    KEY_RIGHT_TARGET,
+    KEY_BLE_STATUS,
+)
+
+ERR_ENTRY_UNLOADED = "entry_unloaded"
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the telemetry WebSocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_telemetry)
+    websocket_api.async_register_command(hass, ws_telemetry_history)
+
+
+@callback
+def async_end_subscriptions(hass: HomeAssistant, entry_id: str) -> None:
+    """End the telemetry subscriptions of an entry that is unloading."""
+    async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry_id))
+
+
+def _get_coordinator(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> BodegaBleCoordinator | None:
+    """Return the coordinator of the message's entry, or send an error."""
+    coordinator = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"Unknown entry_id: {msg['entry_id']}",
+        )
+    return coordinator
+
+
+class _TelemetrySubscription:
+    """Send one subscriber the changed fields of a coordinator, rate limited."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entry_id: str,
+        coordinator: BodegaBleCoordinator,
+        fields: tuple[str, ...],
+        min_interval: float,
+    ) -> None:
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._entry_id = entry_id
+        self._coordinator = coordinator
+        self._fields = fields
+        self._min_interval = min_interval
+        self._sent: dict[str, Any] = {}
+        self._pending: dict[str, Any] = {}
+        self._last_send: float | None = None
+        self._unsub_listener: CALLBACK_TYPE | None = None
+        self._unsub_unload: CALLBACK_TYPE | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Send the current values and follow the coordinator."""
+        data = self._coordinator.data or {}
+        self._pending = {field: data[field] for field in self._fields if field in data}
+        self._send()
+        self._unsub_listener = self._coordinator.async_add_listener(
+            self._async_on_update
+        )
+        self._unsub_unload = async_dispatcher_connect(
+            self._hass,
+            SIGNAL_ENTRY_UNLOADED.format(self._entry_id),
+            self._async_on_unload,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the coordinator."""
+        if self._unsub_listener is not None:
+            self._unsub_listener()
+            self._unsub_listener = None
+        if self._unsub_unload is not None:
+            self._unsub_unload()
+            self._unsub_unload = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_on_unload(self) -> None:
+        """End the subscription; the coordinator it follows is discarded."""
+        self.async_stop()
+        self._connection.subscriptions.pop(self._msg_id, None)
+        self._connection.send_error(
+            self._msg_id,
+            ERR_ENTRY_UNLOADED,
+            f"Entry {self._entry_id} was unloaded; subscribe again",
+        )
+
+    @callback
+    def _async_on_update(self) -> None:
+        data = self._coordinator.data or {}
+        for field in self._fields:
+            value = data.get(field)
+            if field in self._sent or value is not None:
+                if self._sent.get(field) != value:
+                    self._pending[field] = value
+                else:
+                    self._pending.pop(field, None)
+        if not self._pending or self._unsub_timer is not None:
+            return
+        wait = (
+            0.0
+            if self._last_send is None
+            else self._last_send + self._min_interval - time.monotonic()
+        )
+        if wait > 0:
+            self._unsub_timer = async_call_later(
+                self._hass, wait, self._async_send_later
+            )
+        else:
+            self._send()
+
+    @callback
+    def _async_send_later(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        if self._pending:
+            self._send()
+
+    def _send(self) -> None:
+        self._connection.send_message(
+            websocket_api.event_message(
+                self._msg_id, {"time": time.time(), "values": self._pending}
+            )
+        )
+        self._sent.update(self._pending)
+        self._pending = {}
+        self._last_send = time.monotonic()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/telemetry/subscribe",
+        vol.Required("entry_id"): cv.string,
+        vol.Optional("fields", default=list(TELEMETRY_FIELDS)): vol.All(
+            cv.ensure_list, [vol.In(TELEMETRY_FIELDS)]
+        ),
+        vol.Optional("min_interval", default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_SUBSCRIPTION_INTERVAL)
+        ),
+    }
+)
+@callback
+def ws_subscribe_telemetry(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Stream the changed telemetry fields of a fridge."""
+    if (coordinator := _get_coordinator(hass, connection, msg)) is None:
+        return
+    subscription = _TelemetrySubscription(
+        hass,
+        connection,
+        msg["id"],
+        msg["entry_id"],
+        coordinator,
+        tuple(dict.fromkeys(msg["fields"])),
+        msg["min_interval"],
+    )
+    connection.subscriptions[msg["id"]] = subscription.async_stop
+    connection.send_result(msg["id"])
+    subscription.async_start()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/telemetry/history",
+        vol.Required("entry_id"): cv.string,
+        vol.Optional("fields", default=list(HISTORY_FIELDS)): vol.All(
+            cv.ensure_list, [vol.In(HISTORY_FIELDS)]
+        ),
+        vol.Optional("start"): vol.Coerce(float),
+        vol.Optional("end"): vol.Coerce(float),
+        vol.Exclusive("points", "resolution"): vol.All(
+            vol.Coerce(int), vol.Range(min=3, max=MAX_HISTORY_POINTS)
+        ),
+        vol.Exclusive("buckets", "resolution"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_HISTORY_POINTS)
+        ),
+    }
+)
+@callback
+def ws_telemetry_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return recent history of a fridge from memory.
+
+    Fields are returned as [timestamp, value] points, or as buckets when
+    "buckets" is given.
+    """
+    if (coordinator := _get_coordinator(hass, connection, msg)) is None:
+        return
+    history = coordinator.history
+    start, end = msg.get("start"), msg.get("end")
+    result: dict[str, list[Any]] = {}
+    for field in msg["fields"]:
+        if "buckets" in msg:
+            result[field] = [
+                asdict(bucket)
+                for bucket in history.buckets(field, msg["buckets"], start, end)
+            ]
+        elif "points" in msg:
+            result[field] = history.downsample(field, msg["points"], start, end)
+        else:
+            result[field] = history.series(field, start, end)
+    connection.send_result(msg["id"], {"fields": result})
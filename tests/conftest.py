@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
@@ -59,6 +59,21 @@ def enable_bluetooth() -> None:
         yield
 
 
+@pytest.fixture
+def mock_ble_lookup() -> MagicMock:
+    """Resolve the fridge through a single fallback BLEDevice lookup."""
+    with (
+        patch(
+            "custom_components.bodega_ble.coordinator.async_scanner_devices_by_address",
+            return_value=[],
+        ),
+        patch(
+            "custom_components.bodega_ble.coordinator.async_ble_device_from_address",
+        ) as mock_lookup,
+    ):
+        yield mock_lookup
+
+
 @pytest.fixture
 def mock_config_entry() -> MockConfigEntry:
     """Create a mock config entry."""
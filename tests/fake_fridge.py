@@ -0,0 +1,241 @@
+"""Simulated Bodega fridge for tests and benchmarks.
+
+FakeFridge keeps a fridge's state as the data bytes of its status frame and
+answers command frames the way the firmware does. FakeBleakClient exposes it
+through the BleakClient calls the coordinator makes, and FridgeFaults makes
+the link misbehave. Patch the coordinator's establish_connection with
+FakeFridge.establish_connection and have the device lookup return
+FakeFridge.ble_device.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
+
+from custom_components.bodega_ble.const import (
+    CHAR_NOTIFY_UUID,
+    CHAR_WRITE_UUID,
+    CMD_BIND,
+    CMD_QUERY,
+    CMD_SET,
+    CMD_SET_UNIT1_TARGET,
+    CMD_SET_UNIT2_TARGET,
+    KEY_BATTERY_PERCENT,
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_TARGET,
+    KEY_LOCKED,
+    KEY_POWERED,
+    KEY_RIGHT_CURRENT,
+    KEY_RIGHT_TARGET,
+    KEY_TEMP_UNIT,
+)
+
+SINGLE_ZONE_DATA = bytes([0, 1, 0, 1, 5, 10, 0xEC, 2, 3, 0, 3, 2, 1, 0, 6, 100, 12, 8])
+DUAL_ZONE_DATA = SINGLE_ZONE_DATA + bytes([0xF6, 0, 0, 2, 3, 2, 1, 0, 0xF8, 1])
+
+# Data offset and signedness of the fields tests read and write by key.
+_FIELDS = {
+    KEY_LOCKED: (0x00, False),
+    KEY_POWERED: (0x01, False),
+    KEY_LEFT_TARGET: (0x04, True),
+    KEY_TEMP_UNIT: (0x09, False),
+    KEY_LEFT_CURRENT: (0x0E, True),
+    KEY_BATTERY_PERCENT: (0x0F, False),
+    KEY_RIGHT_TARGET: (0x12, True),
+    KEY_RIGHT_CURRENT: (0x1A, True),
+}
+# A Set frame body carries the left zone settings at their status offsets,
+# followed by the eight right zone bytes that sit at 0x12 in a status frame.
+_SET_LEFT_ZONE = 0x0E
+_SET_RIGHT_ZONE = 0x0E
+_STATUS_RIGHT_ZONE = 0x12
+
+
+def encode_frame(body: bytes, doubled: bool = False) -> bytes:
+    """Frame a command body, optionally with a doubled checksum."""
+    frame = bytearray([0xFE, 0xFE, len(body) + 2])
+    frame.extend(body)
+    checksum = sum(frame) * (2 if doubled else 1) & 0xFFFF
+    frame.extend(checksum.to_bytes(2, "big"))
+    return bytes(frame)
+
+
+@dataclass
+class FridgeFaults:
+    """Ways the simulated link can misbehave; the defaults are a clean link."""
+
+    connect_latency: float = 0.0
+    response_latency: float = 0.0
+    # Raised by establish_connection instead of connecting.
+    connect_error: BaseException | None = None
+    # Probability that a reply is never sent.
+    packet_loss: float = 0.0
+    # Split replies into notifications of at most this many bytes.
+    fragment_size: int | None = None
+    doubled_checksum: bool = False
+    # Drop the connection when this many frames have been written to it.
+    disconnect_after_writes: int | None = None
+
+
+class FakeFridge:
+    """A fridge answering Bind, Query, Set and the unit target commands."""
+
+    def __init__(
+        self,
+        address: str = "AA:BB:CC:DD:EE:FF",
+        dual_zone: bool = False,
+        faults: FridgeFaults | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.address = address
+        self.data = bytearray(DUAL_ZONE_DATA if dual_zone else SINGLE_ZONE_DATA)
+        self.faults = faults or FridgeFaults()
+        self.ble_device = BLEDevice(address, "WT-FAKE", None)
+        self.bound = False
+        self.connects = 0
+        self.received: list[bytes] = []
+        self.client: FakeBleakClient | None = None
+        self._random = random.Random(seed)
+
+    @property
+    def dual_zone(self) -> bool:
+        return len(self.data) >= 0x1C
+
+    def __getitem__(self, key: str) -> int:
+        offset, signed = _FIELDS[key]
+        value = self.data[offset]
+        return value - 0x100 if signed and value > 0x7F else value
+
+    def __setitem__(self, key: str, value: int) -> None:
+        offset, _ = _FIELDS[key]
+        self.data[offset] = value & 0xFF
+
+    def status_frame(self, command: int = CMD_QUERY) -> bytes:
+        """Return the status frame the fridge would notify."""
+        return encode_frame(
+            bytes([command]) + self.data, doubled=self.faults.doubled_checksum
+        )
+
+    def handle(self, frame: bytes) -> bytes | None:
+        """Apply a frame written to the fridge and return its reply, if any."""
+        self.received.append(frame)
+        if (
+            len(frame) < 6
+            or frame[:2] != b"\xfe\xfe"
+            or frame[2] + 3 != len(frame)
+            or int.from_bytes(frame[-2:], "big") != sum(frame[:-2]) & 0xFFFF
+        ):
+            return None
+        command, body = frame[3], frame[4:-2]
+        if command == CMD_BIND:
+            self.bound = True
+        elif command == CMD_QUERY:
+            return self.status_frame()
+        elif command == CMD_SET:
+            self._apply_set(body)
+            return self.status_frame(CMD_SET)
+        elif command == CMD_SET_UNIT1_TARGET and body:
+            self.data[0x04] = body[0]
+        elif command == CMD_SET_UNIT2_TARGET and body and self.dual_zone:
+            self.data[_STATUS_RIGHT_ZONE] = body[0]
+        return None
+
+    def _apply_set(self, body: bytes) -> None:
+        self.data[:_SET_LEFT_ZONE] = body[:_SET_LEFT_ZONE]
+        right = body[_SET_RIGHT_ZONE : _SET_RIGHT_ZONE + 8]
+        if self.dual_zone and len(right) == 8:
+            self.data[_STATUS_RIGHT_ZONE : _STATUS_RIGHT_ZONE + 8] = right
+
+    def lose_packet(self) -> bool:
+        """Return True if the next reply should be dropped."""
+        return self._random.random() < self.faults.packet_loss
+
+    async def establish_connection(
+        self, _client_class: type, _device: BLEDevice, _name: str, **_: Any
+    ) -> FakeBleakClient:
+        """Stand in for bleak_retry_connector.establish_connection."""
+        await asyncio.sleep(self.faults.connect_latency)
+        if self.faults.connect_error is not None:
+            raise self.faults.connect_error
+        self.connects += 1
+        self.client = FakeBleakClient(self)
+        return self.client
+
+
+class _FakeServices:
+    """The service collection of a fridge, holding only its characteristics."""
+
+    def get_characteristic(self, uuid: str) -> str | None:
+        return uuid if uuid in (CHAR_WRITE_UUID, CHAR_NOTIFY_UUID) else None
+
+
+class FakeBleakClient:
+    """A connection to a FakeFridge."""
+
+    def __init__(self, fridge: FakeFridge) -> None:
+        self._fridge = fridge
+        self.services = _FakeServices()
+        self.is_connected = True
+        self.writes = 0
+        self._handler: Callable[[int, bytearray], None] | None = None
+        self._pending: list[asyncio.TimerHandle] = []
+
+    async def start_notify(
+        self, _char: Any, handler: Callable[[int, bytearray], None]
+    ) -> None:
+        self._require_connected()
+        self._handler = handler
+
+    async def stop_notify(self, _char: Any) -> None:
+        self._require_connected()
+        self._handler = None
+
+    async def write_gatt_char(self, _char: Any, data: bytes, response: bool) -> None:
+        self._require_connected()
+        self.writes += 1
+        faults = self._fridge.faults
+        if (
+            faults.disconnect_after_writes is not None
+            and self.writes >= faults.disconnect_after_writes
+        ):
+            self._drop()
+            raise BleakError("Disconnected")
+        reply = self._fridge.handle(bytes(data))
+        if reply is None or self._fridge.lose_packet():
+            return
+        size = faults.fragment_size or len(reply)
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(reply), size):
+            self._pending.append(
+                loop.call_later(
+                    faults.response_latency, self._notify, reply[start : start + size]
+                )
+            )
+
+    async def disconnect(self) -> bool:
+        self._drop()
+        return True
+
+    async def clear_cache(self) -> bool:
+        return True
+
+    def _notify(self, payload: bytes) -> None:
+        if self.is_connected and self._handler is not None:
+            self._handler(0, bytearray(payload))
+
+    def _drop(self) -> None:
+        self.is_connected = False
+        for handle in self._pending:
+            handle.cancel()
+        self._pending.clear()
+
+    def _require_connected(self) -> None:
+        if not self.is_connected:
+            raise BleakError("Not connected")
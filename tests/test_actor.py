@@ -0,0 +1,106 @@
+"""Tests for the Bodega BLE device actor."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bleak import BleakError
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.actor import ActorState, DeviceActor
+from custom_components.bodega_ble.exceptions import BodegaBleShutdownError
+
+
+def _actor(hass: HomeAssistant, linger: float = 0) -> DeviceActor:
+    client = MagicMock(is_connected=True)
+    return DeviceActor(
+        hass,
+        "test actor",
+        AsyncMock(return_value=client),
+        AsyncMock(),
+        linger=linger,
+    )
+
+
+class TestDeviceActor:
+    """Tests for DeviceActor."""
+
+    async def test_queued_jobs_share_a_session(self, hass: HomeAssistant) -> None:
+        """Test that jobs waiting during a session reuse its connection."""
+        actor = _actor(hass)
+
+        results = await asyncio.gather(
+            actor.async_run(AsyncMock(return_value=1)),
+            actor.async_run(AsyncMock(return_value=2)),
+            actor.async_run(AsyncMock(return_value=3)),
+        )
+
+        assert results == [1, 2, 3]
+        actor._connect.assert_awaited_once()
+        actor._release.assert_awaited_once()
+        assert actor.as_dict()["jobs_on_open_session"] == 2
+        assert actor.wait_latency.count == 3
+        assert actor.state is ActorState.IDLE
+
+    async def test_linger_keeps_the_connection(self, hass: HomeAssistant) -> None:
+        """Test that a job shortly after another skips reconnecting."""
+        actor = _actor(hass, linger=1)
+
+        await actor.async_run(AsyncMock())
+        assert actor.state is ActorState.SESSION
+        await actor.async_run(AsyncMock())
+
+        actor._connect.assert_awaited_once()
+        actor._release.assert_not_awaited()
+        actor.async_stop()
+        await actor.async_wait_stopped(1)
+        actor._release.assert_awaited_once()
+
+    async def test_failed_job_ends_the_session(self, hass: HomeAssistant) -> None:
+        """Test that an error reaches the caller and forces a reconnect."""
+        actor = _actor(hass, linger=1)
+        error = BleakError("ATT error 0x0e")
+
+        with pytest.raises(BleakError):
+            await actor.async_run(AsyncMock(side_effect=error))
+        await actor.async_run(AsyncMock())
+
+        assert actor._connect.await_count == 2
+        assert actor._release.await_args_list[0].args[1] is error
+        actor.async_stop()
+
+    async def test_connect_failure_reaches_caller(self, hass: HomeAssistant) -> None:
+        """Test that a failed connect fails only the job that needed it."""
+        actor = _actor(hass)
+        actor._connect.side_effect = [TimeoutError, MagicMock(is_connected=True)]
+
+        with pytest.raises(TimeoutError):
+            await actor.async_run(AsyncMock())
+        assert await actor.async_run(AsyncMock(return_value="ok")) == "ok"
+
+        assert actor._connect.await_count == 2
+
+    async def test_stop_cancels_running_job(self, hass: HomeAssistant) -> None:
+        """Test that stopping cancels the running job and fails all callers."""
+        actor = _actor(hass)
+        started = asyncio.Event()
+
+        async def _hung(_client: MagicMock) -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        running = asyncio.ensure_future(actor.async_run(_hung))
+        waiting = asyncio.ensure_future(actor.async_run(AsyncMock()))
+        await started.wait()
+        actor.async_stop()
+        await actor.async_wait_stopped(1)
+
+        assert actor.state is ActorState.STOPPED
+        actor._release.assert_awaited_once()
+        for caller in (running, waiting):
+            with pytest.raises(BodegaBleShutdownError):
+                await caller
+        with pytest.raises(BodegaBleShutdownError):
+            await actor.async_run(AsyncMock())
@@ -0,0 +1,177 @@
+"""Tests for the Bodega BLE alert engine."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.bluetooth import BluetoothChange
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.bodega_ble.alerts import (
+    ALERT_FREEZER_EXCURSION,
+    ALERT_FRIDGE_EXCURSION,
+    ALERT_LOW_VOLTAGE,
+    ALERT_STALE,
+    AlertEngine,
+    AlertRules,
+    AlertTransition,
+)
+from custom_components.bodega_ble.const import (
+    CONF_LOW_VOLTAGE,
+    CONF_STALE_AFTER,
+    DOMAIN,
+    EVENT_ALERT,
+    KEY_BATTERY_VOLTAGE,
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_TARGET,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+
+COORDINATOR = "custom_components.bodega_ble.coordinator"
+RULES = AlertRules(
+    excursion_margin=2.0, excursion_duration=600, stale_after=1800, low_voltage=11.5
+)
+
+
+def _zone(current: float, target: float = 4.0) -> dict[str, float]:
+    return {KEY_LEFT_CURRENT: current, KEY_LEFT_TARGET: target}
+
+
+class TestAlertEngine:
+    """Tests for AlertEngine."""
+
+    def test_excursion_needs_duration(self) -> None:
+        """Test that a zone must stay above target plus margin long enough."""
+        engine = AlertEngine(RULES)
+
+        assert engine.evaluate(0, _zone(7.0)) == []
+        assert engine.evaluate(300, _zone(7.0)) == []
+        assert engine.evaluate(600, _zone(7.5)) == [
+            AlertTransition(ALERT_FRIDGE_EXCURSION, True, 7.5)
+        ]
+        assert engine.evaluate(660, _zone(8.0)) == []
+        assert engine.evaluate(720, _zone(5.0)) == [
+            AlertTransition(ALERT_FRIDGE_EXCURSION, False, 5.0)
+        ]
+        assert not engine.is_active(ALERT_FRIDGE_EXCURSION)
+
+    def test_short_excursion_restarts(self) -> None:
+        """Test that dropping back below the threshold resets the delay."""
+        engine = AlertEngine(RULES)
+
+        engine.evaluate(0, _zone(7.0))
+        engine.evaluate(500, _zone(5.0))
+        assert engine.evaluate(700, _zone(7.0)) == []
+        assert engine.evaluate(1300, _zone(7.0))[0].active
+
+    def test_missing_readings_keep_state(self) -> None:
+        """Test that rules without readings in the data are left alone."""
+        engine = AlertEngine(RULES)
+        engine.evaluate(0, {KEY_BATTERY_VOLTAGE: 11.0})
+
+        assert engine.evaluate(60, {KEY_LEFT_CURRENT: 9.0}) == []
+        assert engine.is_active(ALERT_LOW_VOLTAGE)
+        assert not engine.is_active(ALERT_FREEZER_EXCURSION)
+
+    def test_stale(self) -> None:
+        """Test that the stale alert is raised by checks and cleared by data."""
+        engine = AlertEngine(RULES)
+        assert engine.check_stale(5000) == []
+
+        engine.evaluate(0, {})
+        assert engine.check_stale(1000) == []
+        assert engine.check_stale(1800) == [AlertTransition(ALERT_STALE, True, None)]
+        assert engine.check_stale(2000) == []
+        assert engine.evaluate(2100, {}) == [AlertTransition(ALERT_STALE, False, None)]
+
+    def test_disabled_rules(self) -> None:
+        """Test that rules set to 0 never raise alerts."""
+        engine = AlertEngine(AlertRules())
+
+        assert AlertRules().enabled == ()
+        assert engine.evaluate(0, {**_zone(30.0), KEY_BATTERY_VOLTAGE: 1.0}) == []
+        assert engine.evaluate(10**6, _zone(30.0)) == []
+        assert engine.check_stale(10**7) == []
+        assert RULES.enabled == (
+            ALERT_FRIDGE_EXCURSION,
+            ALERT_FREEZER_EXCURSION,
+            ALERT_STALE,
+            ALERT_LOW_VOLTAGE,
+        )
+
+
+async def test_coordinator_fires_events_on_transitions(hass: HomeAssistant) -> None:
+    """Test that events and alert listeners follow transitions only."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"address": "AA:BB:CC:DD:EE:FF"},
+        options={CONF_LOW_VOLTAGE: 11.5, CONF_STALE_AFTER: 30},
+    )
+    coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+    events = async_capture_events(hass, EVENT_ALERT)
+    listener = MagicMock()
+    coordinator.async_add_alert_listener(listener)
+
+    for voltage in (12.0, 11.2, 11.0, 12.1):
+        coordinator._async_record_telemetry({KEY_BATTERY_VOLTAGE: voltage})
+    await hass.async_block_till_done()
+
+    assert [(event.data["alert"], event.data["active"]) for event in events] == [
+        (ALERT_LOW_VOLTAGE, True),
+        (ALERT_LOW_VOLTAGE, False),
+    ]
+    assert events[0].data["value"] == 11.2
+    assert events[0].data["entry_id"] == entry.entry_id
+    assert listener.call_count == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=31))
+    await hass.async_block_till_done()
+    coordinator.async_stop()
+
+    assert events[-1].data["alert"] == ALERT_STALE
+    assert events[-1].data["active"]
+    assert coordinator.alerts.is_active(ALERT_STALE)
+
+
+async def test_stale_while_polls_fail_and_adverts_arrive(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_ble_lookup,
+    valid_notify_payload_single_zone: bytes,
+) -> None:
+    """Test that adverts and failed polls without telemetry do not count."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"address": "AA:BB:CC:DD:EE:FF"},
+        options={CONF_STALE_AFTER: 30},
+    )
+    coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+    with patch(f"{COORDINATOR}.async_register_callback") as mock_register:
+        coordinator.async_start()
+    advertisement_callback = mock_register.call_args[0][1]
+    service_info = MagicMock(manufacturer_data={}, service_data={}, rssi=-60)
+    assert coordinator.async_apply_frame(valid_notify_payload_single_zone)
+
+    for _ in range(7):
+        freezer.tick(timedelta(minutes=5))
+        with (
+            patch(f"{COORDINATOR}.establish_connection", side_effect=TimeoutError),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_update_data()
+        advertisement_callback(service_info, BluetoothChange.ADVERTISEMENT)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    coordinator.async_stop()
+
+    assert coordinator.alerts.is_active(ALERT_STALE)
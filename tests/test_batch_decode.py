@@ -0,0 +1,185 @@
+"""Tests for the Bodega BLE batch decoder."""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from custom_components.bodega_ble.batch_decode import (
+    COLUMN_DEVICE,
+    COLUMN_OUTCOME,
+    COLUMN_TIMESTAMP,
+    DecodedFrames,
+    decode_capture,
+    decode_frames,
+    iter_capture,
+    main,
+)
+from custom_components.bodega_ble.capture import (
+    CAPTURE_HEADER,
+    RECORD_HEADER,
+    FrameDirection,
+    device_id,
+)
+from custom_components.bodega_ble.const import (
+    CMD_QUERY,
+    FRAME_QUERY,
+    KEY_BATTERY_PERCENT,
+    KEY_LEFT_CURRENT,
+    KEY_RIGHT_CURRENT,
+)
+from custom_components.bodega_ble.parser import FrameOutcome, decode_frame
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def _frame(data: bytes, cmd: int = CMD_QUERY, doubled: bool = False) -> bytes:
+    frame = bytearray([0xFE, 0xFE, len(data) + 3, cmd])
+    frame.extend(data)
+    checksum = sum(frame) * (2 if doubled else 1) & 0xFFFF
+    frame.extend(checksum.to_bytes(2, "big"))
+    return bytes(frame)
+
+
+def _row(decoded: DecodedFrames, row: int) -> dict[str, Any]:
+    """Return the fields of one row as parse_notify_payload would."""
+    return {
+        name: values[row].item()
+        for name, values in decoded.columns.items()
+        if name in decoded.valid and decoded.valid[name][row]
+    }
+
+
+@pytest.fixture
+def frames(
+    valid_notify_payload_single_zone: bytes,
+    valid_notify_payload_dual_zone: bytes,
+    invalid_checksum_payload: bytes,
+) -> list[bytes]:
+    """Return frames covering every decode outcome."""
+    single_data = valid_notify_payload_single_zone[4:-2]
+    dual_data = valid_notify_payload_dual_zone[4:-2]
+    corrupted = bytearray(valid_notify_payload_dual_zone)
+    corrupted[10] ^= 0xFF
+    return [
+        valid_notify_payload_single_zone,
+        valid_notify_payload_dual_zone,
+        _frame(single_data, doubled=True),
+        _frame(
+            bytes([0, 1, 7, 9, 0xEC, 10, 0, 2, 3, 1, 0, 0, 0, 0, 0x80, 0x7F, 24, 0])
+        ),
+        _frame(bytes([0, 1, 0, 1, 5, 10, 0, 2, 3, 0, 0, 0, 0, 0, 0x05, 50, 23, 5])),
+        _frame(dual_data, cmd=0x09),
+        _frame(single_data[:-1]),
+        bytes(corrupted),
+        b"\xfd" + valid_notify_payload_single_zone[1:],
+        invalid_checksum_payload,
+        FRAME_QUERY[:4],
+        b"",
+    ]
+
+
+class TestDecodeFrames:
+    """Tests for vectorized decoding."""
+
+    def test_matches_decode_frame(self, frames: list[bytes]) -> None:
+        """Test that every frame decodes exactly as decode_frame does."""
+        decoded = decode_frames(frames)
+
+        assert len(decoded) == len(frames)
+        for row, frame in enumerate(frames):
+            outcome, parsed = decode_frame(frame)
+            assert decoded.columns[COLUMN_OUTCOME][row] == outcome
+            assert _row(decoded, row) == parsed, frame.hex()
+        assert set(decoded.columns[COLUMN_OUTCOME]) == set(FrameOutcome)
+
+    def test_missing_values_are_masked(
+        self, valid_notify_payload_single_zone: bytes
+    ) -> None:
+        """Test that single-zone frames leave the right zone masked."""
+        decoded = decode_frames([valid_notify_payload_single_zone])
+
+        assert decoded.valid[KEY_LEFT_CURRENT][0]
+        assert not decoded.valid[KEY_RIGHT_CURRENT][0]
+        assert decoded.columns[KEY_LEFT_CURRENT].dtype.name == "int8"
+
+
+class TestDecodeCapture:
+    """Tests for decoding capture files."""
+
+    @pytest.fixture
+    def capture(
+        self,
+        tmp_path: Path,
+        valid_notify_payload_single_zone: bytes,
+        valid_notify_payload_dual_zone: bytes,
+    ) -> Path:
+        data = bytearray(CAPTURE_HEADER)
+        for timestamp, direction, frame in (
+            (10.0, FrameDirection.TX, FRAME_QUERY),
+            (10.25, FrameDirection.RX, valid_notify_payload_single_zone),
+            (20.5, FrameDirection.RX, valid_notify_payload_dual_zone),
+        ):
+            data += RECORD_HEADER.pack(
+                timestamp, direction, device_id(ADDRESS), len(frame)
+            )
+            data += frame
+        path = tmp_path / "fridge.bdgcap"
+        path.write_bytes(data)
+        return path
+
+    def test_received_frames_become_rows(self, capture: Path) -> None:
+        """Test that only RX frames are decoded, with their time and device."""
+        decoded = decode_capture(str(capture))
+
+        assert decoded.columns[COLUMN_TIMESTAMP].tolist() == [10.25, 20.5]
+        assert decoded.columns[COLUMN_DEVICE].tolist() == ["aabbccddeeff"] * 2
+        assert decoded.columns[KEY_RIGHT_CURRENT].tolist()[1] == -25
+
+    def test_decoded_in_chunks(self, capture: Path) -> None:
+        """Test that frames are decoded a chunk at a time."""
+        chunks = list(iter_capture(str(capture), chunk=1))
+
+        assert [len(chunk) for chunk in chunks] == [1, 1]
+        assert chunks[1].columns[COLUMN_TIMESTAMP].tolist() == [20.5]
+        assert len(decode_capture(str(capture))) == 2
+
+    def test_empty_capture_has_columns(self, tmp_path: Path) -> None:
+        """Test that a capture without frames still yields typed columns."""
+        path = tmp_path / "empty.bdgcap"
+        path.write_bytes(CAPTURE_HEADER)
+
+        (chunk,) = iter_capture(str(path))
+        assert len(chunk) == 0
+        assert chunk.columns[KEY_LEFT_CURRENT].dtype.name == "int8"
+
+    def test_cli_writes_csv(self, capture: Path, tmp_path: Path) -> None:
+        """Test that the CLI writes one CSV per capture with empty missing cells."""
+        output = tmp_path / "decoded"
+
+        assert (
+            main([str(capture), "--output", str(output), "--workers", "1", "-c", "1"])
+            == 0
+        )
+
+        with open(output / "fridge.csv", newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        assert [row[COLUMN_OUTCOME] for row in rows] == ["ok", "ok"]
+        assert rows[0][KEY_LEFT_CURRENT] == "-5"
+        assert rows[0][KEY_RIGHT_CURRENT] == ""
+        assert rows[1][KEY_BATTERY_PERCENT] == "100"
+
+    def test_cli_writes_parquet(self, capture: Path, tmp_path: Path) -> None:
+        """Test Parquet output when pyarrow is installed."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output = tmp_path / "decoded"
+
+        main([str(capture), "-o", str(output), "-f", "parquet", "-w", "1", "-c", "1"])
+
+        parquet = pq.ParquetFile(output / "fridge.parquet")
+        assert parquet.num_row_groups == 2
+        table = parquet.read()
+        assert table.column(KEY_RIGHT_CURRENT).to_pylist() == [None, -25]
@@ -0,0 +1,146 @@
+"""Tests for Bodega BLE raw frame capture."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.capture import (
+    CAPTURE_HEADER,
+    RECORD_HEADER,
+    CaptureReader,
+    CaptureRecord,
+    FrameCapture,
+    FrameDirection,
+    InvalidCaptureError,
+    device_id,
+)
+from custom_components.bodega_ble.const import FRAME_QUERY
+from custom_components.bodega_ble.parser import FrameOutcome
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+class TestFrameCapture:
+    """Tests for FrameCapture."""
+
+    def test_ring_buffer_is_bounded(self, hass: HomeAssistant) -> None:
+        """Test that only the newest frames are kept."""
+        capture = FrameCapture(hass, ADDRESS, size=2)
+        capture.record_tx(FRAME_QUERY)
+        capture.record_rx(b"\x01", FrameOutcome.SHORT_FRAME)
+        capture.record_rx(b"\x02", FrameOutcome.SHORT_FRAME)
+
+        frames = capture.as_dict()["frames"]
+        assert [frame["hex"] for frame in frames] == ["01", "02"]
+        assert frames[0]["direction"] == "rx"
+        assert frames[0]["outcome"] == "short_frame"
+        assert capture.as_dict()["rx_outcomes"] == {"short_frame": 2}
+
+    async def test_file_records(
+        self,
+        hass: HomeAssistant,
+        tmp_path: Path,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that frames are appended to the capture file on flush."""
+        path = tmp_path / "captures" / "fridge.bdgcap"
+        capture = FrameCapture(hass, ADDRESS, str(path), clock=lambda: 1000.5)
+        capture.record_tx(FRAME_QUERY)
+        capture.record_rx(valid_notify_payload_single_zone, FrameOutcome.OK)
+        await capture.async_stop()
+
+        data = path.read_bytes()
+        assert data.startswith(CAPTURE_HEADER)
+        offset = len(CAPTURE_HEADER)
+        records = []
+        while offset < len(data):
+            timestamp, direction, device, length = RECORD_HEADER.unpack_from(
+                data, offset
+            )
+            offset += RECORD_HEADER.size
+            records.append(
+                (timestamp, direction, device, data[offset : offset + length])
+            )
+            offset += length
+
+        assert records == [
+            (1000.5, FrameDirection.TX, device_id(ADDRESS), FRAME_QUERY),
+            (
+                1000.5,
+                FrameDirection.RX,
+                device_id(ADDRESS),
+                valid_notify_payload_single_zone,
+            ),
+        ]
+
+    def test_device_id(self) -> None:
+        """Test that MAC addresses map to their bytes and others are hashed."""
+        assert device_id(ADDRESS) == bytes.fromhex("AABBCCDDEEFF")
+        assert len(device_id("6F2B1C44-0000-4000-8000-00805F9B34FB")) == 6
+
+
+def _record(timestamp: float, direction: FrameDirection, frame: bytes) -> bytes:
+    return RECORD_HEADER.pack(timestamp, direction, device_id(ADDRESS), len(frame)) + (
+        frame
+    )
+
+
+class TestCaptureReader:
+    """Tests for CaptureReader."""
+
+    async def test_reads_what_capture_writes(
+        self,
+        hass: HomeAssistant,
+        tmp_path: Path,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that the reader returns the records FrameCapture appended."""
+        path = tmp_path / "fridge.bdgcap"
+        capture = FrameCapture(hass, ADDRESS, str(path), clock=lambda: 1000.5)
+        capture.record_tx(FRAME_QUERY)
+        capture.record_rx(valid_notify_payload_single_zone, FrameOutcome.OK)
+        await capture.async_stop()
+
+        with CaptureReader(str(path)) as reader:
+            records = list(reader)
+            received = list(reader.records(direction=FrameDirection.RX))
+            other = list(reader.records(device=device_id("11:22:33:44:55:66")))
+
+        assert records == [
+            CaptureRecord(1000.5, FrameDirection.TX, device_id(ADDRESS), FRAME_QUERY),
+            CaptureRecord(
+                1000.5,
+                FrameDirection.RX,
+                device_id(ADDRESS),
+                valid_notify_payload_single_zone,
+            ),
+        ]
+        assert received == records[1:]
+        assert other == []
+
+    def test_truncated_record_is_skipped(self, tmp_path: Path) -> None:
+        """Test that a record cut short by a crash ends the iteration."""
+        path = tmp_path / "fridge.bdgcap"
+        path.write_bytes(
+            CAPTURE_HEADER
+            + _record(1.0, FrameDirection.TX, FRAME_QUERY)
+            + _record(2.0, FrameDirection.TX, FRAME_QUERY)[:-1]
+        )
+
+        with CaptureReader(str(path)) as reader:
+            assert [record.timestamp for record in reader] == [1.0]
+
+    @pytest.mark.parametrize(
+        "content",
+        [b"", b"BDGCAP", b"NOTCAP\x01\x00", b"BDGCAP\x09\x00"],
+    )
+    def test_rejects_other_files(self, tmp_path: Path, content: bytes) -> None:
+        """Test that files without a known capture header are refused."""
+        path = tmp_path / "fridge.bdgcap"
+        path.write_bytes(content)
+
+        with pytest.raises(InvalidCaptureError):
+            CaptureReader(str(path))
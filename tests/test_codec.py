@@ -0,0 +1,210 @@
+"""Round-trip properties and micro-benchmarks of the Bodega frame codec.
+
+A faster parser or encoder has to keep the round-trip tests passing
+(bit-identical frames) and beat the saved benchmark runs::
+
+    pytest tests/test_codec.py --benchmark-enable --benchmark-autosave
+    pytest tests/test_codec.py --benchmark-enable --benchmark-compare
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util.unit_system import METRIC_SYSTEM, US_CUSTOMARY_SYSTEM
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from custom_components.bodega_ble.const import (
+    CMD_QUERY,
+    CMD_SET,
+    CMD_SET_UNIT1_TARGET,
+    KEY_LEFT_TARGET,
+)
+from custom_components.bodega_ble.coordinator import (
+    BodegaBleCoordinator,
+    _create_packet,
+)
+from custom_components.bodega_ble.parser import decode_frame, parse_notify_payload
+from custom_components.bodega_ble.protocol import encode_frame
+
+pytestmark = pytest.mark.benchmark(group="codec", max_time=0.1)
+
+int8 = st.integers(-128, 127).map(lambda value: value & 0xFF)
+flag = st.integers(0, 1)
+
+# Status data bytes whose settings the encoder can represent: known run
+# modes and battery saver levels, and 0/1 flags.
+left_zone = st.tuples(
+    flag,  # locked
+    flag,  # powered
+    flag,  # run mode
+    st.integers(0, 2),  # battery saver
+    int8,  # left target
+    int8,  # temp max
+    int8,  # temp min
+    int8,  # left return difference
+    st.integers(0, 255),  # start delay
+    flag,  # unit
+    int8,  # left tc hot
+    int8,  # left tc mid
+    int8,  # left tc cold
+    int8,  # left tc halt
+    int8,  # left current
+    st.integers(0, 255),  # battery percent
+    st.integers(0, 30),  # voltage, integer part
+    st.integers(0, 9),  # voltage, tenths
+)
+right_zone = st.tuples(
+    int8,  # right target
+    st.just(0),
+    st.just(0),
+    int8,  # right return difference
+    int8,  # right tc hot
+    int8,  # right tc mid
+    int8,  # right tc cold
+    int8,  # right tc halt
+    int8,  # right current
+    st.integers(0, 255),  # running status
+)
+single_zone_data = left_zone.map(bytes)
+dual_zone_data = st.tuples(left_zone, right_zone).map(
+    lambda zones: bytes(zones[0] + zones[1])
+)
+status_data = st.one_of(single_zone_data, dual_zone_data)
+
+
+def _set_body(data: bytes) -> bytes:
+    """Return the Set frame body that restores the settings in status data."""
+    body = bytes([CMD_SET]) + data[:0x0E]
+    if len(data) >= 0x1C:
+        body += data[0x12:0x1A] + bytes(3)
+    return body
+
+
+@pytest.fixture(params=[METRIC_SYSTEM, US_CUSTOMARY_SYSTEM], ids=["metric", "us"])
+def coordinator(
+    request: pytest.FixtureRequest, hass: HomeAssistant, mock_config_entry
+) -> Iterator[BodegaBleCoordinator]:
+    """Return a coordinator in a Home Assistant using either unit system."""
+    hass.config.units = request.param
+    yield BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+
+class TestRoundTrip:
+    """Property tests: encode, parse, normalize and encode again."""
+
+    @given(data=status_data)
+    def test_packet_round_trip(self, data: bytes) -> None:
+        """Test that any status frame parses back to the data it framed."""
+        frame = _create_packet(bytes([CMD_QUERY]) + data)
+
+        assert encode_frame(bytes([CMD_QUERY]) + data) == frame
+        assert parse_notify_payload(frame) == parse_notify_payload(
+            _create_packet(bytes([CMD_SET]) + data)
+        )
+        assert decode_frame(frame)[0] == "ok"
+
+    @settings(suppress_health_check=[HealthCheck.function_scoped_fixture])
+    @given(data=status_data)
+    def test_settings_round_trip(
+        self, coordinator: BodegaBleCoordinator, data: bytes
+    ) -> None:
+        """Test that re-encoding a parsed state gives the same Set frame."""
+        raw = parse_notify_payload(_create_packet(bytes([CMD_QUERY]) + data))
+        coordinator.data = coordinator._normalize_data(raw)
+
+        assert coordinator._encode_set({}) == _create_packet(_set_body(data))
+
+    @settings(suppress_health_check=[HealthCheck.function_scoped_fixture])
+    @given(data=status_data)
+    def test_target_round_trip(
+        self, coordinator: BodegaBleCoordinator, data: bytes
+    ) -> None:
+        """Test that a parsed target encodes back to the byte it came from."""
+        raw = parse_notify_payload(_create_packet(bytes([CMD_QUERY]) + data))
+        coordinator.data = coordinator._normalize_data(raw)
+
+        frame = coordinator._encode_target_command(
+            CMD_SET_UNIT1_TARGET, coordinator.data[KEY_LEFT_TARGET]
+        )
+        assert frame == _create_packet(bytes([CMD_SET_UNIT1_TARGET, data[0x04]]))
+
+    @given(frame=st.binary(max_size=40))
+    def test_arbitrary_bytes_never_raise(self, frame: bytes) -> None:
+        """Test that the parser rejects garbage instead of raising."""
+        outcome, parsed = decode_frame(frame)
+
+        assert bool(parsed) == (outcome in ("ok", "doubled_checksum"))
+
+
+@pytest.fixture(
+    params=["single_zone", "dual_zone", "fahrenheit", "corrupted", "truncated"]
+)
+def frame(
+    request: pytest.FixtureRequest,
+    valid_notify_payload_single_zone: bytes,
+    valid_notify_payload_dual_zone: bytes,
+) -> bytes:
+    """Return a notify frame of each kind the benchmarks cover."""
+    if request.param == "single_zone":
+        return valid_notify_payload_single_zone
+    if request.param == "dual_zone":
+        return valid_notify_payload_dual_zone
+    if request.param == "fahrenheit":
+        data = bytearray(valid_notify_payload_single_zone[4:-2])
+        data[0x09] = 1
+        return _create_packet(bytes([CMD_QUERY]) + data)
+    if request.param == "corrupted":
+        corrupted = bytearray(valid_notify_payload_dual_zone)
+        corrupted[10] ^= 0xFF
+        return bytes(corrupted)
+    return valid_notify_payload_dual_zone[:-5]
+
+
+class TestBenchmarks:
+    """Micro-benchmarks of the hot codec paths."""
+
+    def test_parse_notify_payload(self, benchmark, frame: bytes) -> None:
+        benchmark(parse_notify_payload, frame)
+
+    def test_create_packet(
+        self, benchmark, valid_notify_payload_dual_zone: bytes
+    ) -> None:
+        body = valid_notify_payload_dual_zone[3:-2]
+        assert benchmark(_create_packet, body) == valid_notify_payload_dual_zone
+
+    def test_encode_frame(
+        self, benchmark, valid_notify_payload_dual_zone: bytes
+    ) -> None:
+        body = valid_notify_payload_dual_zone[3:-2]
+        assert benchmark(encode_frame, body) == valid_notify_payload_dual_zone
+
+    def test_normalize_data(
+        self, benchmark, coordinator: BodegaBleCoordinator, frame: bytes
+    ) -> None:
+        raw = parse_notify_payload(frame)
+        benchmark(coordinator._normalize_data, raw)
+
+    def test_encode_set(
+        self,
+        benchmark,
+        coordinator: BodegaBleCoordinator,
+        valid_notify_payload_dual_zone: bytes,
+    ) -> None:
+        raw = parse_notify_payload(valid_notify_payload_dual_zone)
+        coordinator.data = coordinator._normalize_data(raw)
+        benchmark(coordinator._encode_set, {KEY_LEFT_TARGET: 4})
+
+    def test_encode_target_command(
+        self,
+        benchmark,
+        coordinator: BodegaBleCoordinator,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        raw = parse_notify_payload(valid_notify_payload_single_zone)
+        coordinator.data = coordinator._normalize_data(raw)
+        benchmark(coordinator._encode_target_command, CMD_SET_UNIT1_TARGET, 3)
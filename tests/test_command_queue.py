@@ -0,0 +1,105 @@
+"""Tests for the Bodega BLE offline command queue."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.bodega_ble.command_queue import CommandQueue
+from custom_components.bodega_ble.const import (
+    KEY_LEFT_TARGET,
+    KEY_POWERED,
+    MAX_QUEUE_TTL,
+)
+
+STORAGE_KEY = "bodega_ble.command_queue.test"
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCommandQueue:
+    """Tests for CommandQueue."""
+
+    async def test_last_write_wins_per_field(self, hass: HomeAssistant) -> None:
+        queue = CommandQueue(hass, "test")
+        queue.put({KEY_LEFT_TARGET: 4.0, KEY_POWERED: True}, 60)
+        queue.put({KEY_LEFT_TARGET: 2.0}, 60)
+
+        pending = queue.pending()
+        assert pending[KEY_LEFT_TARGET].value == 2.0
+        assert pending[KEY_POWERED].value is True
+
+    async def test_commands_expire(self, hass: HomeAssistant) -> None:
+        clock = FakeClock()
+        queue = CommandQueue(hass, "test", clock=clock)
+        queue.put({KEY_LEFT_TARGET: 4.0}, 60)
+        queue.put({KEY_POWERED: False}, 600)
+
+        clock.now += 61
+        assert set(queue.pending()) == {KEY_POWERED}
+
+        clock.now += MAX_QUEUE_TTL
+        assert not queue
+
+    async def test_discard_keeps_newer_commands(self, hass: HomeAssistant) -> None:
+        queue = CommandQueue(hass, "test")
+        queue.put({KEY_LEFT_TARGET: 4.0, KEY_POWERED: True}, 60)
+        sent = queue.pending()
+        queue.put({KEY_LEFT_TARGET: 3.0}, 60)
+
+        queue.discard(sent)
+
+        assert {f: c.value for f, c in queue.pending().items()} == {
+            KEY_LEFT_TARGET: 3.0
+        }
+
+    async def test_unknown_field_rejected(self, hass: HomeAssistant) -> None:
+        queue = CommandQueue(hass, "test")
+        with pytest.raises(ValueError):
+            queue.put({"left_current": 4.0}, 60)
+
+    async def test_persisted_across_restarts(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ) -> None:
+        queue = CommandQueue(hass, "test")
+        queue.put({KEY_LEFT_TARGET: 4.0}, 600)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_block_till_done()
+
+        stored = hass_storage[STORAGE_KEY]["data"]["commands"]
+        assert stored[KEY_LEFT_TARGET]["value"] == 4.0
+
+        restored = CommandQueue(hass, "test")
+        await restored.async_load()
+        assert restored.pending()[KEY_LEFT_TARGET].value == 4.0
+
+    async def test_expired_commands_dropped_on_load(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ) -> None:
+        hass_storage[STORAGE_KEY] = {
+            "version": 1,
+            "key": STORAGE_KEY,
+            "data": {
+                "commands": {
+                    KEY_LEFT_TARGET: {"value": 4.0, "queued_at": 0, "expires_at": 1},
+                    "left_current": {"value": 1, "queued_at": 0, "expires_at": 1e12},
+                }
+            },
+        }
+        queue = CommandQueue(hass, "test")
+        await queue.async_load()
+
+        assert not queue
@@ -0,0 +1,121 @@
+"""Tests for the Bodega BLE compressor analytics."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.compressor import CompressorAnalytics
+from custom_components.bodega_ble.const import (
+    BLE_STATUS_DISCONNECTED,
+    KEY_COMPRESSOR_STATUS,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+
+ON = "Compressor On"
+OFF = "Compressor Off"
+MINUTE = 60.0
+
+
+def _analytics(
+    samples: list[tuple[float, str]], window: float = 3600.0
+) -> CompressorAnalytics:
+    analytics = CompressorAnalytics(window, power=60.0, max_gap=10 * MINUTE)
+    for minute, status in samples:
+        analytics.add(minute * MINUTE, status)
+    return analytics
+
+
+class TestCompressorAnalytics:
+    """Tests for CompressorAnalytics."""
+
+    def test_empty(self) -> None:
+        """Test that nothing is reported before the first sample."""
+        analytics = _analytics([])
+
+        assert analytics.duty_cycle is None
+        assert analytics.cycles == 0
+        assert analytics.mean_on_time is None
+        assert analytics.energy is None
+
+    def test_cycles_and_durations(self) -> None:
+        """Test duty cycle, starts and mean durations of complete runs."""
+        # Off 0-10, on 10-15, off 15-25, on 25-30, off from 30.
+        analytics = _analytics(
+            [(0, OFF), (10, ON), (15, OFF), (25, ON), (30, OFF), (40, OFF)]
+        )
+
+        assert analytics.duty_cycle == 25.0
+        assert analytics.cycles == 2
+        assert analytics.mean_on_time == 5 * MINUTE
+        # The first off run began before tracking, so only one is complete.
+        assert analytics.mean_off_time == 10 * MINUTE
+        # 10 minutes at 60 W.
+        assert analytics.energy == 10.0
+
+    def test_open_run_counts(self) -> None:
+        """Test that a run still going counts towards time and starts."""
+        analytics = _analytics([(0, OFF), (10, ON), (20, ON)])
+
+        assert analytics.duty_cycle == 50.0
+        assert analytics.cycles == 1
+        assert analytics.mean_on_time is None
+
+    def test_window_slides(self) -> None:
+        """Test that runs leave the window and a straddling run is clipped."""
+        samples = [(0, ON), (10, OFF), (20, ON), (30, OFF), (40, OFF), (50, OFF)]
+        analytics = _analytics(
+            [*samples, (60, OFF), (70, OFF), (75, OFF)], window=50 * MINUTE
+        )
+
+        # Window is 25-75: on 25-30, off 30-75.
+        assert analytics.on_time == 5 * MINUTE
+        assert analytics.duty_cycle == 10.0
+        assert analytics.cycles == 0
+        assert analytics.as_dict()["runs"] == 1
+
+    def test_gap_is_not_tracked(self) -> None:
+        """Test that time without samples counts as neither state."""
+        analytics = _analytics(
+            [(0, OFF), (5, ON), (10, ON), (60, ON), (65, OFF)], window=7200.0
+        )
+
+        assert analytics.on_time == 10 * MINUTE
+        assert analytics.duty_cycle == 66.7
+        # Neither on run saw both a start and an end.
+        assert analytics.mean_on_time is None
+        assert analytics.cycles == 1
+
+    def test_unknown_and_late_samples_are_ignored(self) -> None:
+        """Test that unknown states and samples from the past are dropped."""
+        analytics = _analytics([(0, OFF), (5, "Unknown"), (10, ON), (8, OFF)])
+
+        assert analytics.on_time == 0.0
+        assert analytics.cycles == 1
+        assert analytics.duty_cycle == 0.0
+
+
+async def test_coordinator_tracks_compressor(
+    hass: HomeAssistant, mock_config_entry
+) -> None:
+    """Test that new telemetry feeds the analytics and re-published data not."""
+    coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+    with patch("time.time", return_value=1000.0):
+        coordinator._async_record_telemetry({KEY_COMPRESSOR_STATUS: ON})
+        coordinator.async_set_updated_data({KEY_COMPRESSOR_STATUS: ON})
+
+    assert coordinator.compressor.duty_cycle is None
+    assert coordinator.compressor.cycles == 0
+    assert coordinator.compressor.energy == 0.0
+    assert coordinator.compressor.window == 24 * 3600
+
+    # Status changes without telemetry must not bridge the gap as on time.
+    for timestamp in (1500.0, 2000.0):
+        with patch("time.time", return_value=timestamp):
+            coordinator._set_ble_status(BLE_STATUS_DISCONNECTED)
+    with patch("time.time", return_value=2400.0):
+        coordinator._async_record_telemetry({KEY_COMPRESSOR_STATUS: ON})
+
+    assert coordinator.compressor.on_time == 0.0
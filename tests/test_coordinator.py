@@ -2,7 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
+from bleak import BleakError
+from homeassistant.components.bluetooth import BluetoothChange
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bodega_ble.actor import ActorState
+from custom_components.bodega_ble.const import (
+    CMD_SET,
+    CONF_POLL_MODE,
+    DEFAULT_QUEUE_TTL,
+    DOMAIN,
+    FRAME_BIND,
+    FRAME_QUERY,
+    PHASE_WRITE,
+    PHASES,
+    POLL_MODE_PASSIVE,
+    SERVICE_UUID,
+)
+from custom_components.bodega_ble.coordinator import (
+    BodegaBleCoordinator,
+    _create_packet,
+)
+from custom_components.bodega_ble.exceptions import (
+    BodegaBleInvalidFrameError,
+    BodegaBleInvalidSettingsError,
+    BodegaBleShutdownError,
+)
+from custom_components.bodega_ble.number import NUMBER_DESCRIPTIONS
+from custom_components.bodega_ble.parser import parse_notify_payload
+from custom_components.bodega_ble.switch import SWITCH_DESCRIPTIONS
+
+COORDINATOR = "custom_components.bodega_ble.coordinator"
 
 
 class TestPacketCreation:
@@ -152,3 +189,511 @@ class TestBatterySaverParser:
         assert _parse_battery_saver("High") == 2
         assert _parse_battery_saver("high") == 2
         assert _parse_battery_saver(2) == 2
+
+
+def _mock_client(
+    services: MagicMock, state: bytes | None = None, echo: bool = False
+) -> MagicMock:
+    """Return a client that answers queries (and Set frames, with echo)."""
+    client = MagicMock()
+    client.services = services
+    client.disconnect = AsyncMock()
+    client.clear_cache = AsyncMock(return_value=True)
+    handlers = []
+
+    async def _start_notify(_char, handler) -> None:
+        handlers.append(handler)
+
+    async def _write(_char, payload, response) -> None:
+        if state is None:
+            return
+        if payload == FRAME_QUERY:
+            handlers[-1](0, bytearray(state))
+        elif echo and payload[3] == CMD_SET:
+            handlers[-1](0, bytearray(_create_packet(bytes([CMD_SET]) + state[4:-2])))
+
+    client.start_notify = AsyncMock(side_effect=_start_notify)
+    client.stop_notify = AsyncMock()
+    client.write_gatt_char = AsyncMock(side_effect=_write)
+    return client
+
+
+class TestGattServiceCache:
+    """Tests for GATT characteristic resolution per connection."""
+
+    async def test_characteristics_resolved_per_client(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that each new client's own characteristics are used."""
+        clients = [
+            _mock_client(MagicMock(), valid_notify_payload_single_zone)
+            for _ in range(2)
+        ]
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        # End each session right away so the second command reconnects.
+        coordinator._actor.linger = 0
+
+        with patch(
+            f"{COORDINATOR}.establish_connection", side_effect=clients
+        ) as mock_connect:
+            await coordinator._async_send_command(FRAME_BIND)
+            await coordinator._async_send_command(FRAME_BIND)
+
+        assert "cached_services" not in mock_connect.call_args.kwargs
+        for client in clients:
+            write_char = client.services.get_characteristic.return_value
+            assert client.write_gatt_char.call_args.args[0] is write_char
+
+    async def test_gatt_error_invalidates_cache(
+        self, hass: HomeAssistant, mock_config_entry, mock_ble_lookup
+    ) -> None:
+        """Test that a GATT error drops the cached services."""
+        client = _mock_client(MagicMock())
+        client.write_gatt_char = AsyncMock(side_effect=BleakError("ATT error 0x0e"))
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection", return_value=client),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_send_command(FRAME_BIND)
+
+        assert not coordinator._protocol.resolved
+        client.clear_cache.assert_awaited_once()
+        client.disconnect.assert_awaited()
+
+
+class TestPassiveMode:
+    """Tests for advertisement-only telemetry."""
+
+    async def test_adverts_wait_for_retry_backoff(
+        self,
+        hass: HomeAssistant,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that adverts only ask for settings once the backoff allows."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"address": "AA:BB:CC:DD:EE:FF"},
+            options={CONF_POLL_MODE: POLL_MODE_PASSIVE},
+        )
+        coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+        coordinator._retry._clock = clock = MagicMock(return_value=1000.0)
+        with patch(f"{COORDINATOR}.async_register_callback") as mock_register:
+            coordinator.async_start()
+        advertisement_callback = mock_register.call_args[0][1]
+        service_info = MagicMock(
+            manufacturer_data={},
+            service_data={SERVICE_UUID: valid_notify_payload_single_zone},
+            rssi=-60,
+            source="hci0",
+        )
+        with (
+            patch(f"{COORDINATOR}.establish_connection", side_effect=TimeoutError),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_update_data()
+        delay = coordinator.update_interval.total_seconds()
+
+        with patch.object(coordinator, "async_request_refresh") as mock_refresh:
+            for _ in range(10):
+                advertisement_callback(service_info, BluetoothChange.ADVERTISEMENT)
+            await hass.async_block_till_done()
+            assert mock_refresh.call_count == 0
+
+            clock.return_value = 1000.0 + delay
+            advertisement_callback(service_info, BluetoothChange.ADVERTISEMENT)
+            await hass.async_block_till_done()
+        coordinator.async_stop()
+
+        assert mock_refresh.call_count == 1
+
+    async def test_fresh_advertisements_skip_gatt_poll(
+        self, hass: HomeAssistant, mock_ble_lookup
+    ) -> None:
+        """Test that fresh advertised telemetry avoids a connection."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"address": "AA:BB:CC:DD:EE:FF"},
+            options={CONF_POLL_MODE: POLL_MODE_PASSIVE},
+        )
+        coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+        coordinator.data = {"left_current": 4.0}
+        coordinator._last_gatt_poll = time.monotonic()
+        coordinator._last_advertised_telemetry = time.monotonic()
+
+        with patch(f"{COORDINATOR}.establish_connection") as mock_connect:
+            data = await coordinator._async_update_data()
+
+        assert data == {"left_current": 4.0}
+        mock_connect.assert_not_called()
+
+    async def test_stale_settings_fall_back_to_gatt(
+        self, hass: HomeAssistant, mock_ble_lookup
+    ) -> None:
+        """Test that passive mode still polls when settings are stale."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"address": "AA:BB:CC:DD:EE:FF"},
+            options={CONF_POLL_MODE: POLL_MODE_PASSIVE},
+        )
+        coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+        coordinator.data = {"left_current": 4.0}
+        coordinator._last_advertised_telemetry = time.monotonic()
+
+        with (
+            patch(
+                f"{COORDINATOR}.establish_connection", side_effect=TimeoutError
+            ) as mock_connect,
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_update_data()
+
+        mock_connect.assert_called_once()
+
+    async def test_advertisement_merges_telemetry(
+        self, hass: HomeAssistant, valid_notify_payload_single_zone: bytes
+    ) -> None:
+        """Test that advertised telemetry is merged into coordinator data."""
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={"address": "AA:BB:CC:DD:EE:FF"},
+            options={CONF_POLL_MODE: POLL_MODE_PASSIVE},
+        )
+        coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+        coordinator.data = {"left_target": 5.0}
+        coordinator._last_gatt_poll = time.monotonic()
+
+        with patch(f"{COORDINATOR}.async_register_callback") as mock_register:
+            coordinator.async_start()
+        advertisement_callback = mock_register.call_args[0][1]
+        service_info = MagicMock(
+            manufacturer_data={},
+            service_data={SERVICE_UUID: valid_notify_payload_single_zone},
+            rssi=-60,
+            source="hci0",
+        )
+        advertisement_callback(service_info, BluetoothChange.ADVERTISEMENT)
+
+        assert coordinator.data["left_target"] == 5.0
+        assert coordinator.data["left_current"] == -5.0
+        assert coordinator.data["battery_percent"] == 100
+
+
+class TestOfflineCommandQueue:
+    """Tests for queueing commands while the fridge is out of reach."""
+
+    async def test_unreachable_command_is_queued(
+        self, hass: HomeAssistant, mock_config_entry, mock_ble_lookup
+    ) -> None:
+        """Test that a command for an absent fridge is queued, not raised."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = {"temp_unit": "C"}
+
+        with patch(f"{COORDINATOR}.establish_connection", side_effect=TimeoutError):
+            await coordinator.async_set_left_target(3.0, DEFAULT_QUEUE_TTL)
+
+        assert coordinator._queue.pending()["left_target"].value == 3.0
+
+    async def test_setters_fail_fast_by_default(
+        self, hass: HomeAssistant, mock_config_entry, mock_ble_lookup
+    ) -> None:
+        """Test that setters only queue when given a TTL."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = {"temp_unit": "C"}
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection", side_effect=TimeoutError),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator.async_set_left_target(3.0)
+
+        assert not coordinator._queue
+
+    async def test_entity_actions_are_not_queued(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that UI actions on an absent fridge fail instead of queueing."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = coordinator._normalize_data(
+            parse_notify_payload(valid_notify_payload_single_zone)
+        )
+        actions = (
+            NUMBER_DESCRIPTIONS[0].set_value_fn(coordinator, 3.0),
+            SWITCH_DESCRIPTIONS[0].turn_off_fn(coordinator),
+        )
+
+        with patch(f"{COORDINATOR}.establish_connection", side_effect=TimeoutError):
+            for action in actions:
+                with pytest.raises(UpdateFailed):
+                    await action
+
+        assert not coordinator._queue
+
+    async def test_flush_sends_one_merged_frame(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that queued fields go out in one session and one Set frame."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator._queue.put({"left_target": 2.0, "powered": False}, 600)
+        client = _mock_client(MagicMock(), valid_notify_payload_single_zone)
+
+        with patch(
+            f"{COORDINATOR}.establish_connection", return_value=client
+        ) as mock_connect:
+            await coordinator._async_flush_queue()
+
+        mock_connect.assert_called_once()
+        writes = [call.args[1] for call in client.write_gatt_char.call_args_list]
+        # Read state, one merged Set frame, then read the result back.
+        assert writes[0] == FRAME_QUERY
+        assert writes[2] == FRAME_QUERY
+        assert len(writes) == 3
+        frame = writes[1]
+        assert frame[3] == CMD_SET
+        assert frame[5] == 0  # powered
+        assert frame[8] == 2  # left_target
+        assert not coordinator._queue
+
+
+class TestApplySettings:
+    """Tests for writing several settings in one Set frame."""
+
+    async def test_all_fields_in_one_frame(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that a subset of settings goes out as a single Set frame."""
+        client = _mock_client(MagicMock(), valid_notify_payload_single_zone, echo=True)
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = coordinator._normalize_data(
+            parse_notify_payload(valid_notify_payload_single_zone)
+        )
+
+        with patch(f"{COORDINATOR}.establish_connection", return_value=client):
+            state = await coordinator.async_apply_settings(
+                {
+                    "locked": True,
+                    "run_mode": "Eco",
+                    "left_target": 2.0,
+                    "temp_max": 8.0,
+                    "left_tc_hot": 4.0,
+                    "start_delay": 5,
+                }
+            )
+
+        # The Set echo carries the state, so no query follows.
+        assert state["left_current"] == -5.0
+        client.write_gatt_char.assert_awaited_once()
+        frame = client.write_gatt_char.call_args.args[1]
+        body = frame[3:-2]
+        assert body[0] == CMD_SET
+        assert body[1] == 1  # locked
+        assert body[2] == 1  # powered, unchanged
+        assert body[3] == 1  # run_mode Eco
+        assert body[4] == 1  # battery_saver Mid, unchanged
+        assert body[5] == 2  # left_target
+        assert body[6] == 8  # temp_max
+        assert body[9] == 5  # start_delay
+        assert body[11] == 4  # left_tc_hot
+
+    async def test_invalid_settings_rejected(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that settings the device cannot take are rejected up front."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = coordinator._normalize_data(
+            parse_notify_payload(valid_notify_payload_single_zone)
+        )
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection") as mock_connect,
+            pytest.raises(BodegaBleInvalidSettingsError),
+        ):
+            await coordinator.async_apply_settings({"right_target": -18.0})
+
+        mock_connect.assert_not_called()
+
+
+class TestCommandReadBack:
+    """Tests for returning the post-command state from the same session."""
+
+    async def test_query_follows_command_without_echo(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that the state is queried when the command is not echoed."""
+        client = _mock_client(MagicMock(), valid_notify_payload_single_zone)
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = {"temp_unit": "C"}
+
+        with patch(
+            f"{COORDINATOR}.establish_connection", return_value=client
+        ) as mock_connect:
+            state = await coordinator.async_set_left_target(3.0)
+
+        mock_connect.assert_called_once()
+        writes = [call.args[1] for call in client.write_gatt_char.call_args_list]
+        assert writes[1] == FRAME_QUERY
+        assert state["left_target"] == 5.0
+        assert coordinator.data == state
+
+    async def test_frames_are_captured(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        invalid_checksum_payload: bytes,
+    ) -> None:
+        """Test that sent frames and rejected replies land in the capture."""
+        client = _mock_client(MagicMock(), invalid_checksum_payload)
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator._command_timeout_override = 0.05
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection", return_value=client),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator.async_read_state()
+
+        frames = coordinator._capture.as_dict()["frames"]
+        assert frames[0]["direction"] == "tx"
+        assert frames[0]["hex"] == FRAME_QUERY.hex()
+        assert frames[1]["direction"] == "rx"
+        assert frames[1]["outcome"] == "short_frame"
+
+    async def test_invalid_reply_is_a_frame_error(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        invalid_checksum_payload: bytes,
+    ) -> None:
+        """Test that only invalid replies surface as an invalid frame."""
+        client = _mock_client(MagicMock(), invalid_checksum_payload)
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator._command_timeout_override = 0.05
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection", return_value=client),
+            pytest.raises(UpdateFailed) as exc_info,
+        ):
+            await coordinator.async_read_state()
+
+        assert isinstance(exc_info.value.__cause__, BodegaBleInvalidFrameError)
+
+
+async def _hang(*args, **kwargs) -> None:
+    """Never return, like a fridge that stopped answering."""
+    await asyncio.Event().wait()
+
+
+async def _wait_for_state(coordinator: BodegaBleCoordinator, state: str) -> None:
+    async with asyncio.timeout(1):
+        while coordinator._actor.state != state:
+            await asyncio.sleep(0)
+
+
+class TestShutdown:
+    """Tests for releasing a hung fridge promptly on unload."""
+
+    async def test_hung_connect_is_cancelled(
+        self, hass: HomeAssistant, mock_config_entry, mock_ble_lookup
+    ) -> None:
+        """Test that shutdown does not wait for the connect timeout."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+        with patch(f"{COORDINATOR}.establish_connection", side_effect=_hang):
+            command = asyncio.ensure_future(coordinator.async_read_state())
+            await _wait_for_state(coordinator, ActorState.CONNECTING)
+            async with asyncio.timeout(1):
+                await coordinator.async_shutdown()
+
+        assert coordinator._actor.state is ActorState.STOPPED
+        with pytest.raises(BodegaBleShutdownError):
+            await command
+        with pytest.raises(BodegaBleShutdownError):
+            await coordinator.async_read_state()
+
+    async def test_hung_session_is_released(
+        self, hass: HomeAssistant, mock_config_entry, mock_ble_lookup
+    ) -> None:
+        """Test that a silent fridge is disconnected within the release bound."""
+        client = _mock_client(MagicMock())
+        client.stop_notify = AsyncMock(side_effect=_hang)
+        client.disconnect = AsyncMock(side_effect=_hang)
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        coordinator.data = {"left_current": 4.0}
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection", return_value=client),
+            patch(f"{COORDINATOR}.RELEASE_TIMEOUT", 0.05),
+        ):
+            poll = asyncio.ensure_future(coordinator._async_update_data())
+            await _wait_for_state(coordinator, ActorState.SESSION)
+            async with asyncio.timeout(1):
+                await coordinator.async_shutdown()
+
+        assert await poll == {"left_current": 4.0}
+        client.stop_notify.assert_not_awaited()
+        client.disconnect.assert_awaited_once()
+
+
+class TestPhaseMetrics:
+    """Tests for per-phase timings and outcome counts."""
+
+    async def test_session_records_every_phase(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry,
+        mock_ble_lookup,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that a read records each phase and a success."""
+        client = _mock_client(MagicMock(), valid_notify_payload_single_zone)
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+        with patch(f"{COORDINATOR}.establish_connection", return_value=client):
+            await coordinator.async_read_state()
+
+        summary = coordinator.latency_summary()
+        for phase in PHASES:
+            assert summary["phases"][phase]["count"] == 1, phase
+        assert summary["outcomes"] == {"success": 1}
+
+    async def test_failures_counted_by_class(
+        self, hass: HomeAssistant, mock_config_entry, mock_ble_lookup
+    ) -> None:
+        """Test that failures are counted under their error class."""
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+        with (
+            patch(f"{COORDINATOR}.establish_connection", side_effect=TimeoutError),
+            pytest.raises(UpdateFailed),
+        ):
+            await coordinator._async_update_data()
+
+        assert coordinator.outcome_counts() == {"timeout": 1}
+        assert coordinator.phase_latency(PHASE_WRITE).count == 0
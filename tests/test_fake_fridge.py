@@ -0,0 +1,178 @@
+"""Tests for the coordinator against the simulated fridge."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bleak import BleakError
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.bodega_ble.const import (
+    CMD_SET,
+    CMD_SET_UNIT1_TARGET,
+    FRAME_BIND,
+    KEY_LEFT_CURRENT,
+    KEY_LEFT_TARGET,
+    KEY_POWERED,
+    KEY_RIGHT_CURRENT,
+    KEY_RIGHT_TARGET,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+
+from .fake_fridge import FakeFridge, FridgeFaults
+
+COORDINATOR = "custom_components.bodega_ble.coordinator"
+
+
+@pytest.fixture
+def fridge(request: pytest.FixtureRequest, mock_ble_lookup: MagicMock) -> FakeFridge:
+    """Return a simulated fridge that the device lookup resolves to."""
+    fridge = FakeFridge(**getattr(request, "param", {}))
+    mock_ble_lookup.return_value = fridge.ble_device
+    return fridge
+
+
+@pytest.fixture
+def coordinator(
+    hass: HomeAssistant, mock_config_entry, fridge: FakeFridge
+) -> Iterator[BodegaBleCoordinator]:
+    """Return a coordinator connected to the simulated fridge."""
+    coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+    coordinator._actor.linger = 0
+    coordinator._command_timeout_override = 0.2
+    with patch(f"{COORDINATOR}.establish_connection", fridge.establish_connection):
+        yield coordinator
+
+
+class TestProtocol:
+    """Tests of the real frame exchange."""
+
+    async def test_single_zone_query(
+        self, coordinator: BodegaBleCoordinator, fridge: FakeFridge
+    ) -> None:
+        """Test that a poll reads the fridge's state."""
+        fridge[KEY_LEFT_CURRENT] = -3
+
+        data = await coordinator.async_read_state()
+
+        assert data[KEY_LEFT_CURRENT] == -3
+        assert KEY_RIGHT_CURRENT not in data
+        assert fridge.connects == 1
+
+    @pytest.mark.parametrize("fridge", [{"dual_zone": True}], indirect=True)
+    async def test_dual_zone_targets(
+        self, coordinator: BodegaBleCoordinator, fridge: FakeFridge
+    ) -> None:
+        """Test that target commands change the fridge and are read back."""
+        coordinator.data = await coordinator.async_read_state()
+
+        data = await coordinator.async_set_right_target(-12)
+        await coordinator.async_set_left_target(3)
+
+        assert data[KEY_RIGHT_TARGET] == -12
+        assert fridge[KEY_RIGHT_TARGET] == -12
+        assert fridge[KEY_LEFT_TARGET] == 3
+        assert CMD_SET_UNIT1_TARGET in [frame[3] for frame in fridge.received]
+
+    @pytest.mark.parametrize("fridge", [{"dual_zone": True}], indirect=True)
+    async def test_set_frame(
+        self, coordinator: BodegaBleCoordinator, fridge: FakeFridge
+    ) -> None:
+        """Test that a Set frame writes settings and keeps the right zone."""
+        coordinator.data = await coordinator.async_read_state()
+
+        data = await coordinator.async_apply_settings(
+            {KEY_POWERED: False, KEY_LEFT_TARGET: 2}
+        )
+
+        assert CMD_SET in [frame[3] for frame in fridge.received]
+        assert fridge[KEY_POWERED] == 0
+        assert fridge[KEY_RIGHT_TARGET] == -10
+        assert data[KEY_POWERED] is False
+        assert data[KEY_LEFT_TARGET] == 2
+
+    async def test_bind(
+        self, coordinator: BodegaBleCoordinator, fridge: FakeFridge
+    ) -> None:
+        """Test that binding reaches the fridge before the state is read."""
+        await coordinator.async_send_bind()
+
+        assert fridge.bound
+        assert fridge.received[0] == FRAME_BIND
+
+
+class TestFaults:
+    """Tests of the coordinator on a misbehaving link."""
+
+    @pytest.mark.parametrize(
+        "fridge", [{"faults": FridgeFaults(doubled_checksum=True)}], indirect=True
+    )
+    async def test_doubled_checksum(
+        self, coordinator: BodegaBleCoordinator, fridge: FakeFridge
+    ) -> None:
+        """Test that replies with doubled checksums are accepted."""
+        data = await coordinator.async_read_state()
+
+        assert data[KEY_LEFT_CURRENT] == 6
+        assert coordinator._capture.as_dict()["rx_outcomes"] == {"doubled_checksum": 1}
+
+    @pytest.mark.parametrize(
+        "fridge", [{"faults": FridgeFaults(packet_loss=1)}], indirect=True
+    )
+    async def test_packet_loss(self, coordinator: BodegaBleCoordinator) -> None:
+        """Test that a lost reply times out."""
+        with pytest.raises(UpdateFailed):
+            await coordinator.async_read_state()
+
+    @pytest.mark.parametrize(
+        "fridge", [{"faults": FridgeFaults(fragment_size=20)}], indirect=True
+    )
+    async def test_fragmented_reply(self, coordinator: BodegaBleCoordinator) -> None:
+        """Test that fragments are rejected rather than misparsed."""
+        with pytest.raises(UpdateFailed):
+            await coordinator.async_read_state()
+
+        outcomes = coordinator._capture.as_dict()["rx_outcomes"]
+        assert outcomes == {"short_frame": 2}
+
+    @pytest.mark.parametrize(
+        "fridge",
+        [{"faults": FridgeFaults(disconnect_after_writes=1)}],
+        indirect=True,
+    )
+    async def test_disconnect_then_reconnect(
+        self, coordinator: BodegaBleCoordinator, fridge: FakeFridge
+    ) -> None:
+        """Test that a dropped link fails the poll and the next one reconnects."""
+        with pytest.raises(UpdateFailed):
+            await coordinator.async_read_state()
+        fridge.faults.disconnect_after_writes = None
+
+        await coordinator.async_read_state()
+
+        assert fridge.connects == 2
+
+    @pytest.mark.parametrize(
+        "fridge",
+        [{"faults": FridgeFaults(connect_latency=0.05, response_latency=0.02)}],
+        indirect=True,
+    )
+    async def test_latency_is_measured(self, coordinator: BodegaBleCoordinator) -> None:
+        """Test that simulated latency shows up in the phase trackers."""
+        await coordinator.async_read_state()
+
+        assert coordinator.phase_latency("connect").percentile(50) >= 0.05
+        assert coordinator.phase_latency("notify").percentile(50) >= 0.02
+
+    @pytest.mark.parametrize(
+        "fridge",
+        [{"faults": FridgeFaults(connect_error=BleakError("No slots"))}],
+        indirect=True,
+    )
+    async def test_connect_error(self, coordinator: BodegaBleCoordinator) -> None:
+        """Test that a failed connect fails the poll."""
+        with pytest.raises(UpdateFailed):
+            await coordinator.async_read_state()
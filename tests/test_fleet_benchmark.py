@@ -0,0 +1,262 @@
+"""Fleet-scale benchmark of the coordinator against simulated fridges.
+
+Sets up N config entries, each with its platforms and a simulated fridge,
+and polls the whole fleet concurrently for a number of rounds. The default
+run uses a small fleet as a regression check; set BODEGA_FLEET_SIZES (for
+example "10,100,500") for a sweep and BODEGA_FLEET_REPORT to a path to keep
+the JSON report.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bodega_ble.const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    KEY_LEFT_CURRENT,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+
+from .fake_fridge import FakeFridge, FridgeFaults
+
+COORDINATOR = "custom_components.bodega_ble.coordinator"
+INTEGRATION_FILES = "*/custom_components/bodega_ble/*"
+
+FLEET_SIZES = [
+    int(size) for size in os.environ.get("BODEGA_FLEET_SIZES", "10").split(",")
+]
+ROUNDS = 5
+PROBE_INTERVAL = 0.005
+FAULTS = FridgeFaults(connect_latency=0.01, response_latency=0.005)
+
+# Regression budgets, generous enough for a loaded CI runner. Latency and
+# loop lag grow with the fleet because every fridge is polled at once, so
+# they are reported rather than checked; the budgets are per poll.
+MAX_LOOP_TIME_PER_POLL = 0.02  # seconds
+MAX_RETAINED_PER_POLL = 2048  # bytes, while ring buffers are still filling
+# Only the changed temperature should produce a state write.
+STATE_WRITES_PER_POLL = 1
+
+
+def _address(index: int) -> str:
+    return f"AA:BB:CC:{index >> 16:02X}:{(index >> 8) & 0xFF:02X}:{index & 0xFF:02X}"
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        f"p{pct}": ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
+        for pct in (50, 95, 99)
+    } | {"max": ordered[-1]}
+
+
+def _integration_growth(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> tuple[int, int]:
+    """Return bytes and blocks kept alive by allocations in the integration.
+
+    Only the allocating line is traced, which keeps tracing cheap; test
+    harness allocations, such as asyncio debug tracebacks, are left out.
+    """
+    only_integration = [tracemalloc.Filter(True, INTEGRATION_FILES)]
+    diff = after.filter_traces(only_integration).compare_to(
+        before.filter_traces(only_integration), "filename"
+    )
+    return sum(stat.size_diff for stat in diff), sum(stat.count_diff for stat in diff)
+
+
+class _LoopLagProbe:
+    """Measure how late the event loop wakes a task that sleeps briefly."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self.lags: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        loop = self._hass.loop
+        while True:
+            start = loop.time()
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.lags.append(loop.time() - start - PROBE_INTERVAL)
+
+    def start(self) -> None:
+        self._task = self._hass.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        assert self._task is not None
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class _Fleet:
+    """Config entries with simulated fridges, set up in one HA instance."""
+
+    def __init__(self, hass: HomeAssistant, size: int) -> None:
+        self.hass = hass
+        self.fridges = {
+            _address(index): FakeFridge(_address(index), faults=FAULTS, seed=index)
+            for index in range(size)
+        }
+        self.entries = [
+            MockConfigEntry(
+                domain=DOMAIN,
+                title=f"Fridge {address}",
+                data={"address": address},
+                unique_id=address,
+            )
+            for address in self.fridges
+        ]
+
+    @property
+    def coordinators(self) -> list[BodegaBleCoordinator]:
+        return [entry.runtime_data for entry in self.entries]
+
+    def lookup(self, _hass: HomeAssistant, address: str, **_: Any) -> Any:
+        return self.fridges[address].ble_device
+
+    async def connect(self, client_class: type, device: Any, name: str, **kwargs):
+        return await self.fridges[device.address].establish_connection(
+            client_class, device, name, **kwargs
+        )
+
+    async def async_setup(self) -> None:
+        for entry in self.entries:
+            entry.add_to_hass(self.hass)
+            assert await self.hass.config_entries.async_setup(entry.entry_id)
+        await self.hass.async_block_till_done()
+        for coordinator in self.coordinators:
+            # Polls are a scan interval apart in production, so each one
+            # connects afresh instead of catching the previous session.
+            coordinator._actor.linger = 0
+
+    async def async_unload(self) -> None:
+        for entry in self.entries:
+            await self.hass.config_entries.async_unload(entry.entry_id)
+        await self.hass.async_block_till_done()
+
+    async def async_poll(self, round_index: int) -> list[float]:
+        """Change every fridge's reading, poll the fleet and return latencies."""
+        for fridge in self.fridges.values():
+            fridge[KEY_LEFT_CURRENT] = round_index % 8
+
+        async def _timed(coordinator: BodegaBleCoordinator) -> float:
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            assert coordinator.last_update_success
+            return time.perf_counter() - start
+
+        return await asyncio.gather(*map(_timed, self.coordinators))
+
+
+@pytest.fixture
+def fleet_patches(enable_bluetooth: None) -> Iterator:
+    """Route device lookups and connects to the fleet under test.
+
+    Plain functions rather than mocks, which would record every call.
+    """
+    fleets: list[_Fleet] = []
+
+    def _lookup(*args: Any, **kwargs: Any) -> Any:
+        return fleets[-1].lookup(*args, **kwargs)
+
+    async def _connect(*args: Any, **kwargs: Any) -> Any:
+        return await fleets[-1].connect(*args, **kwargs)
+
+    with (
+        patch(f"{COORDINATOR}.async_scanner_devices_by_address", lambda *_, **__: []),
+        patch(f"{COORDINATOR}.async_ble_device_from_address", _lookup),
+        patch(f"{COORDINATOR}.establish_connection", _connect),
+        patch(f"{COORDINATOR}.async_register_callback"),
+    ):
+        yield fleets.append
+
+
+@pytest.mark.fleet
+@pytest.mark.parametrize("size", FLEET_SIZES)
+async def test_fleet_polling(
+    hass: HomeAssistant, fleet_patches, size: int, tmp_path: Path
+) -> None:
+    """Poll a fleet of simulated fridges and report how the coordinator scales."""
+    fleet = _Fleet(hass, size)
+    fleet_patches(fleet)
+    await fleet.async_setup()
+
+    state_writes = 0
+
+    @callback
+    def _count(_event: Event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+    probe = _LoopLagProbe(hass)
+    probe.start()
+    latencies: list[float] = []
+    started = time.perf_counter()
+    for round_index in range(ROUNDS):
+        latencies.extend(await fleet.async_poll(round_index))
+    elapsed = time.perf_counter() - started
+    await probe.stop()
+    unsubscribe()
+
+    # Allocations are measured in separate rounds; tracing slows everything.
+    tracemalloc.start()
+    await fleet.async_poll(ROUNDS)
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for round_index in range(ROUNDS):
+        await fleet.async_poll(ROUNDS + 1 + round_index)
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    retained = _integration_growth(before, tracemalloc.take_snapshot())
+    tracemalloc.stop()
+
+    await fleet.async_unload()
+
+    polls = size * ROUNDS
+    report = {
+        "fleet_size": size,
+        "rounds": ROUNDS,
+        "simulated_latency": {
+            "connect": FAULTS.connect_latency,
+            "response": FAULTS.response_latency,
+        },
+        "poll_latency": _percentiles(latencies),
+        "loop_lag": _percentiles(probe.lags) | {"mean": statistics.mean(probe.lags)},
+        "polls_per_second": polls / elapsed,
+        "loop_time_per_poll": elapsed / polls,
+        "state_writes_per_poll": state_writes / polls,
+        # At the default scan interval, one poll per fridge per interval.
+        "state_writes_per_minute": state_writes / ROUNDS * 60 / DEFAULT_SCAN_INTERVAL,
+        "retained_bytes_per_poll": retained[0] / polls,
+        "retained_blocks_per_poll": retained[1] / polls,
+        "peak_traced_bytes": peak,
+        "peak_bytes_per_fridge": (peak - baseline) / size,
+    }
+    path = Path(os.environ.get("BODEGA_FLEET_REPORT", tmp_path / "fleet.json"))
+    reports = json.loads(path.read_text()) if path.exists() else {}
+    reports[str(size)] = report
+    path.write_text(json.dumps(reports, indent=2) + "\n")
+
+    assert report["loop_time_per_poll"] < MAX_LOOP_TIME_PER_POLL
+    assert report["retained_bytes_per_poll"] < MAX_RETAINED_PER_POLL
+    assert report["state_writes_per_poll"] == STATE_WRITES_PER_POLL
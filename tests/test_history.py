@@ -0,0 +1,132 @@
+"""Tests for the Bodega BLE telemetry history."""
+
+from __future__ import annotations
+
+import math
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.const import (
+    KEY_BATTERY_VOLTAGE,
+    KEY_COMPRESSOR_STATUS,
+    KEY_LEFT_CURRENT,
+    KEY_RIGHT_CURRENT,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+from custom_components.bodega_ble.history import HistoryBucket, TelemetryHistory
+
+
+def _filled(values: list[float], capacity: int = 100) -> TelemetryHistory:
+    history = TelemetryHistory(capacity=capacity, min_interval=1)
+    for index, value in enumerate(values):
+        history.record(float(index), {KEY_LEFT_CURRENT: value})
+    return history
+
+
+class TestTelemetryHistory:
+    """Tests for TelemetryHistory."""
+
+    def test_ring_keeps_newest_samples(self) -> None:
+        """Test that a full buffer overwrites its oldest samples."""
+        history = _filled([1.0, 2.0, 3.0, 4.0, 5.0], capacity=3)
+
+        assert len(history) == 3
+        assert history.oldest == 2.0
+        assert history.newest == 4.0
+        assert history.series(KEY_LEFT_CURRENT) == [(2.0, 3.0), (3.0, 4.0), (4.0, 5.0)]
+
+    def test_samples_are_rate_limited(self) -> None:
+        """Test that samples closer than the minimum interval are dropped."""
+        history = TelemetryHistory(min_interval=60)
+
+        assert history.record(1000.0, {KEY_LEFT_CURRENT: 4.0})
+        assert not history.record(1030.0, {KEY_LEFT_CURRENT: 5.0})
+        assert not history.record(900.0, {KEY_LEFT_CURRENT: 5.0})
+        assert history.record(1060.0, {KEY_LEFT_CURRENT: 6.0})
+        assert not history.record(2000.0, {"ble_status": "Connected"})
+        assert len(history) == 2
+
+    def test_missing_and_compressor_values(self) -> None:
+        """Test that absent fields are skipped and the compressor is 0/1."""
+        history = TelemetryHistory(min_interval=1)
+        history.record(
+            1.0,
+            {
+                KEY_LEFT_CURRENT: 4.0,
+                KEY_BATTERY_VOLTAGE: 12.8,
+                KEY_COMPRESSOR_STATUS: "Compressor On",
+            },
+        )
+        history.record(2.0, {KEY_LEFT_CURRENT: 5.0, KEY_COMPRESSOR_STATUS: "Unknown"})
+
+        assert history.series(KEY_RIGHT_CURRENT) == []
+        assert history.series(KEY_BATTERY_VOLTAGE) == [(1.0, 12.8)]
+        assert history.series(KEY_COMPRESSOR_STATUS) == [(1.0, 1.0)]
+
+    def test_series_range(self) -> None:
+        """Test that range bounds are inclusive, across the ring's wrap."""
+        history = _filled([float(value) for value in range(12)], capacity=8)
+
+        assert [t for t, _ in history.series(KEY_LEFT_CURRENT, 5.0, 7.0)] == [
+            5.0,
+            6.0,
+            7.0,
+        ]
+        assert history.series(KEY_LEFT_CURRENT, 20.0) == []
+        assert len(history.series(KEY_LEFT_CURRENT, end=9.5)) == 6
+
+    def test_buckets(self) -> None:
+        """Test min/max/mean aggregation into equal time buckets."""
+        history = _filled([1.0, 3.0, 2.0, 8.0, 4.0, 6.0])
+
+        buckets = history.buckets(KEY_LEFT_CURRENT, 2, 0.0, 6.0)
+
+        assert buckets == [
+            HistoryBucket(0.0, 3.0, 1.0, 3.0, 2.0, 3),
+            HistoryBucket(3.0, 6.0, 4.0, 8.0, 6.0, 3),
+        ]
+
+    def test_empty_buckets_are_omitted(self) -> None:
+        """Test that buckets without samples are not returned."""
+        history = _filled([1.0, 2.0])
+
+        buckets = history.buckets(KEY_LEFT_CURRENT, 4, 0.0, 8.0)
+
+        assert [bucket.start for bucket in buckets] == [0.0]
+
+    def test_downsample_keeps_extremes(self) -> None:
+        """Test that LTTB keeps the endpoints and a spike."""
+        values = [0.0] * 50
+        values[23] = 10.0
+        history = _filled(values)
+
+        sampled = history.downsample(KEY_LEFT_CURRENT, 10)
+
+        assert len(sampled) == 10
+        assert sampled[0] == (0.0, 0.0)
+        assert sampled[-1] == (49.0, 0.0)
+        assert (23.0, 10.0) in sampled
+
+    @pytest.mark.parametrize("threshold", [2, 50, 100])
+    def test_downsample_passthrough(self, threshold: int) -> None:
+        """Test that short series and tiny thresholds are returned as is."""
+        history = _filled([math.sin(index) for index in range(50)])
+
+        assert history.downsample(KEY_LEFT_CURRENT, threshold) == history.series(
+            KEY_LEFT_CURRENT
+        )
+
+
+async def test_coordinator_records_updates(
+    hass: HomeAssistant, mock_config_entry, valid_notify_payload_single_zone: bytes
+) -> None:
+    """Test that applied frames land in the coordinator's history."""
+    coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+    assert coordinator.async_apply_frame(valid_notify_payload_single_zone)
+
+    points = coordinator.history.series(KEY_LEFT_CURRENT)
+    assert [value for _, value in points] == [coordinator.data[KEY_LEFT_CURRENT]]
+    assert coordinator.history.as_dict()["samples"] == 1
@@ -0,0 +1,126 @@
+"""Tests for the Bodega BLE latency tracker."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.bodega_ble.const import (
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW,
+    TIMEOUT_MARGIN,
+)
+from custom_components.bodega_ble.latency import LatencyTracker
+
+
+class TestLatencyTracker:
+    """Tests for LatencyTracker."""
+
+    def test_percentile_empty(self) -> None:
+        """Test that an empty tracker has no percentiles."""
+        tracker = LatencyTracker()
+        assert tracker.percentile(50) is None
+        assert tracker.as_dict()["max"] is None
+
+    def test_percentile_nearest_rank(self) -> None:
+        """Test nearest-rank percentile selection."""
+        tracker = LatencyTracker()
+        for value in range(1, 11):
+            tracker.record(float(value))
+
+        assert tracker.percentile(50) == 5.0
+        assert tracker.percentile(90) == 9.0
+        assert tracker.percentile(99) == 10.0
+
+    def test_window_is_bounded(self) -> None:
+        """Test that old samples fall out of the window."""
+        tracker = LatencyTracker(window=3)
+        for value in (100.0, 1.0, 2.0, 3.0):
+            tracker.record(value)
+
+        assert tracker.count == 3
+        assert tracker.percentile(99) == 3.0
+
+    def test_derive_timeout_uses_default_until_warm(self) -> None:
+        """Test that the default applies until enough samples exist."""
+        tracker = LatencyTracker()
+        for _ in range(LATENCY_MIN_SAMPLES - 1):
+            tracker.record(0.5)
+
+        assert tracker.derive_timeout(10.0, 2.0, 20.0) == 10.0
+
+    def test_derive_timeout_scales_percentile(self) -> None:
+        """Test that the timeout follows p95 × margin."""
+        tracker = LatencyTracker()
+        for _ in range(LATENCY_MIN_SAMPLES):
+            tracker.record(3.0)
+
+        assert tracker.derive_timeout(10.0, 2.0, 20.0) == 3.0 * TIMEOUT_MARGIN
+
+    def test_one_slow_sample_does_not_set_timeout(self) -> None:
+        """Test that the slowest sample alone does not decide the timeout."""
+        tracker = LatencyTracker()
+        for _ in range(LATENCY_MIN_SAMPLES - 1):
+            tracker.record(1.0)
+        tracker.record(9.0)
+
+        assert tracker.derive_timeout(10.0, 2.0, 30.0) == 1.0 * TIMEOUT_MARGIN
+
+    def test_derive_timeout_clamped(self) -> None:
+        """Test that derived timeouts respect the floor and ceiling."""
+        fast = LatencyTracker()
+        slow = LatencyTracker()
+        for _ in range(LATENCY_MIN_SAMPLES):
+            fast.record(0.1)
+            slow.record(60.0)
+
+        assert fast.derive_timeout(10.0, 2.0, 20.0) == 2.0
+        assert slow.derive_timeout(10.0, 2.0, 20.0) == 20.0
+
+    def test_measure_counts_timeouts(self) -> None:
+        """Test that timed-out blocks are counted but not sampled."""
+        tracker = LatencyTracker()
+        with pytest.raises(TimeoutError), tracker.measure():
+            raise TimeoutError
+
+        assert tracker.count == 0
+        assert tracker.timeouts == 1
+        assert tracker.as_dict()["timeouts"] == 1
+
+    def test_timeout_does_not_double_deadline(self) -> None:
+        """Test that a timeout in a warm window leaves the deadline alone."""
+        tracker = LatencyTracker()
+        for _ in range(LATENCY_WINDOW):
+            tracker.record(1.0)
+        deadline = tracker.derive_timeout(10.0, 3.0, 30.0)
+
+        with (
+            patch("time.monotonic", side_effect=[0.0, deadline]),
+            pytest.raises(TimeoutError),
+            tracker.measure(),
+        ):
+            raise TimeoutError
+
+        assert tracker.derive_timeout(10.0, 3.0, 30.0) == deadline
+
+    def test_measure_ignores_other_errors(self) -> None:
+        """Test that non-timeout failures are not recorded."""
+        tracker = LatencyTracker()
+        with pytest.raises(ValueError), tracker.measure():
+            raise ValueError
+
+        assert tracker.count == 0
+
+    def test_histogram_buckets(self) -> None:
+        """Test that each sample lands in exactly one bucket."""
+        tracker = LatencyTracker()
+        for value in (0.01, 0.05, 0.3, 4.0, 30.0):
+            tracker.record(value)
+
+        histogram = tracker.histogram()
+        assert histogram["le_0.05"] == 2
+        assert histogram["le_0.5"] == 1
+        assert histogram["le_5"] == 1
+        assert histogram["inf"] == 1
+        assert sum(histogram.values()) == tracker.count
@@ -0,0 +1,78 @@
+"""Tests for Bodega BLE connection path selection."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.bodega_ble.link import LinkQualityTracker, PathStats
+
+
+def _candidate(source: str, rssi: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        scanner=SimpleNamespace(source=source),
+        advertisement=SimpleNamespace(rssi=rssi),
+        ble_device=SimpleNamespace(address="AA:BB:CC:DD:EE:FF"),
+    )
+
+
+class TestPathStats:
+    """Tests for PathStats."""
+
+    def test_rssi_moving_average(self) -> None:
+        stats = PathStats()
+        stats.record_rssi(-60)
+        assert stats.rssi == -60.0
+        stats.record_rssi(-80)
+        assert -80.0 < stats.rssi < -60.0
+
+    def test_success_ratio_prior(self) -> None:
+        stats = PathStats()
+        assert stats.success_ratio == 0.5
+        stats.record_connect(True, 1.0)
+        stats.record_connect(False, 10.0)
+        assert stats.success_ratio == 0.5
+        assert stats.median_connect_time == 1.0
+
+
+class TestLinkQualityTracker:
+    """Tests for LinkQualityTracker."""
+
+    def test_chooses_strongest_path_without_history(self) -> None:
+        tracker = LinkQualityTracker()
+        near = _candidate("proxy-near", -55)
+        far = _candidate("proxy-far", -85)
+
+        assert tracker.choose([far, near]) is near
+
+    def test_failing_path_loses_to_weaker_reliable_path(self) -> None:
+        tracker = LinkQualityTracker()
+        for _ in range(8):
+            tracker.record_connect("marginal-proxy", False, 10.0)
+            tracker.record_connect("adapter", True, 1.0)
+
+        marginal = _candidate("marginal-proxy", -65)
+        adapter = _candidate("adapter", -75)
+        assert tracker.choose([marginal, adapter]) is adapter
+
+    def test_choose_does_not_record(self) -> None:
+        tracker = LinkQualityTracker()
+        tracker.record_advertisement("adapter", -70)
+
+        for _ in range(3):
+            tracker.choose([_candidate("adapter", -50), _candidate("proxy", -60)])
+
+        assert tracker.as_dict()["adapter"]["rssi"] == -70.0
+        assert "proxy" not in tracker.as_dict()
+
+    def test_choose_empty(self) -> None:
+        assert LinkQualityTracker().choose([]) is None
+
+    def test_as_dict(self) -> None:
+        tracker = LinkQualityTracker()
+        tracker.record_advertisement("adapter", -70)
+        tracker.record_connect("adapter", True, 2.0)
+
+        summary = tracker.as_dict()["adapter"]
+        assert summary["rssi"] == -70.0
+        assert summary["attempts"] == 1
+        assert summary["median_connect_time"] == 2.0
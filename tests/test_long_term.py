@@ -0,0 +1,266 @@
+"""Tests for the Bodega BLE long-term statistics aggregation."""
+
+from __future__ import annotations
+
+import time
+from functools import partial
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import (
+    get_metadata,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.bodega_ble.capture import FrameDirection
+from custom_components.bodega_ble.const import (
+    BLE_STATUS_CONNECTED,
+    BLE_STATUS_DISCONNECTED,
+    CONF_IMPORT_STATISTICS,
+    CONF_STALE_AFTER,
+    DOMAIN,
+    EVENT_ALERT,
+    KEY_BATTERY_VOLTAGE,
+    KEY_LEFT_CURRENT,
+    KEY_RIGHT_CURRENT,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+from custom_components.bodega_ble.long_term import (
+    Aggregate,
+    StatisticsAggregator,
+    async_import_statistics,
+)
+from custom_components.bodega_ble.replay import async_replay_capture
+
+from .test_replay import _write_capture
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+HOUR = 3600.0
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_db_url: str, enable_custom_integrations: None
+) -> None:
+    """Prepare the recorder database before hass is set up."""
+
+
+class TestStatisticsAggregator:
+    """Tests for StatisticsAggregator."""
+
+    def test_five_minute_aggregates(self) -> None:
+        """Test that readings are folded into 5-minute periods."""
+        aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+        for offset, value in ((0, 4.0), (60, 2.0), (240, 6.0), (300, 5.0)):
+            aggregator.add(HOUR + offset, {KEY_LEFT_CURRENT: value})
+
+        assert aggregator.recent(KEY_LEFT_CURRENT) == [
+            Aggregate(HOUR, 2.0, 6.0, 12.0, 3)
+        ]
+        assert aggregator.recent(KEY_RIGHT_CURRENT) == []
+        assert not aggregator.has_pending
+
+    def test_hour_completes_on_next_hour(self) -> None:
+        """Test that an hour is pending once a reading of the next arrives."""
+        aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+        for minute in range(0, 60, 10):
+            aggregator.add(HOUR + minute * 60, {KEY_LEFT_CURRENT: float(minute)})
+        assert not aggregator.has_pending
+
+        aggregator.add(2 * HOUR + 30, {KEY_LEFT_CURRENT: 1.0})
+
+        pending = aggregator.pop_pending()
+        assert pending == {KEY_LEFT_CURRENT: [Aggregate(HOUR, 0.0, 50.0, 150.0, 6)]}
+        assert pending[KEY_LEFT_CURRENT][0].mean == 25.0
+        assert not aggregator.has_pending
+
+    def test_fields_and_metadata(self) -> None:
+        """Test statistic IDs, metadata and which values are aggregated."""
+        aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+        aggregator.add(0, {KEY_BATTERY_VOLTAGE: 12.8, KEY_RIGHT_CURRENT: None})
+        aggregator.add(HOUR, {KEY_BATTERY_VOLTAGE: 12.6})
+
+        assert list(aggregator.pop_pending()) == [KEY_BATTERY_VOLTAGE]
+        assert aggregator.metadata(KEY_BATTERY_VOLTAGE, "V") == {
+            "has_mean": True,
+            "has_sum": False,
+            "name": "Fridge battery voltage",
+            "source": DOMAIN,
+            "statistic_id": "bodega_ble:aabbccddeeff_battery_voltage",
+            "unit_of_measurement": "V",
+        }
+
+    def test_clock_going_back_is_ignored(self) -> None:
+        """Test that a reading from an earlier period is dropped."""
+        aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+        aggregator.add(HOUR, {KEY_LEFT_CURRENT: 4.0})
+        aggregator.add(HOUR - 600, {KEY_LEFT_CURRENT: 9.0})
+        aggregator.add(HOUR + 300, {KEY_LEFT_CURRENT: 5.0})
+
+        assert aggregator.recent(KEY_LEFT_CURRENT) == [
+            Aggregate(HOUR, 4.0, 4.0, 4.0, 1)
+        ]
+
+    def test_close_completes_open_hour(self) -> None:
+        """Test that closing makes the open hour pending."""
+        aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+        aggregator.add(HOUR, {KEY_LEFT_CURRENT: 4.0})
+        aggregator.add(HOUR + 600, {KEY_LEFT_CURRENT: 6.0})
+
+        aggregator.close()
+
+        assert aggregator.pop_pending() == {
+            KEY_LEFT_CURRENT: [Aggregate(HOUR, 4.0, 6.0, 10.0, 2)]
+        }
+        assert len(aggregator.recent(KEY_LEFT_CURRENT)) == 2
+
+
+async def test_pending_without_recorder(hass: HomeAssistant) -> None:
+    """Test that hours wait while the recorder is not loaded."""
+    aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+    aggregator.add(0, {KEY_LEFT_CURRENT: 4.0})
+    aggregator.add(HOUR, {KEY_LEFT_CURRENT: 4.0})
+
+    async_import_statistics(hass, aggregator)
+
+    assert aggregator.has_pending
+
+
+async def test_import_to_recorder(recorder_mock: Recorder, hass: HomeAssistant) -> None:
+    """Test that completed hours are imported as external statistics."""
+    statistic_id = "bodega_ble:aabbccddeeff_left_current"
+    aggregator = StatisticsAggregator(ADDRESS, "Fridge")
+    for offset, value in ((0, 3.0), (600, 5.0), (HOUR, 4.0)):
+        aggregator.add(HOUR + offset, {KEY_LEFT_CURRENT: value})
+
+    async_import_statistics(hass, aggregator)
+    await async_wait_recording_done(hass)
+
+    assert not aggregator.has_pending
+    metadata = await recorder_mock.async_add_executor_job(
+        partial(get_metadata, hass, statistic_ids={statistic_id})
+    )
+    assert metadata[statistic_id][1]["unit_of_measurement"] == (
+        hass.config.units.temperature_unit
+    )
+    assert await _hours(recorder_mock, hass, statistic_id) == [(HOUR, 3.0, 5.0, 4.0)]
+
+
+async def _hours(
+    recorder: Recorder, hass: HomeAssistant, statistic_id: str
+) -> list[tuple[float, float, float, float]]:
+    """Return the start, min, max and mean of each imported hour."""
+    statistics = await recorder.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.utc_from_timestamp(0),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    return [
+        (row["start"], row["min"], row["max"], row["mean"])
+        for row in statistics.get(statistic_id, [])
+    ]
+
+
+def _enabled_entry() -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Fridge",
+        data={"address": ADDRESS},
+        options={CONF_IMPORT_STATISTICS: True},
+    )
+
+
+async def test_coordinator_aggregates_when_enabled(
+    hass: HomeAssistant, mock_config_entry, valid_notify_payload_single_zone: bytes
+) -> None:
+    """Test that only coordinators with the option aggregate readings."""
+    coordinator = BodegaBleCoordinator(hass, _enabled_entry(), MagicMock())
+    disabled = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+    for instance in (coordinator, disabled):
+        assert instance.async_apply_frame(valid_notify_payload_single_zone)
+
+    summary = coordinator.statistics_summary()
+    assert summary[KEY_LEFT_CURRENT]["statistic_id"].startswith("bodega_ble:")
+    assert coordinator._statistics._short[KEY_LEFT_CURRENT].count == 1
+    assert disabled.statistics_summary() is None
+
+
+async def test_coordinator_aggregates_fresh_readings_only(
+    hass: HomeAssistant, valid_notify_payload_single_zone: bytes
+) -> None:
+    """Test that re-published data does not count a reading again."""
+    coordinator = BodegaBleCoordinator(hass, _enabled_entry(), MagicMock())
+    coordinator.async_apply_frame(valid_notify_payload_single_zone)
+
+    coordinator._set_ble_status(BLE_STATUS_CONNECTED)
+    coordinator._set_ble_status(BLE_STATUS_DISCONNECTED)
+
+    assert coordinator._statistics._short[KEY_LEFT_CURRENT].count == 1
+
+
+async def test_shutdown_imports_open_hour(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    valid_notify_payload_single_zone: bytes,
+) -> None:
+    """Test that unloading imports the readings of the current hour."""
+    coordinator = BodegaBleCoordinator(hass, _enabled_entry(), MagicMock())
+    coordinator.async_apply_frame(valid_notify_payload_single_zone)
+    temperature = coordinator.data[KEY_LEFT_CURRENT]
+
+    await coordinator.async_shutdown()
+    await async_wait_recording_done(hass)
+
+    (hour,) = await _hours(recorder_mock, hass, "bodega_ble:aabbccddeeff_left_current")
+    assert hour[1:] == (temperature, temperature, temperature)
+
+
+async def test_replay_imports_hours_of_the_capture(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    tmp_path: Path,
+    valid_notify_payload_single_zone: bytes,
+) -> None:
+    """Test that replayed frames are filed at their capture time, without alerts."""
+    start = (time.time() // HOUR - 48) * HOUR
+    path = _write_capture(
+        tmp_path / "fridge.bdgcap",
+        (start + 60, FrameDirection.RX, valid_notify_payload_single_zone),
+        (start + 1800, FrameDirection.RX, valid_notify_payload_single_zone),
+        (start + HOUR + 60, FrameDirection.RX, valid_notify_payload_single_zone),
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Fridge",
+        data={"address": ADDRESS},
+        options={CONF_IMPORT_STATISTICS: True, CONF_STALE_AFTER: 60},
+    )
+    coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+    events = async_capture_events(hass, EVENT_ALERT)
+
+    result = await async_replay_capture(coordinator, path, speed=None)
+    await async_wait_recording_done(hass)
+    temperature = coordinator.data[KEY_LEFT_CURRENT]
+
+    assert result.applied == 3
+    hours = await _hours(recorder_mock, hass, "bodega_ble:aabbccddeeff_left_current")
+    assert hours == [(start, temperature, temperature, temperature)]
+    assert coordinator.alerts.last_update is None
+    assert not events
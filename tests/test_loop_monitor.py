@@ -0,0 +1,152 @@
+"""Tests for the Bodega BLE callback monitor."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.bodega_ble.const import CONF_CALLBACK_BUDGET, DOMAIN
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+from custom_components.bodega_ble.loop_monitor import CallbackMonitor
+
+
+class _Clock:
+    """A clock that advances by the next step each time it is read."""
+
+    def __init__(self, *steps: float) -> None:
+        self._steps = list(steps)
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += self._steps.pop(0) if self._steps else 0.0
+        return self.now
+
+
+class TestCallbackMonitor:
+    """Tests for CallbackMonitor."""
+
+    def test_disabled_records_nothing(self) -> None:
+        """Test that without a budget callbacks are not timed."""
+        monitor = CallbackMonitor()
+        with monitor.measure("notify"):
+            pass
+
+        assert not monitor.enabled
+        assert monitor.as_dict() == {
+            "enabled": False,
+            "budget_ms": None,
+            "callbacks": {},
+            "slowest": [],
+        }
+
+    def test_totals_per_callback(self) -> None:
+        """Test that counts, totals and maxima are kept per callback."""
+        monitor = CallbackMonitor(0.05, clock=_Clock(0, 0.002, 0, 0.004, 0, 0.001))
+        for _ in range(2):
+            with monitor.measure("notify"):
+                pass
+        with monitor.measure("normalize"):
+            pass
+
+        callbacks = monitor.as_dict()["callbacks"]
+        assert callbacks["notify"]["count"] == 2
+        assert callbacks["notify"]["max_ms"] == pytest.approx(4.0)
+        assert callbacks["notify"]["mean_ms"] == pytest.approx(3.0)
+        assert callbacks["notify"]["over_budget"] == 0
+        assert callbacks["normalize"]["total_ms"] == pytest.approx(1.0)
+
+    def test_keeps_slowest_calls_with_stack(self) -> None:
+        """Test that only the slowest calls are kept, with their callers."""
+        durations = [0.001, 0.005, 0.003, 0.004]
+        steps = [step for duration in durations for step in (0, duration)]
+        monitor = CallbackMonitor(0.05, keep=2, clock=_Clock(*steps))
+        for index in range(len(durations)):
+            with monitor.measure("state_write", f"sensor.fridge_{index}"):
+                pass
+
+        slowest = monitor.slowest()
+        assert [call.target for call in slowest] == [
+            "sensor.fridge_1",
+            "sensor.fridge_3",
+        ]
+        assert "test_keeps_slowest_calls_with_stack" in slowest[0].stack[-1]
+
+    def test_over_budget_warns_once(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a callback over budget is counted and logged once."""
+        monitor = CallbackMonitor(0.01, clock=_Clock(0, 0.02, 0, 0.03))
+        with caplog.at_level(logging.WARNING):
+            for _ in range(2):
+                with monitor.measure("advertisement"):
+                    pass
+
+        assert monitor.as_dict()["callbacks"]["advertisement"]["over_budget"] == 2
+        warnings = [r for r in caplog.records if "over the" in r.getMessage()]
+        assert len(warnings) == 1
+        assert "advertisement callback took 20.0 ms" in warnings[0].getMessage()
+
+    def test_exceptions_are_timed(self) -> None:
+        """Test that a callback that raises is still recorded."""
+        monitor = CallbackMonitor(0.05)
+        with pytest.raises(ValueError), monitor.measure("notify"):
+            raise ValueError
+
+        assert monitor.as_dict()["callbacks"]["notify"]["count"] == 1
+
+
+class _Entity:
+    entity_id = "sensor.fridge_temperature"
+
+    def __init__(self) -> None:
+        self.writes = 0
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self.writes += 1
+
+
+async def test_coordinator_times_hot_paths(
+    hass: HomeAssistant, valid_notify_payload_single_zone: bytes
+) -> None:
+    """Test that an update is timed down to each entity's state write."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"address": "AA:BB:CC:DD:EE:FF"},
+        options={CONF_CALLBACK_BUDGET: 50},
+    )
+    coordinator = BodegaBleCoordinator(hass, entry, MagicMock())
+    entity = _Entity()
+    unsubscribe = coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    assert coordinator.async_apply_frame(valid_notify_payload_single_zone)
+    unsubscribe()
+
+    summary = coordinator.callback_summary()
+    assert entity.writes == 1
+    assert summary["budget_ms"] == 50
+    assert summary["callbacks"].keys() == {
+        "normalize",
+        "update_listeners",
+        "state_write",
+    }
+    assert "sensor.fridge_temperature" in {
+        call["target"] for call in summary["slowest"]
+    }
+
+
+async def test_coordinator_monitor_off_by_default(
+    hass: HomeAssistant, mock_config_entry, valid_notify_payload_single_zone: bytes
+) -> None:
+    """Test that callbacks are not timed unless a budget is configured."""
+    coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+    entity = _Entity()
+    unsubscribe = coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    assert coordinator.async_apply_frame(valid_notify_payload_single_zone)
+    unsubscribe()
+
+    assert entity.writes == 1
+    assert coordinator.callback_summary()["callbacks"] == {}
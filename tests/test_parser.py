@@ -15,8 +15,14 @@ from custom_components.bodega_ble.const import (
     KEY_RUN_MODE,
     KEY_RUNNING_STATUS,
     KEY_TEMP_UNIT,
+    SERVICE_UUID,
+)
+from custom_components.bodega_ble.parser import (
+    FrameOutcome,
+    decode_frame,
+    parse_advertisement,
+    parse_notify_payload,
 )
-from custom_components.bodega_ble.parser import parse_notify_payload
 
 
 class TestParseNotifyPayload:
@@ -153,3 +159,59 @@ class TestParseNotifyPayload:
 
         result = parse_notify_payload(bytes(frame))
         assert KEY_BATTERY_PERCENT not in result
+
+
+class TestDecodeFrame:
+    """Tests for frame outcomes reported by decode_frame."""
+
+    def test_outcomes(self, valid_notify_payload_single_zone: bytes) -> None:
+        """Test that each rejection reason is told apart."""
+        valid = valid_notify_payload_single_zone
+        checksum = int.from_bytes(valid[-2:], "big")
+        doubled = valid[:-2] + ((checksum * 2) & 0xFFFF).to_bytes(2, "big")
+        corrupted = valid[:-1] + bytes([valid[-1] ^ 0x01])
+        body = bytes([0xFE, 0xFE, 0x03, 0x07])
+        unknown = body + (sum(body) & 0xFFFF).to_bytes(2, "big")
+
+        assert decode_frame(valid)[0] is FrameOutcome.OK
+        assert decode_frame(doubled) == (
+            FrameOutcome.DOUBLED_CHECKSUM,
+            parse_notify_payload(valid),
+        )
+        assert decode_frame(corrupted)[0] is FrameOutcome.BAD_CHECKSUM
+        assert decode_frame(valid[:-1])[0] is FrameOutcome.SHORT_FRAME
+        assert decode_frame(b"\xff" + valid[1:])[0] is FrameOutcome.BAD_HEADER
+        assert decode_frame(unknown) == (FrameOutcome.UNKNOWN_COMMAND, {})
+
+
+class TestParseAdvertisement:
+    """Tests for parse_advertisement function."""
+
+    def test_frame_in_service_data(
+        self, valid_notify_payload_single_zone: bytes
+    ) -> None:
+        """Test that a status frame in service data yields telemetry."""
+        result = parse_advertisement(
+            {}, {SERVICE_UUID: valid_notify_payload_single_zone}
+        )
+
+        assert result[KEY_LEFT_CURRENT] == -5
+        assert result[KEY_BATTERY_VOLTAGE] == 12.8
+        assert KEY_LEFT_TARGET not in result
+        assert KEY_LOCKED not in result
+
+    def test_frame_inside_manufacturer_data(
+        self, valid_notify_payload_dual_zone: bytes
+    ) -> None:
+        """Test that a frame after a vendor prefix is found."""
+        result = parse_advertisement(
+            {0x0A0B: b"\x01\x02" + valid_notify_payload_dual_zone}, {}
+        )
+
+        assert result[KEY_RIGHT_CURRENT] == -25
+        assert result[KEY_TEMP_UNIT] == "F"
+
+    def test_no_frame(self, invalid_checksum_payload: bytes) -> None:
+        """Test that advertisements without a valid frame yield nothing."""
+        assert parse_advertisement({0x0A0B: b"\x01\x02\x03"}, {}) == {}
+        assert parse_advertisement({}, {SERVICE_UUID: invalid_checksum_payload}) == {}
@@ -0,0 +1,155 @@
+"""Tests for the Bodega BLE protocol context."""
+
+from __future__ import annotations
+
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bleak.exc import BleakCharacteristicNotFoundError
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.const import (
+    CHAR_NOTIFY_UUID,
+    CHAR_WRITE_UUID,
+    CMD_SET,
+    CMD_SET_UNIT1_TARGET,
+    KEY_LEFT_TARGET,
+    KEY_RIGHT_TARGET,
+)
+from custom_components.bodega_ble.coordinator import (
+    BodegaBleCoordinator,
+    _create_packet,
+)
+from custom_components.bodega_ble.parser import parse_notify_payload
+from custom_components.bodega_ble.protocol import ProtocolContext, encode_frame
+
+DUAL_ZONE_SET_BODY = bytes(
+    [CMD_SET, 0, 1, 0, 1, 5, 10, 0, 2, 3, 0, 3, 2, 1, 0]
+    + [0xEC, 0, 0, 2, 3, 2, 1, 0, 0, 0, 0]
+)
+
+
+class TestCharacteristics:
+    """Tests for characteristic resolution."""
+
+    def test_defaults_to_uuids(self) -> None:
+        context = ProtocolContext()
+        assert not context.resolved
+        assert context.write_char == CHAR_WRITE_UUID
+        assert context.notify_char == CHAR_NOTIFY_UUID
+
+    def test_resolve_and_invalidate(self) -> None:
+        services = MagicMock()
+        context = ProtocolContext()
+        context.resolve(services)
+
+        assert context.resolved
+        assert context.write_char is services.get_characteristic.return_value
+
+        context.invalidate()
+        assert not context.resolved
+        assert context.write_char == CHAR_WRITE_UUID
+
+    def test_resolve_missing_characteristic(self) -> None:
+        services = MagicMock()
+        services.get_characteristic.return_value = None
+        context = ProtocolContext()
+
+        with pytest.raises(BleakCharacteristicNotFoundError):
+            context.resolve(services)
+        assert not context.resolved
+
+
+class TestFrameCache:
+    """Tests for the encoded frame LRU."""
+
+    @pytest.mark.parametrize(
+        "body",
+        [bytes([CMD_SET_UNIT1_TARGET, 0xFB]), DUAL_ZONE_SET_BODY, bytes([0x00])],
+    )
+    def test_encode_frame_matches_reference_encoder(self, body: bytes) -> None:
+        assert encode_frame(body) == _create_packet(body)
+
+    def test_frame_is_reused(self) -> None:
+        context = ProtocolContext()
+        first = context.add_frame(("set", 1), DUAL_ZONE_SET_BODY)
+
+        assert context.cached_frame(("set", 1)) is first
+        assert context.cached_frame(("set", 2)) is None
+
+    def test_lru_eviction(self) -> None:
+        context = ProtocolContext(max_frames=2)
+        first = context.add_frame(1, bytes([CMD_SET_UNIT1_TARGET, 1]))
+        context.add_frame(2, bytes([CMD_SET_UNIT1_TARGET, 2]))
+        # Touch the first entry so the second becomes least recently used.
+        context.cached_frame(1)
+        context.add_frame(3, bytes([CMD_SET_UNIT1_TARGET, 3]))
+
+        assert context.cached_frame(1) is first
+        assert context.cached_frame(2) is None
+        assert context.as_dict()["cached_frames"] == 2
+
+
+@pytest.fixture
+def coordinator(
+    hass: HomeAssistant, mock_config_entry, valid_notify_payload_dual_zone: bytes
+) -> BodegaBleCoordinator:
+    """Return a coordinator holding a dual-zone state."""
+    coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+    raw = parse_notify_payload(valid_notify_payload_dual_zone)
+    coordinator.data = coordinator._normalize_data(raw)
+    return coordinator
+
+
+def _traced(func, *args) -> tuple[object, int, int]:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        result = func(*args)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+class TestEncodeCache:
+    """Micro-benchmark: a known settings state is not encoded again."""
+
+    async def test_set_hit_skips_building(
+        self, coordinator: BodegaBleCoordinator
+    ) -> None:
+        first, _, miss_peak = _traced(coordinator._encode_set, {KEY_LEFT_TARGET: 4})
+
+        with patch.object(coordinator, "_set_body") as mock_body:
+            frame, current, peak = _traced(
+                coordinator._encode_set, {KEY_LEFT_TARGET: 4}
+            )
+
+        mock_body.assert_not_called()
+        assert frame is first
+        # Only the transient key is allocated, and nothing is retained.
+        assert current == 0
+        assert peak < miss_peak
+
+    async def test_set_key_follows_settings(
+        self, coordinator: BodegaBleCoordinator
+    ) -> None:
+        first = coordinator._encode_set({KEY_LEFT_TARGET: 4})
+
+        assert coordinator._encode_set({KEY_LEFT_TARGET: 5}) != first
+        assert coordinator._encode_set({KEY_RIGHT_TARGET: -20}) != first
+        assert coordinator._protocol.as_dict()["cached_frames"] == 3
+
+    async def test_target_hit_retains_nothing(
+        self, coordinator: BodegaBleCoordinator
+    ) -> None:
+        first = coordinator._encode_target_command(CMD_SET_UNIT1_TARGET, 3)
+
+        frame, current, _ = _traced(
+            coordinator._encode_target_command, CMD_SET_UNIT1_TARGET, 3
+        )
+
+        assert frame is first
+        assert current == 0
+        assert coordinator._encode_target_command(CMD_SET_UNIT1_TARGET, 4) != first
@@ -0,0 +1,81 @@
+"""Tests for replaying Bodega BLE capture files."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.capture import (
+    CAPTURE_HEADER,
+    RECORD_HEADER,
+    FrameDirection,
+    device_id,
+)
+from custom_components.bodega_ble.const import FRAME_QUERY, KEY_LEFT_CURRENT
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+from custom_components.bodega_ble.replay import async_replay_capture
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+def _write_capture(path: Path, *records: tuple[float, FrameDirection, bytes]) -> str:
+    data = bytearray(CAPTURE_HEADER)
+    for timestamp, direction, frame in records:
+        data += RECORD_HEADER.pack(timestamp, direction, device_id(ADDRESS), len(frame))
+        data += frame
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestReplay:
+    """Tests for async_replay_capture."""
+
+    async def test_received_frames_update_the_coordinator(
+        self,
+        hass: HomeAssistant,
+        tmp_path: Path,
+        mock_config_entry,
+        valid_notify_payload_single_zone: bytes,
+        invalid_checksum_payload: bytes,
+    ) -> None:
+        """Test that RX frames are parsed and sent frames are skipped."""
+        path = _write_capture(
+            tmp_path / "fridge.bdgcap",
+            (1.0, FrameDirection.TX, FRAME_QUERY),
+            (1.1, FrameDirection.RX, invalid_checksum_payload),
+            (1.2, FrameDirection.RX, valid_notify_payload_single_zone),
+        )
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+        listener = MagicMock()
+        unsubscribe = coordinator.async_add_listener(listener)
+
+        result = await async_replay_capture(coordinator, path, speed=None)
+        unsubscribe()
+
+        assert (result.applied, result.rejected) == (1, 1)
+        assert coordinator.data[KEY_LEFT_CURRENT] == -5
+        listener.assert_called_once()
+
+    async def test_replay_keeps_recorded_timing(
+        self,
+        hass: HomeAssistant,
+        tmp_path: Path,
+        mock_config_entry,
+        valid_notify_payload_single_zone: bytes,
+    ) -> None:
+        """Test that frames are spaced by their timestamps over the speed."""
+        path = _write_capture(
+            tmp_path / "fridge.bdgcap",
+            (100.0, FrameDirection.RX, valid_notify_payload_single_zone),
+            (130.0, FrameDirection.RX, valid_notify_payload_single_zone),
+        )
+        coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+
+        started = time.monotonic()
+        result = await async_replay_capture(coordinator, path, speed=300)
+
+        assert result.applied == 2
+        assert time.monotonic() - started >= 0.09
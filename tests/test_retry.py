@@ -0,0 +1,135 @@
+"""Tests for the Bodega BLE retry policy."""
+
+from __future__ import annotations
+
+import random
+
+from bleak import BleakError
+from bleak.exc import BleakDeviceNotFoundError
+from bleak_retry_connector import BleakOutOfConnectionSlotsError
+
+from custom_components.bodega_ble.const import MAX_BACKOFF_INTERVAL
+from custom_components.bodega_ble.exceptions import BodegaBleInvalidFrameError
+from custom_components.bodega_ble.retry import (
+    BACKOFF_POLICIES,
+    CircuitState,
+    ErrorClass,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClassifyError:
+    """Tests for classify_error."""
+
+    def test_device_absent(self) -> None:
+        err = BleakDeviceNotFoundError("AA:BB:CC:DD:EE:FF", "Device not found")
+        assert classify_error(err) is ErrorClass.DEVICE_ABSENT
+
+    def test_slot_exhaustion(self) -> None:
+        assert (
+            classify_error(BleakOutOfConnectionSlotsError("no slots"))
+            is ErrorClass.SLOT_EXHAUSTION
+        )
+        assert (
+            classify_error(BleakError("No available connection slots"))
+            is ErrorClass.SLOT_EXHAUSTION
+        )
+
+    def test_parse_error(self) -> None:
+        assert classify_error(BodegaBleInvalidFrameError()) is ErrorClass.PARSE_ERROR
+
+    def test_timeout(self) -> None:
+        assert classify_error(TimeoutError()) is ErrorClass.TIMEOUT
+
+    def test_gatt_error(self) -> None:
+        assert classify_error(BleakError("ATT error 0x0e")) is ErrorClass.GATT_ERROR
+        assert classify_error(EOFError()) is ErrorClass.GATT_ERROR
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy."""
+
+    def test_delay_is_jittered_within_class_ceiling(self) -> None:
+        policy = RetryPolicy(failure_threshold=100, min_delay=20, rng=random.Random(1))
+        cap = BACKOFF_POLICIES[ErrorClass.GATT_ERROR].cap
+        delays = [policy.record_failure(ErrorClass.GATT_ERROR) for _ in range(10)]
+
+        assert all(20 <= delay <= cap for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_delay_is_never_below_poll_interval(self) -> None:
+        policy = RetryPolicy(failure_threshold=100, min_delay=300)
+
+        assert policy.record_failure(ErrorClass.SLOT_EXHAUSTION) == 300
+        delays = [policy.record_failure(ErrorClass.DEVICE_ABSENT) for _ in range(5)]
+        assert all(300 <= delay <= MAX_BACKOFF_INTERVAL for delay in delays)
+
+    def test_breaker_opens_after_threshold(self) -> None:
+        clock = FakeClock()
+        policy = RetryPolicy(failure_threshold=3, open_seconds=100, clock=clock)
+
+        for _ in range(2):
+            policy.record_failure(ErrorClass.TIMEOUT)
+        assert policy.state is CircuitState.CLOSED
+
+        delay = policy.record_failure(ErrorClass.TIMEOUT)
+        assert policy.state is CircuitState.OPEN
+        assert not policy.allow_request()
+        assert delay >= 100
+
+    def test_half_open_trial_success_closes(self) -> None:
+        clock = FakeClock()
+        policy = RetryPolicy(failure_threshold=1, open_seconds=100, clock=clock)
+        policy.record_failure(ErrorClass.DEVICE_ABSENT)
+
+        clock.now = 100
+        assert policy.state is CircuitState.HALF_OPEN
+        assert policy.allow_request()
+
+        policy.record_success()
+        assert policy.state is CircuitState.CLOSED
+        assert not policy.backing_off
+
+    def test_half_open_trial_failure_reopens(self) -> None:
+        clock = FakeClock()
+        policy = RetryPolicy(failure_threshold=5, open_seconds=100, clock=clock)
+        for _ in range(5):
+            policy.record_failure(ErrorClass.DEVICE_ABSENT)
+
+        clock.now = 150
+        assert policy.state is CircuitState.HALF_OPEN
+        policy.record_failure(ErrorClass.GATT_ERROR)
+        assert policy.state is CircuitState.OPEN
+
+    def test_attempt_due_after_delay(self) -> None:
+        clock = FakeClock()
+        policy = RetryPolicy(min_delay=20, clock=clock)
+        assert policy.attempt_due
+
+        delay = policy.record_failure(ErrorClass.TIMEOUT)
+        assert not policy.attempt_due
+        clock.now = delay
+        assert policy.attempt_due
+
+        policy.record_failure(ErrorClass.TIMEOUT)
+        policy.record_success()
+        assert policy.attempt_due
+
+    def test_command_failures_do_not_open_breaker(self) -> None:
+        policy = RetryPolicy(failure_threshold=1)
+        policy.record_command_failure(ErrorClass.TIMEOUT)
+
+        assert policy.state is CircuitState.CLOSED
+        assert not policy.backing_off
+        assert policy.as_dict()["failures_by_class"]["timeout"] == 1
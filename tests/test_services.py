@@ -0,0 +1,225 @@
+"""Tests for the Bodega BLE services."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.yaml import load_yaml
+
+from custom_components.bodega_ble.const import (
+    DOMAIN,
+    SERVICE_APPLY_SETTINGS,
+    SERVICE_DELETE_PROFILE,
+    SERVICE_GET_STATE,
+    SERVICE_SAVE_PROFILE,
+    SERVICE_SET_RUN_MODE,
+)
+from custom_components.bodega_ble.exceptions import (
+    BodegaBleTargetsFailedError,
+    BodegaBleUnknownProfileError,
+)
+from custom_components.bodega_ble.services import async_register_services
+
+STATE = {"run_mode": "Eco", "left_target": 4.0}
+
+
+def _coordinators(hass: HomeAssistant, count: int) -> dict[str, MagicMock]:
+    coordinators = {f"entry_{i}": MagicMock() for i in range(count)}
+    for coordinator in coordinators.values():
+        coordinator.async_set_run_mode = AsyncMock(return_value=dict(STATE))
+    hass.data[DOMAIN] = coordinators
+    async_register_services(hass)
+    return coordinators
+
+
+class TestMultiTargetServices:
+    """Tests for fanning a service call out to several fridges."""
+
+    async def test_per_device_results(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 3)
+        coordinators["entry_1"].async_set_run_mode.return_value = None
+        coordinators["entry_2"].async_set_run_mode.side_effect = UpdateFailed(
+            "BLE error: ATT error"
+        )
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_RUN_MODE,
+            {"entry_id": list(coordinators), "mode": "Eco"},
+            blocking=True,
+            return_response=True,
+        )
+
+        results = response["results"]
+        assert results["entry_0"] == {
+            "success": True,
+            "error": None,
+            "queued": False,
+            "state": STATE,
+        }
+        assert results["entry_1"] == {
+            "success": True,
+            "error": None,
+            "queued": True,
+            "state": None,
+        }
+        assert results["entry_2"]["success"] is False
+        assert "ATT error" in results["entry_2"]["error"]
+
+    async def test_concurrency_is_bounded(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 6)
+        in_flight = 0
+        peak = 0
+
+        async def _set_run_mode(mode: str, queue_ttl: float) -> dict[str, Any]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return STATE
+
+        for coordinator in coordinators.values():
+            coordinator.async_set_run_mode.side_effect = _set_run_mode
+
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_RUN_MODE,
+            {"entry_id": list(coordinators), "mode": "Eco", "max_concurrency": 2},
+            blocking=True,
+        )
+
+        assert peak == 2
+        for coordinator in coordinators.values():
+            coordinator.async_set_run_mode.assert_awaited_once()
+
+    async def test_failure_raises_without_response(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 2)
+        coordinators["entry_1"].async_set_run_mode.side_effect = UpdateFailed(
+            "Timeout waiting for BLE response"
+        )
+
+        with pytest.raises(BodegaBleTargetsFailedError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_SET_RUN_MODE,
+                {"entry_id": list(coordinators), "mode": "Eco"},
+                blocking=True,
+            )
+
+        coordinators["entry_0"].async_set_run_mode.assert_awaited_once()
+
+
+class TestApplySettingsService:
+    """Tests for apply_settings and settings profiles."""
+
+    async def test_profile_with_overrides(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 2)
+        for coordinator in coordinators.values():
+            coordinator.async_apply_settings = AsyncMock(return_value=STATE)
+
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SAVE_PROFILE,
+            {"name": "camping", "run_mode": "Eco", "left_target": 4},
+            blocking=True,
+        )
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_APPLY_SETTINGS,
+            {"entry_id": list(coordinators), "profile": "camping", "left_target": 2},
+            blocking=True,
+        )
+
+        for coordinator in coordinators.values():
+            coordinator.async_apply_settings.assert_awaited_once_with(
+                {"run_mode": "Eco", "left_target": 2.0}, 900
+            )
+
+    async def test_save_profile_from_fridge(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 1)
+        coordinators["entry_0"].current_settings.return_value = {
+            "powered": True,
+            "left_target": 5.0,
+        }
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SAVE_PROFILE,
+            {"name": "home", "entry_id": "entry_0", "powered": False},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert response == {"profile": {"powered": False, "left_target": 5.0}}
+
+    async def test_delete_unknown_profile(self, hass: HomeAssistant) -> None:
+        _coordinators(hass, 1)
+        with pytest.raises(BodegaBleUnknownProfileError):
+            await hass.services.async_call(
+                DOMAIN, SERVICE_DELETE_PROFILE, {"name": "missing"}, blocking=True
+            )
+
+
+class TestGetStateService:
+    """Tests for reading fridge state through a service response."""
+
+    async def test_cached_state(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 1)
+        coordinators["entry_0"].data = STATE
+        coordinators["entry_0"].last_update_success = True
+        coordinators["entry_0"].async_read_state = AsyncMock()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_STATE,
+            {"entry_id": "entry_0"},
+            blocking=True,
+            return_response=True,
+        )
+
+        assert response["results"]["entry_0"] == {
+            "success": True,
+            "error": None,
+            "state": STATE,
+            "last_update_success": True,
+        }
+        coordinators["entry_0"].async_read_state.assert_not_awaited()
+
+    async def test_refresh_reads_device(self, hass: HomeAssistant) -> None:
+        coordinators = _coordinators(hass, 2)
+        coordinators["entry_0"].async_read_state = AsyncMock(return_value=STATE)
+        coordinators["entry_1"].async_read_state = AsyncMock(
+            side_effect=UpdateFailed("Timeout waiting for BLE response")
+        )
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_STATE,
+            {"entry_id": list(coordinators), "refresh": True},
+            blocking=True,
+            return_response=True,
+        )
+
+        results = response["results"]
+        assert results["entry_0"] == {"success": True, "error": None, "state": STATE}
+        assert results["entry_1"]["success"] is False
+        assert results["entry_1"]["state"] is None
+
+
+def test_services_are_translated() -> None:
+    """Test that every service and field in services.yaml is translated."""
+    component = Path(__file__).parents[1] / "custom_components" / DOMAIN
+    services = load_yaml(str(component / "services.yaml"))
+    translations = json.loads((component / "translations" / "en.json").read_text())
+
+    for service, spec in services.items():
+        translated = translations["services"][service]["fields"]
+        assert set(translated) == set(spec["fields"]), service
@@ -0,0 +1,63 @@
+"""Tests for Bodega BLE settings validation and profiles."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.bodega_ble.exceptions import (
+    BodegaBleInvalidSettingsError,
+    BodegaBleUnknownProfileError,
+)
+from custom_components.bodega_ble.settings import ProfileStore, validate_settings
+
+SINGLE_ZONE = {"left_target": 5.0, "temp_min": -20.0, "temp_max": 10.0}
+DUAL_ZONE = {**SINGLE_ZONE, "right_target": -18.0}
+
+
+class TestValidateSettings:
+    """Tests for validate_settings."""
+
+    def test_valid_subset(self) -> None:
+        validate_settings({"left_target": 3.0, "powered": True}, SINGLE_ZONE)
+        validate_settings({"right_target": -15.0}, DUAL_ZONE)
+
+    def test_right_zone_on_single_zone(self) -> None:
+        with pytest.raises(BodegaBleInvalidSettingsError):
+            validate_settings({"right_target": -15.0}, SINGLE_ZONE)
+
+    def test_target_outside_range(self) -> None:
+        with pytest.raises(BodegaBleInvalidSettingsError):
+            validate_settings({"left_target": 12.0}, SINGLE_ZONE)
+
+    def test_range_is_checked_after_update(self) -> None:
+        validate_settings({"temp_max": 15.0, "left_target": 12.0}, SINGLE_ZONE)
+        with pytest.raises(BodegaBleInvalidSettingsError):
+            validate_settings({"temp_max": 0.0}, SINGLE_ZONE)
+        with pytest.raises(BodegaBleInvalidSettingsError):
+            validate_settings({"temp_min": 11.0}, SINGLE_ZONE)
+
+
+class TestProfileStore:
+    """Tests for ProfileStore."""
+
+    async def test_round_trip(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ) -> None:
+        profiles = ProfileStore(hass)
+        await profiles.async_load()
+        await profiles.async_save("camping", {"run_mode": "Eco", "left_current": 3})
+
+        restored = ProfileStore(hass)
+        await restored.async_load()
+        assert restored.get("camping") == {"run_mode": "Eco"}
+
+    async def test_unknown_profile(self, hass: HomeAssistant) -> None:
+        profiles = ProfileStore(hass)
+        await profiles.async_load()
+        with pytest.raises(BodegaBleUnknownProfileError):
+            profiles.get("missing")
+        with pytest.raises(BodegaBleUnknownProfileError):
+            await profiles.async_delete("missing")
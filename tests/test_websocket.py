@@ -0,0 +1,214 @@
+"""Tests for the Bodega BLE telemetry WebSocket API."""
+
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.components.websocket_api import ActiveConnection
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.bodega_ble.const import (
+    DOMAIN,
+    KEY_BATTERY_VOLTAGE,
+    KEY_LEFT_CURRENT,
+)
+from custom_components.bodega_ble.coordinator import BodegaBleCoordinator
+from custom_components.bodega_ble.websocket import async_register_websocket_commands
+
+ENTRY_ID = "fridge"
+PACKAGE = "custom_components.bodega_ble"
+
+
+@pytest.fixture
+def coordinator(hass: HomeAssistant, mock_config_entry) -> BodegaBleCoordinator:
+    """Return a coordinator registered for its entry, with the API set up."""
+    coordinator = BodegaBleCoordinator(hass, mock_config_entry, MagicMock())
+    coordinator.data = {KEY_LEFT_CURRENT: 4.0, KEY_BATTERY_VOLTAGE: 12.8}
+    hass.data.setdefault(DOMAIN, {})[ENTRY_ID] = coordinator
+    async_register_websocket_commands(hass)
+    return coordinator
+
+
+class _Client:
+    """A WebSocket connection without the HTTP server, keeping what it sent."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.connection = ActiveConnection(
+            MagicMock(), hass, self._send, MagicMock(), MagicMock()
+        )
+        self.received: list[dict[str, Any]] = []
+        self._next_id = 0
+
+    def _send(self, message: bytes | str | dict[str, Any]) -> None:
+        if isinstance(message, dict):
+            message = json.dumps(message)
+        self.received.append(json.loads(message))
+
+    def send(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Handle a command and return the first message sent back."""
+        self._next_id += 1
+        sent = len(self.received)
+        self.connection.async_handle({"id": self._next_id, **message})
+        return self.received[sent]
+
+    def close(self) -> None:
+        self.connection.async_handle_close()
+
+
+@pytest.fixture
+def client(hass: HomeAssistant, coordinator: BodegaBleCoordinator) -> _Client:
+    """Return a WebSocket client connection, once the API is registered."""
+    return _Client(hass)
+
+
+def _subscribe(client: _Client, entry_id: str, **fields: Any) -> int:
+    result = client.send(
+        {"type": "bodega_ble/telemetry/subscribe", "entry_id": entry_id, **fields}
+    )
+    assert result["success"]
+    return result["id"]
+
+
+async def test_subscribe_sends_snapshot_then_deltas(
+    client: _Client, coordinator: BodegaBleCoordinator
+) -> None:
+    """Test that only selected fields that changed are streamed."""
+    subscription = _subscribe(
+        client,
+        ENTRY_ID,
+        fields=[KEY_LEFT_CURRENT, KEY_BATTERY_VOLTAGE],
+    )
+
+    snapshot = client.received[-1]
+    assert snapshot["id"] == subscription
+    assert snapshot["event"]["values"] == {
+        KEY_LEFT_CURRENT: 4.0,
+        KEY_BATTERY_VOLTAGE: 12.8,
+    }
+
+    coordinator.async_set_updated_data({**coordinator.data, "ble_status": "x"})
+    coordinator.async_set_updated_data({**coordinator.data, KEY_LEFT_CURRENT: 5.0})
+    client.close()
+
+    assert len(client.received) == 3
+    assert client.received[-1]["event"]["values"] == {KEY_LEFT_CURRENT: 5.0}
+
+
+async def test_subscribe_is_rate_limited(
+    hass: HomeAssistant, client: _Client, coordinator: BodegaBleCoordinator
+) -> None:
+    """Test that changes within min_interval are coalesced into one event."""
+    _subscribe(
+        client,
+        ENTRY_ID,
+        fields=[KEY_LEFT_CURRENT],
+        min_interval=10,
+    )
+
+    for value in (5.0, 6.0, 7.0):
+        coordinator.async_set_updated_data({KEY_LEFT_CURRENT: value})
+    assert len(client.received) == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    client.close()
+
+    assert client.received[-1]["event"]["values"] == {KEY_LEFT_CURRENT: 7.0}
+
+
+async def test_history(client: _Client, coordinator: BodegaBleCoordinator) -> None:
+    """Test that history is served as points or buckets."""
+    for index in range(10):
+        coordinator.history.record(
+            1000.0 + index * 60, {KEY_LEFT_CURRENT: float(index)}
+        )
+
+    result = client.send(
+        {
+            "type": "bodega_ble/telemetry/history",
+            "entry_id": ENTRY_ID,
+            "fields": [KEY_LEFT_CURRENT],
+            "start": 1120,
+            "points": 3,
+        }
+    )
+    points = result["result"]["fields"][KEY_LEFT_CURRENT]
+    assert points[0] == [1120.0, 2.0]
+    assert points[-1] == [1540.0, 9.0]
+    assert len(points) == 3
+
+    result = client.send(
+        {
+            "type": "bodega_ble/telemetry/history",
+            "entry_id": ENTRY_ID,
+            "fields": [KEY_LEFT_CURRENT],
+            "buckets": 1,
+        }
+    )
+    assert result["result"]["fields"][KEY_LEFT_CURRENT] == [
+        {
+            "start": 1000.0,
+            "end": 1540.0,
+            "min": 0.0,
+            "max": 9.0,
+            "mean": 4.5,
+            "count": 10,
+        }
+    ]
+
+
+async def test_unknown_entry(
+    client: _Client, coordinator: BodegaBleCoordinator
+) -> None:
+    """Test that an unknown entry is reported as not found."""
+    result = client.send(
+        {"type": "bodega_ble/telemetry/subscribe", "entry_id": "missing"}
+    )
+
+    assert not result["success"]
+    assert result["error"]["code"] == "not_found"
+
+
+async def test_reload_ends_subscription(
+    hass: HomeAssistant, enable_bluetooth: None, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test that reloading the entry ends its subscriptions with an error."""
+    mock_config_entry.add_to_hass(hass)
+    entry_id = mock_config_entry.entry_id
+    with (
+        patch(f"{PACKAGE}.async_ble_device_from_address", return_value=None),
+        patch(
+            f"{PACKAGE}.coordinator.async_ble_device_from_address", return_value=None
+        ),
+        patch(
+            f"{PACKAGE}.coordinator.async_scanner_devices_by_address", return_value=[]
+        ),
+        patch(f"{PACKAGE}.coordinator.async_register_callback"),
+    ):
+        assert await hass.config_entries.async_setup(entry_id)
+        await hass.async_block_till_done()
+        client = _Client(hass)
+        msg_id = _subscribe(client, entry_id)
+
+        assert await hass.config_entries.async_reload(entry_id)
+        await hass.async_block_till_done()
+
+        assert client.received[-1]["id"] == msg_id
+        assert not client.received[-1]["success"]
+        assert client.received[-1]["error"]["code"] == "entry_unloaded"
+        assert msg_id not in client.connection.subscriptions
+        # The new coordinator accepts a new subscription.
+        _subscribe(client, entry_id)
+
+        assert await hass.config_entries.async_unload(entry_id)
+        await hass.async_block_till_done()
+    client.close()